@@ -2,7 +2,11 @@ import json
 
 from django import forms
 from django.contrib import admin, messages
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
 from django.http import HttpResponseRedirect
+from django.utils.functional import cached_property
 from django.utils.safestring import mark_safe
 
 from .models import (Author, Work, BookSet, Volume, AuthorAlias, Bookshelf,
@@ -16,6 +20,70 @@ from markdownx.admin import MarkdownxModelAdmin
 from catalog.utils.normalization import normalize_sort_title
 from django.db import models
 from django_json_widget.widgets import JSONEditorWidget
+from catalog.services import stats
+
+# Above this many rows an unfiltered changelist shows PostgreSQL's row
+# estimate instead of running COUNT(*) over the whole table.
+ESTIMATE_COUNT_ABOVE = 10_000
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        qs = self.object_list
+        if not qs.query.where:
+            estimate = _estimated_rows(qs.model, qs.db)
+            if estimate > ESTIMATE_COUNT_ABOVE:
+                return estimate
+        return super().count
+
+
+def _estimated_rows(model, using):
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                       [model._meta.db_table])
+        row = cursor.fetchone()
+    return row[0] if row else 0  # -1 until the table is first analyzed
+
+
+class LargeTableChangeList(ChangeList):
+    def get_queryset(self, request, *args, **kwargs):
+        qs = super().get_queryset(request, *args, **kwargs)
+        defer = self.model_admin.list_defer
+        return qs.defer(*defer) if defer else qs
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Changelist settings for tables that grow with the catalog: estimated
+    counts, no second COUNT(*) for the unfiltered total, and ``list_defer``
+    columns (big text/JSON) left out of the changelist query only, so the
+    change form still loads them in one go.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_defer = ()
+
+    def get_changelist(self, request, **kwargs):
+        return LargeTableChangeList
+
+
+def add_to_relation(relation, owner_ids, target):
+    """
+    Link every id in ``owner_ids`` to ``target`` through the m2m
+    ``relation`` (e.g. Volume.bookshelves) with one INSERT. Rows that
+    already exist are skipped; no m2m_changed signal is sent.
+    """
+    Link = relation.through
+    source = relation.field.m2m_field_name() + "_id"
+    dest = relation.field.m2m_reverse_field_name() + "_id"
+    Link.objects.bulk_create(
+        [Link(**{source: pk, dest: target.pk}) for pk in owner_ids],
+        batch_size=500, ignore_conflicts=True,
+    )
 
 # class VolumeInline(admin.TabularInline):
 #     model = Volume.works.through
@@ -34,21 +102,27 @@ class VolumeInline(admin.TabularInline):
 class BookshelfAdmin(admin.ModelAdmin):
     list_display = ['name']
     ordering = ('name',)
+    search_fields = ['name']
 
 @admin.register(Collection)
 class CollectionAdmin(admin.ModelAdmin):
     list_display = ['name']
     ordering = ('name',)
+    search_fields = ['name']
 
 
 @admin.register(Author)
-class AuthorAdmin(admin.ModelAdmin):
+class AuthorAdmin(LargeTableAdmin):
     list_display = ['full_name']
     ordering = ('sort_name',)
+    search_fields = ['full_name', 'sort_name']
+    list_defer = ('bio', 'rendered_markdown')
 
 @admin.register(AuthorAlias)
 class AuthorAlias(admin.ModelAdmin):
     list_display = ['alias', 'author']
+    list_select_related = ('author',)
+    autocomplete_fields = ('author',)
 
 @admin.register(Genre)
 class GenreAdmin(admin.ModelAdmin):
@@ -67,11 +141,13 @@ class AddToCollectionForm(forms.Form):
 
 
 @admin.register(Work)
-class WorkAdmin(admin.ModelAdmin):
+class WorkAdmin(LargeTableAdmin):
     list_display = ['title', 'author']
+    list_select_related = ('author',)
+    list_defer = ('notes', 'text', 'rendered_markdown')
     ordering = ('sort_title',)
     search_fields = ('title',)
-    filter_horizontal = ("collections",)
+    autocomplete_fields = ('author', 'collections')
     inlines = [VolumeInline]
 
 
@@ -84,12 +160,13 @@ class WorkAdmin(admin.ModelAdmin):
             if form.is_valid():
                 collection = form.cleaned_data["collection"]
 
-                for work in queryset:
-                    work.collections.add(collection)
+                work_ids = list(queryset.values_list("pk", flat=True))
+                add_to_relation(Work.collections, work_ids, collection)
+                stats.invalidate("collections")
 
                 self.message_user(
                     request,
-                    f"Added {queryset.count()} works to collection “{collection.name}”.",
+                    f"Added {len(work_ids)} works to collection “{collection.name}”.",
                     level=messages.SUCCESS,
                 )
                 return HttpResponseRedirect(request.get_full_path())
@@ -116,7 +193,7 @@ class WorkAdmin(admin.ModelAdmin):
 class BooksetImageInline(admin.TabularInline):
     model = BooksetImage
     extra = 0
-    fields = ("preview", "kind", "caption", "sort_order", "image_thumb", "image_display", "image_detail")
+    fields = ("preview", "kind", "caption", "sort_order", "original", "image_thumb", "image_display", "image_detail")
     readonly_fields = ("preview",)
     ordering = ("sort_order", "created_at")
 
@@ -126,9 +203,12 @@ class BooksetImageInline(admin.TabularInline):
 
 
 @admin.register(BookSet)
-class BookSetAdmin(admin.ModelAdmin):
+class BookSetAdmin(LargeTableAdmin):
 
     list_display = ['title']
+    list_defer = ('description', 'rendered_markdown')
+    ordering = ('sort_title',)
+    search_fields = ['title']
     inlines = [BooksetImageInline]
 
 @admin.register(Bibliography)
@@ -138,6 +218,9 @@ class BibliographyAdmin(admin.ModelAdmin):
 @admin.register(VolumeBibliographyReference)
 class VolumeBibliographyReferenceAdmin(admin.ModelAdmin):
     list_display = ['volume', 'bibliography', 'reference_detail']
+    # Volume.__str__ names its set
+    list_select_related = ('volume__book_set', 'bibliography')
+    autocomplete_fields = ('volume',)
 
 class VolumeBibliographyReferenceInline(admin.TabularInline):
     model = VolumeBibliographyReference
@@ -148,7 +231,7 @@ class VolumeBibliographyReferenceInline(admin.TabularInline):
 class VolumeImageInline(admin.TabularInline):
     model = VolumeImage
     extra = 0
-    fields = ("preview", "kind", "caption", "sort_order", "image_thumb", "image_display", "image_detail")
+    fields = ("preview", "kind", "caption", "sort_order", "original", "image_thumb", "image_display", "image_detail")
     readonly_fields = ("preview",)
     ordering = ("sort_order", "created_at")
 
@@ -167,12 +250,14 @@ class AddToBookshelfForm(forms.Form):
 
 
 @admin.register(Volume)
-class VolumeAdmin(admin.ModelAdmin):
+class VolumeAdmin(LargeTableAdmin):
     list_display = ['title', 'edition']
+    list_defer = ('description', 'notes', 'edition_notes', 'volume_json',
+                  'rendered_markdown')
     ordering = ('sort_title',)
     inlines = [VolumeBibliographyReferenceInline, VolumeImageInline]
     search_fields = ['title', 'edition']
-    filter_horizontal = ("bookshelves",)  # <-- your M2M field name
+    autocomplete_fields = ('bookshelves', 'works', 'primary_work', 'book_set')
 
     formfield_overrides = {
         models.JSONField: {"widget": JSONEditorWidget(attrs={"class": "json-wide-editor"})},
@@ -190,12 +275,13 @@ class VolumeAdmin(admin.ModelAdmin):
             if form.is_valid():
                 shelf = form.cleaned_data["bookshelf"]
 
-                for volume in queryset:
-                    volume.bookshelves.add(shelf)
+                volume_ids = list(queryset.values_list("pk", flat=True))
+                add_to_relation(Volume.bookshelves, volume_ids, shelf)
+                stats.invalidate("bookshelves")
 
                 self.message_user(
                     request,
-                    f"Added {queryset.count()} volumes to bookshelf “{shelf.name}”.",
+                    f"Added {len(volume_ids)} volumes to bookshelf “{shelf.name}”.",
                     level=messages.SUCCESS,
                 )
                 return HttpResponseRedirect(request.get_full_path())
@@ -308,21 +394,25 @@ class VolumeAdmin(admin.ModelAdmin):
 
 
 def thumb_preview(obj, field_name="image_thumb", size=80):
-    f = getattr(obj, field_name, None)
-    if not f:
-        return "—"
+    # image_thumb -> thumb_url etc., which also covers on-demand variants
+    url_attr = field_name.replace("image_", "") + "_url"
     try:
-        return format_html(
-            '<img src="{}" style="height:{}px;width:auto;border-radius:6px;" />',
-            f.url,
-            size,
-        )
+        url = getattr(obj, url_attr, None)
     except Exception:
+        url = None
+    if not url:
         return "—"
+    return format_html(
+        '<img src="{}" style="height:{}px;width:auto;border-radius:6px;" />',
+        url,
+        size,
+    )
 
 @admin.register(VolumeImage)
-class VolumeImageAdmin(admin.ModelAdmin):
+class VolumeImageAdmin(LargeTableAdmin):
     list_display = ("id", "volume", "kind", "sort_order", "preview_small", "created_at")
+    list_select_related = ("volume__book_set",)
+    autocomplete_fields = ("volume",)
     list_filter = ("kind",)
     search_fields = ("volume__title", "caption")
     ordering = ("volume", "sort_order", "created_at")
@@ -341,6 +431,8 @@ class VolumeImageAdmin(admin.ModelAdmin):
 class BooksetImageAdmin(admin.ModelAdmin):
     list_display = ("id", "bookset", "kind", "sort_order", "preview_small",
         "created_at")
+    list_select_related = ("bookset",)
+    autocomplete_fields = ("bookset",)
     list_filter = ("kind",)
     search_fields = ("bookset__title", "caption")
     ordering = ("bookset", "sort_order", "created_at")
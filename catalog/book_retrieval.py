@@ -1,19 +1,19 @@
 # using google books api
 
+import logging
 import os
 import time
-from pprint import pprint
 
 import requests
 
+logger = logging.getLogger(__name__)
+
 
 def lookup_book(isbn: str) -> dict:
     api_key = os.environ.get("GOOGLE_BOOKS_API_KEY")
-    print("LUB", repr(isbn))
     url = f"https://www.googleapis.com/books/v1/volumes?q=isbn:{isbn}&key={api_key}"
     response = requests.get(url)
-    print(response.status_code)
-    print(f"API KEY = {api_key}")
+    logger.debug("Google Books lookup %r -> HTTP %s", isbn, response.status_code)
     data = response.json()
     # pprint(data)
     if data['totalItems'] > 0:
@@ -38,10 +38,7 @@ def lookup_book(isbn: str) -> dict:
 
 def get_book(isbn: str) -> dict:
     isbn = isbn.replace("-", "").replace(" ", "")
-    print("GB", repr(isbn))
-    # print("GB", type(isbn))
     book = lookup_book(isbn)
-    pprint(book)
     return book
 
 
@@ -4,7 +4,8 @@ from crispy_forms.layout import Layout, Row, Column, HTML, Submit, Div
 from django import forms
 from django_json_widget.widgets import JSONEditorWidget
 
-from .models import Volume, Work, Author, DevNote
+from .models import Volume, Work, Author, DevNote, Bookshelf
+from .widgets import AutocompleteSelect, AutocompleteSelectMultiple
 
 from crispy_forms.layout import Submit, Layout, Row, Column, HTML, Field
 
@@ -75,6 +76,11 @@ class VolumeForm(forms.ModelForm):
         ]
 
         widgets = {
+            # selected values only; the rest are fetched as you type
+            "works": AutocompleteSelectMultiple("work"),
+            "primary_work": AutocompleteSelect("work"),
+            "bookshelves": AutocompleteSelectMultiple("bookshelf"),
+            "book_set": AutocompleteSelect("bookset"),
             "volume_json": JSONEditorWidget(
                 options={
                     "mode": "code",  # start in "code" view
@@ -207,10 +213,10 @@ class WorkCreateForm(forms.ModelForm):
         model = Work
         fields = "__all__"
         exclude = ["slug", "sort_title"]  # let save() handle both
+        widgets = {"author": AutocompleteSelect("author")}
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields["author"].queryset = Author.objects.order_by("sort_name")
 
         self.helper = FormHelper()
         self.helper.layout = Layout(
@@ -308,6 +314,35 @@ class ISBNSearchForm(forms.Form):
     isbn = forms.CharField(max_length=14, label='ISBN')
 
 
+class ISBNImportForm(forms.Form):
+    file = forms.FileField(
+        required=False,
+        label="ISBN file",
+        help_text="Text file with one ISBN per line, or a CSV with an 'isbn' column.")
+    isbns = forms.CharField(
+        required=False,
+        label="Or paste ISBNs",
+        widget=forms.Textarea(attrs={"rows": 8}))
+    bookshelf = forms.ModelChoiceField(
+        queryset=Bookshelf.objects.order_by("name"),
+        required=False,
+        help_text="Optionally shelve every new volume here.")
+    dry_run = forms.BooleanField(
+        required=False,
+        label="Dry run (look up and match only)")
+
+    def clean(self):
+        cleaned = super().clean()
+        upload = cleaned.get("file")
+        text = cleaned.get("isbns") or ""
+        if upload:
+            text += "\n" + upload.read().decode("utf-8-sig", errors="replace")
+        if not text.strip():
+            raise forms.ValidationError("Upload a file or paste some ISBNs.")
+        cleaned["text"] = text
+        return cleaned
+
+
 class DevNoteCreateForm(forms.ModelForm):
     class Meta:
         model = DevNote
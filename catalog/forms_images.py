@@ -2,7 +2,7 @@ from django import forms
 from django.forms import modelformset_factory
 
 from .models import VolumeImage, BooksetImage
-from .utils.images.images import process_upload
+from .services.images import save_upload
 
 class VolumeImageUploadForm(forms.ModelForm):
     upload = forms.ImageField(required=True)
@@ -20,11 +20,7 @@ class VolumeImageUploadForm(forms.ModelForm):
         instance = super().save(commit=False)
         instance.volume = self.volume
 
-        base, thumb, display, detail = process_upload(self.cleaned_data["upload"])
-
-        instance.image_thumb.save(f"{base}_thumb.webp", thumb, save=False)
-        instance.image_display.save(f"{base}_display.webp", display, save=False)
-        instance.image_detail.save(f"{base}_detail.webp", detail, save=False)
+        save_upload(instance, self.cleaned_data["upload"])
 
         if commit:
             instance.save()
@@ -51,11 +47,7 @@ class BooksetImageUploadForm(forms.ModelForm):
         instance = super().save(commit=False)
         instance.bookset = self.bookset
 
-        base, thumb, display, detail = process_upload(self.cleaned_data["upload"])
-
-        instance.image_thumb.save(f"{base}_thumb.webp", thumb, save=False)
-        instance.image_display.save(f"{base}_display.webp", display, save=False)
-        instance.image_detail.save(f"{base}_detail.webp", detail, save=False)
+        save_upload(instance, self.cleaned_data["upload"])
 
         if commit:
             instance.save()
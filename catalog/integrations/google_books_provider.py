@@ -1,13 +1,73 @@
-import requests
 import os
+import re
+import threading
+
+import requests
+from django.conf import settings
+from django.core.cache import caches
+from requests.adapters import HTTPAdapter
+
+from catalog.utils.isbn_conversion_util import isbn10_to_isbn13
+
 
 class GoogleBooksProvider:
+    """
+    ISBN lookups against the Google Books API.
+
+    Responses are cached per normalized ISBN-13 in the "google_books" cache
+    (see CACHES in settings): successful lookups for GOOGLE_BOOKS_CACHE_TTL
+    seconds and "no results" (LookupError) for GOOGLE_BOOKS_NEGATIVE_CACHE_TTL.
+    Transport/HTTP errors are never cached. Requests share one pooled
+    ``requests.Session`` per process.
+    """
     BASE_URL = "https://www.googleapis.com/books/v1/volumes"
     key = os.environ.get("GOOGLE_BOOKS_API_KEY")
+
+    CACHE_ALIAS = "google_books"
+    CACHE_PREFIX = "gbooks:isbn:"
+    DEFAULT_TTL = 60 * 60 * 24 * 30       # 30 days
+    DEFAULT_NEGATIVE_TTL = 60 * 60 * 24   # 1 day
+
+    _session = None
+    _lock = threading.Lock()
+    _counters = {"hits": 0, "negative_hits": 0, "misses": 0, "errors": 0}
+
     @classmethod
     def lookup(cls, isbn: str) -> dict:
-        url = f"{cls.BASE_URL}?q=isbn:{isbn}&key={cls.key}"
-        response = requests.get(url, timeout=5)
+        isbn13 = cls.normalize_isbn(isbn)
+        cache = cls._cache()
+        cache_key = f"{cls.CACHE_PREFIX}{isbn13}"
+
+        cached = cache.get(cache_key)
+        if cached is not None:
+            if cached["found"]:
+                cls._count("hits")
+                return dict(cached["data"])
+            cls._count("negative_hits")
+            raise LookupError(cached["error"])
+
+        cls._count("misses")
+        try:
+            data = cls._fetch(isbn13)
+        except LookupError as e:
+            cache.set(cache_key, {"found": False, "error": str(e)},
+                      cls._ttl("GOOGLE_BOOKS_NEGATIVE_CACHE_TTL",
+                               cls.DEFAULT_NEGATIVE_TTL))
+            raise
+        except Exception:
+            cls._count("errors")
+            raise
+
+        cache.set(cache_key, {"found": True, "data": data},
+                  cls._ttl("GOOGLE_BOOKS_CACHE_TTL", cls.DEFAULT_TTL))
+        return dict(data)
+
+    @classmethod
+    def _fetch(cls, isbn: str) -> dict:
+        params = {"q": f"isbn:{isbn}"}
+        if cls.key:
+            params["key"] = cls.key
+        response = cls.session().get(cls.BASE_URL, params=params, timeout=5)
         response.raise_for_status()
         data = response.json()
 
@@ -34,3 +94,58 @@ class GoogleBooksProvider:
         for identifier in item.get("industryIdentifiers", []):
             if identifier["type"] == kind:
                 return identifier["identifier"]
+
+    # ---- Helpers ------------------------------------------
+
+    @staticmethod
+    def normalize_isbn(isbn: str) -> str:
+        """Strip separators and convert ISBN-10 to ISBN-13 where possible."""
+        cleaned = re.sub(r"[^0-9Xx]", "", isbn or "").upper()
+        if len(cleaned) == 10:
+            try:
+                return isbn10_to_isbn13(cleaned)
+            except ValueError:
+                pass
+        return cleaned
+
+    @classmethod
+    def session(cls) -> requests.Session:
+        if cls._session is None:
+            with cls._lock:
+                if cls._session is None:
+                    s = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                          max_retries=1)
+                    s.mount("https://", adapter)
+                    s.headers["User-Agent"] = "ExLibris/1.0"
+                    cls._session = s
+        return cls._session
+
+    @classmethod
+    def _cache(cls):
+        alias = cls.CACHE_ALIAS if cls.CACHE_ALIAS in settings.CACHES else "default"
+        return caches[alias]
+
+    @staticmethod
+    def _ttl(setting_name, default):
+        return getattr(settings, setting_name, default)
+
+    @classmethod
+    def _count(cls, name):
+        with cls._lock:
+            cls._counters[name] += 1
+
+    @classmethod
+    def cache_stats(cls) -> dict:
+        """Hit/miss counters for this process."""
+        with cls._lock:
+            return dict(cls._counters)
+
+    @classmethod
+    def is_cached(cls, isbn: str) -> bool:
+        """True if a lookup for this ISBN would be answered from the cache."""
+        return cls._cache().has_key(f"{cls.CACHE_PREFIX}{cls.normalize_isbn(isbn)}")
+
+    @classmethod
+    def forget(cls, isbn: str) -> None:
+        cls._cache().delete(f"{cls.CACHE_PREFIX}{cls.normalize_isbn(isbn)}")
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from catalog.models import BooksetImage, VolumeImage
+
+
+class Command(BaseCommand):
+    help = ("Point `original` at the stored 1800px detail file for images "
+            "uploaded before on-demand variants, so they are served (and "
+            "resized) through the variant endpoint too.")
+
+    def handle(self, *args, **opts):
+        for model in (VolumeImage, BooksetImage):
+            count = (model.objects.filter(original="")
+                     .exclude(image_detail="")
+                     .update(original=F("image_detail")))
+            self.stdout.write(self.style.SUCCESS(f"{model.__name__}: {count}"))
@@ -0,0 +1,260 @@
+import json
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from catalog.models import Author, BookSet, Bookshelf, Collection, Volume, Work
+from catalog.services import synthetic_catalog
+
+DEFAULT_SCALES = "1000,10000"
+
+
+def _slugs(model, rng, count=20):
+    ids = list(model.objects.exclude(slug=None).exclude(slug="")
+               .values_list("slug", flat=True)[:2000])
+    return rng.sample(ids, min(count, len(ids)))
+
+
+def view_cases(rng):
+    """
+    (name, callable returning a URL) for every list, detail and search view.
+    Detail URLs rotate through random objects so one cached row doesn't
+    flatter the numbers.
+    """
+    def rotating(url_name, slugs):
+        it = iter(())
+
+        def next_url():
+            nonlocal it
+            slug = next(it, None)
+            if slug is None:
+                it = iter(slugs)
+                slug = next(it)
+            return reverse(url_name, args=[slug])
+        return next_url
+
+    def fixed(url_name, query=""):
+        return lambda: reverse(url_name) + query
+
+    words = [w.lower() for w in synthetic_catalog.NOUNS + synthetic_catalog.SURNAMES]
+    cases = [
+        ("volume_list", fixed("volume_list")),
+        ("volume_list:list_view", fixed("volume_list", "?view=list")),
+        ("volume_list:author_desc", fixed("volume_list", "?sort=author&dir=desc")),
+        ("volume_list:pub_year", fixed("volume_list", "?sort=pub_year")),
+        ("author_list", fixed("author_list")),
+        ("work_list", fixed("work_list")),
+        ("bookset_list", fixed("bookset_list")),
+        ("catalog_all", fixed("catalog_all")),
+        ("bookshelf_list", fixed("bookshelf_list")),
+        ("collection_list", fixed("collection_list")),
+        ("stats", fixed("stats")),
+        ("dashboard", fixed("dashboard")),
+        ("search_results", lambda: reverse("search_results") + f"?q={rng.choice(words)}"),
+    ]
+    for model in (Volume, Work, Author, BookSet, Bookshelf, Collection):
+        url_name = f"{model._meta.model_name}_detail"
+        slugs = _slugs(model, rng)
+        if slugs:
+            cases.append((url_name, rotating(url_name, slugs)))
+    return cases
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR,
+                              capture_output=True, text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+class Command(BaseCommand):
+    help = ("Benchmark every list, detail and search view against synthetic "
+            "catalogs of several sizes: latency percentiles, query counts and "
+            "peak Python memory, written to a JSON report. Runs in a throwaway "
+            "test database unless --in-place.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scales", default=DEFAULT_SCALES,
+                            help="Comma-separated synthetic volume counts.")
+        parser.add_argument("--repeat", type=int, default=20,
+                            help="Timed requests per view and scale.")
+        parser.add_argument("--only", default="", help="Only views whose name contains this.")
+        parser.add_argument("--output", default="bench_views.json")
+        parser.add_argument("--compare", default="",
+                            help="Earlier report to diff against.")
+        parser.add_argument("--threshold", type=float, default=0.2,
+                            help="Relative p50 slowdown reported as a regression.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--in-place", action="store_true",
+                            help="Use the configured database (adds synthetic rows to it).")
+        parser.add_argument("--keepdb", action="store_true",
+                            help="Keep (and reuse) the benchmark database.")
+
+    def handle(self, *args, **opts):
+        try:
+            scales = sorted(int(s) for s in opts["scales"].split(",") if s.strip())
+        except ValueError:
+            raise CommandError("--scales must be comma-separated integers.")
+
+        old_name = None
+        if not opts["in_place"]:
+            old_name = connection.settings_dict["NAME"]
+            connection.creation.create_test_db(verbosity=0, autoclobber=True,
+                                               keepdb=opts["keepdb"], serialize=False)
+        try:
+            with tempfile.TemporaryDirectory() as media, \
+                    override_settings(MEDIA_ROOT=media, IMAGE_VARIANT_CACHE_DIR=media,
+                                      REQUEST_METRICS_ENABLED=False, DEBUG=False):
+                report = self._run(scales, opts)
+        finally:
+            if old_name is not None:
+                connection.creation.destroy_test_db(old_name, verbosity=0,
+                                                    keepdb=opts["keepdb"])
+
+        with open(opts["output"], "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        self.stdout.write(f"Report written to {opts['output']}")
+
+        if opts["compare"]:
+            self._compare(report, opts["compare"], opts["threshold"])
+        self.stdout.write(self.style.SUCCESS("Done."))
+
+    # ---- running ---------------------------------------------
+
+    def _run(self, scales, opts):
+        rng = random.Random(opts["seed"])
+        user, _ = get_user_model().objects.get_or_create(
+            username="bench", defaults={"is_staff": True, "is_superuser": True})
+        # a view that errors is recorded as such instead of ending the run
+        client = Client(raise_request_exception=False)
+        client.force_login(user)
+
+        report = {
+            "meta": {
+                "commit": _git_commit(),
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "repeat": opts["repeat"],
+            },
+            "scales": {},
+        }
+
+        for scale in scales:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"Scale {scale}"))
+            synthetic_catalog.generate(scale, seed=opts["seed"],
+                                       log=lambda m: self.stdout.write(f"  {m}"))
+            results = {}
+            for name, url_for in view_cases(rng):
+                if opts["only"] not in name:
+                    continue
+                try:
+                    r = self._measure(client, url_for, opts["repeat"])
+                except Exception as e:  # e.g. no URL for the case at this scale
+                    results[name] = {"error": repr(e)}
+                    self.stdout.write(self.style.ERROR(f"  {name:<28} failed: {e!r}"))
+                    continue
+                results[name] = r
+                line = (f"  {name:<28} p50={r['p50_ms']:8.1f}ms p95={r['p95_ms']:8.1f}ms "
+                        f"queries={r['queries']:4d} peak={r['peak_kib']:8.0f}KiB "
+                        f"status={r['status']}")
+                if r["errors"]:
+                    line += f" errors={r['errors']}/{opts['repeat']} {r['error_statuses']}"
+                    self.stdout.write(self.style.ERROR(line))
+                else:
+                    self.stdout.write(line)
+            report["scales"][str(scale)] = results
+        return report
+
+    @staticmethod
+    def _measure(client, url_for, repeat):
+        client.get(url_for())  # warm caches / connections
+
+        timings, queries, statuses = [], [], []
+        for _ in range(max(1, repeat)):
+            url = url_for()
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                response = client.get(url)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(ctx.captured_queries))
+            statuses.append(response.status_code)
+
+        # memory in its own request: tracemalloc slows everything it watches
+        tracemalloc.start()
+        try:
+            client.get(url_for())
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "p50_ms": round(statistics.median(timings), 2),
+            "p90_ms": round(_percentile(timings, 90), 2),
+            "p95_ms": round(_percentile(timings, 95), 2),
+            "p99_ms": round(_percentile(timings, 99), 2),
+            "max_ms": round(max(timings), 2),
+            "queries": max(queries),
+            "peak_kib": round(peak / 1024, 1),
+            "status": statuses[-1],
+            # non-2xx responses; their timings are in the percentiles too
+            "errors": sum(not 200 <= code < 300 for code in statuses),
+            "error_statuses": sorted({code for code in statuses if not 200 <= code < 300}),
+        }
+
+    # ---- comparing -------------------------------------------
+
+    def _compare(self, report, path, threshold):
+        with open(path, encoding="utf-8") as fh:
+            old = json.load(fh)
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"Compared with {path} (commit {old.get('meta', {}).get('commit') or '?'})"))
+        regressions = failing = 0
+        for scale, views in report["scales"].items():
+            for name, new in views.items():
+                if "error" in new or new.get("errors"):
+                    # timings of error responses aren't comparable
+                    failing += 1
+                    detail = new.get("error") or (f"{new['errors']} non-2xx "
+                                                  f"{new['error_statuses']}")
+                    self.stdout.write(self.style.ERROR(
+                        f"  {scale:>7} {name:<28} ERRORS: {detail}"))
+                    continue
+                before = old.get("scales", {}).get(scale, {}).get(name)
+                if not before or "error" in before:
+                    continue
+                slower = new["p50_ms"] > before["p50_ms"] * (1 + threshold)
+                more_queries = new["queries"] > before["queries"]
+                line = (f"  {scale:>7} {name:<28} p50 {before['p50_ms']:8.1f} -> "
+                        f"{new['p50_ms']:8.1f}ms  queries {before['queries']} -> {new['queries']}")
+                if slower or more_queries:
+                    regressions += 1
+                    self.stdout.write(self.style.ERROR(line + "  REGRESSION"))
+                else:
+                    self.stdout.write(line)
+        if regressions:
+            self.stdout.write(self.style.WARNING(f"{regressions} regression(s)."))
+        if failing:
+            self.stdout.write(self.style.WARNING(f"{failing} view(s) returned errors."))
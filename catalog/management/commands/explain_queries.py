@@ -0,0 +1,128 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+
+from catalog.models import Author, BookSet, Volume, Work
+from catalog.utils import keyset
+from catalog.views.volumes import VolumeListView
+
+MODELS = (Author, Work, BookSet, Volume)
+
+
+def _sample(model, field):
+    return (model.objects.exclude(**{f"{field}__isnull": True})
+            .values_list(field, flat=True).first())
+
+
+def view_queries():
+    """(label, queryset) for the main query behind each catalog view."""
+    queries = []
+    for sort, fields in VolumeListView.SORTS.items():
+        qs = (Volume.objects.select_related("primary_work__author", "book_set",
+                                            "cover_image")
+              .order_by(*keyset.order_by(fields, descending=False)))
+        queries.append((f"volume_list sort={sort}", qs[:33]))
+
+    queries += [
+        ("author_list", Author.objects.order_by("sort_name")[:20]),
+        ("work_list", Work.objects.select_related("author").order_by("sort_title")[:20]),
+        ("bookset_list", BookSet.objects.order_by("title")[:20]),
+        ("author_works", Work.objects.filter(author_id=_sample(Work, "author_id") or 0)
+         .order_by("sort_title")),
+        ("bookset_volumes", Volume.objects.filter(book_set_id=_sample(Volume, "book_set_id") or 0)
+         .order_by("volume_number", "title")),
+        ("volume_by_isbn13", Volume.objects.filter(isbn13=_sample(Volume, "isbn13") or "")),
+        ("volume_by_isbn10", Volume.objects.filter(isbn10=_sample(Volume, "isbn10") or "")),
+        ("bookset_by_isbn13", BookSet.objects.filter(isbn13=_sample(BookSet, "isbn13") or "")),
+        ("work_by_slug", Work.objects.filter(slug=_sample(Work, "slug") or "")),
+        ("bookset_by_slug", BookSet.objects.filter(slug=_sample(BookSet, "slug") or "")),
+        ("volumes_missing_cover", Volume.objects.filter(cover_image__isnull=True)
+         .exclude(cover_url__isnull=True).exclude(cover_url__exact="").order_by("pk")),
+        ("autocomplete_work", Work.objects.filter(sort_title__istartswith="ha")
+         .order_by("sort_title", "id")[:20]),
+        ("autocomplete_author", Author.objects.filter(
+            Q(sort_name__istartswith="ha") | Q(full_name__istartswith="ha"))
+         .order_by("sort_name", "id")[:20]),
+    ]
+    return queries
+
+
+class Command(BaseCommand):
+    help = ("Print the query plan and median run time of each catalog view's "
+            "main query, with and without the declared Meta.indexes (dropped "
+            "inside a transaction that is rolled back).")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5,
+                            help="Timed runs per query (median reported).")
+        parser.add_argument("--only", default="",
+                            help="Only queries whose label contains this text.")
+        parser.add_argument("--after-only", action="store_true",
+                            help="Skip the run without indexes.")
+        parser.add_argument("--analyze", action="store_true",
+                            help="EXPLAIN ANALYZE (PostgreSQL only).")
+
+    def handle(self, *args, **opts):
+        if opts["analyze"] and connection.vendor != "postgresql":
+            raise CommandError("--analyze needs PostgreSQL.")
+
+        queries = [(label, qs) for label, qs in view_queries()
+                   if opts["only"] in label]
+        results = {}
+
+        if not opts["after_only"]:
+            with transaction.atomic():
+                dropped = self._drop_indexes()
+                self.stdout.write(self.style.WARNING(
+                    f"== Without indexes ({dropped} dropped, rolled back afterwards) =="))
+                results["before"] = self._run(queries, opts)
+                transaction.set_rollback(True)
+
+        self.stdout.write(self.style.WARNING("== With indexes =="))
+        results["after"] = self._run(queries, opts)
+
+        if "before" in results:
+            self.stdout.write("")
+            for label, _ in queries:
+                before, after = results["before"][label], results["after"][label]
+                self.stdout.write(f"{label:<32} {before:8.2f} ms -> {after:8.2f} ms")
+        self.stdout.write(self.style.SUCCESS(f"Done. Explained {len(queries)} queries."))
+
+    def _drop_indexes(self):
+        # Plain DROP INDEX statements rather than a schema editor: SQLite's
+        # editor refuses to open inside atomic(), and the statements roll
+        # back with the surrounding transaction on both databases.
+        statements = []
+        if connection.vendor == "sqlite":
+            for model in MODELS:
+                statements += [f"DROP INDEX {connection.ops.quote_name(index.name)}"
+                               for index in model._meta.indexes]
+        else:
+            editor = connection.schema_editor()  # only used to build the SQL
+            for model in MODELS:
+                statements += [str(index.remove_sql(model, editor))
+                               for index in model._meta.indexes]
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+        return len(statements)
+
+    def _run(self, queries, opts):
+        timings = {}
+        for label, qs in queries:
+            plan = qs.explain(analyze=True) if opts["analyze"] else qs.explain()
+            runs = []
+            for _ in range(max(1, opts["repeat"])):
+                started = time.perf_counter()
+                list(qs.all())
+                runs.append((time.perf_counter() - started) * 1000)
+            timings[label] = statistics.median(runs)
+
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{label} ({timings[label]:.2f} ms)"))
+            for line in plan.splitlines():
+                self.stdout.write(f"    {line}")
+        return timings
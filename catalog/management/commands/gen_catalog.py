@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.services import synthetic_catalog
+
+
+class Command(BaseCommand):
+    help = ("Generate a synthetic catalog of --scale volumes (with authors, works, "
+            "sets, shelves, collections and placeholder cover images) using bulk "
+            "inserts. Tops up an existing synthetic catalog rather than doubling it.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=0,
+                            help="Target number of synthetic volumes.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--no-images", action="store_true",
+                            help="Skip placeholder cover images.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--clear", action="store_true",
+                            help="Delete synthetic rows (before generating, if --scale is given).")
+
+    def handle(self, *args, **opts):
+        if not opts["scale"] and not opts["clear"]:
+            raise CommandError("Give --scale N and/or --clear.")
+
+        if opts["clear"]:
+            deleted = synthetic_catalog.clear()
+            self.stdout.write(f"Cleared {deleted} synthetic rows.")
+
+        if opts["scale"]:
+            created = synthetic_catalog.generate(
+                opts["scale"], seed=opts["seed"], images=not opts["no_images"],
+                batch_size=opts["batch_size"], log=self.stdout.write)
+            summary = ", ".join(f"{k}={v}" for k, v in created.items())
+            self.stdout.write(self.style.SUCCESS(f"Done. Created {summary}"))
+        else:
+            self.stdout.write(self.style.SUCCESS("Done."))
@@ -0,0 +1,69 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.models import Bookshelf
+from catalog.services import bulk_import
+
+
+class Command(BaseCommand):
+    help = ("Bulk-create Volumes from a list of ISBNs (one per line, or a CSV "
+            "with an 'isbn' column). Reads stdin when no file is given.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", default="-",
+                            help="File of ISBNs ('-' for stdin).")
+        parser.add_argument("--workers", type=int,
+                            default=bulk_import.DEFAULT_WORKERS,
+                            help="Concurrent Google Books lookups.")
+        parser.add_argument("--rate", type=float,
+                            default=bulk_import.DEFAULT_RATE,
+                            help="Max Google Books requests per second.")
+        parser.add_argument("--bookshelf", default="",
+                            help="Slug of a bookshelf to put new volumes on.")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Look up and match, but don't create anything.")
+        parser.add_argument("--report", default="",
+                            help="Write the per-row report as CSV to this path.")
+
+    def handle(self, *args, **opts):
+        if opts["path"] == "-":
+            text = sys.stdin.read()
+        else:
+            try:
+                with open(opts["path"], encoding="utf-8-sig") as fh:
+                    text = fh.read()
+            except OSError as e:
+                raise CommandError(str(e))
+
+        bookshelf = None
+        if opts["bookshelf"]:
+            bookshelf = Bookshelf.objects.filter(slug=opts["bookshelf"]).first()
+            if bookshelf is None:
+                raise CommandError(f"No bookshelf with slug {opts['bookshelf']!r}")
+
+        rows = bulk_import.import_isbns(
+            text,
+            workers=opts["workers"],
+            rate=opts["rate"],
+            dry_run=opts["dry_run"],
+            bookshelf=bookshelf,
+        )
+
+        for row in rows:
+            line = f"{row.line:>5} {row.raw:<17} {row.status:<12} {row.title or row.message}"
+            if row.status in (bulk_import.CREATED, bulk_import.WOULD_CREATE):
+                self.stdout.write(self.style.SUCCESS(line))
+            elif row.status in (bulk_import.EXISTS, bulk_import.DUPLICATE):
+                self.stdout.write(line)
+            else:
+                self.stdout.write(self.style.WARNING(line))
+
+        if opts["report"]:
+            with open(opts["report"], "w", newline="", encoding="utf-8") as fh:
+                bulk_import.write_report(rows, fh)
+
+        counts = bulk_import.summarize(rows)
+        self.stdout.write(self.style.SUCCESS(
+            "Done. " + ", ".join(f"{k}={v}" for k, v in sorted(counts.items()))
+        ))
@@ -0,0 +1,40 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from catalog.models import RenderedMarkdownModel
+
+
+class Command(BaseCommand):
+    help = ("Render every Markdown field in the catalog (and reading paths / "
+            "site content) whose stored HTML is missing or out of date.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **opts):
+        batch_size = opts["batch_size"]
+        total = 0
+        for model in apps.get_models():
+            if not issubclass(model, RenderedMarkdownModel):
+                continue
+            fields = ["pk", "rendered_markdown", *model.markdown_fields]
+            changed, count = [], 0
+            for obj in model._default_manager.only(*fields).iterator(chunk_size=batch_size):
+                if obj.refresh_rendered_markdown():
+                    changed.append(obj)
+                if len(changed) >= batch_size:
+                    count += self._flush(model, changed, batch_size)
+            count += self._flush(model, changed, batch_size)
+            total += count
+            self.stdout.write(f"{model._meta.label}: {count} rendered")
+        self.stdout.write(self.style.SUCCESS(f"Done. Rendered {total} rows."))
+
+    @staticmethod
+    def _flush(model, objs, batch_size):
+        # bulk_update skips save() and signals; only the cache column changes
+        count = len(objs)
+        if objs:
+            model._default_manager.bulk_update(objs, ["rendered_markdown"],
+                                               batch_size=batch_size)
+            objs.clear()
+        return count
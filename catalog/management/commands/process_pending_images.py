@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from catalog.services.images import generate_derivatives, lazy_derivatives
+
+
+class Command(BaseCommand):
+    help = ("Generate missing thumb/display/detail derivatives for images "
+            "uploaded in async mode (e.g. after a restart interrupted them).")
+
+    def handle(self, *args, **opts):
+        if lazy_derivatives():
+            self.stdout.write(self.style.WARNING(
+                "IMAGE_LAZY_DERIVATIVES is on: sizes are rendered on demand, nothing to do."))
+            return
+        count = generate_derivatives()
+        self.stdout.write(self.style.SUCCESS(f"Done. Processed={count}"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from catalog.services import image_variants
+
+
+class Command(BaseCommand):
+    help = ("Evict least-recently-used on-demand image variants until the "
+            "cache is under its size budget.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--max-bytes", type=int, default=None,
+                            help="Budget in bytes (default IMAGE_VARIANT_CACHE_MAX_BYTES).")
+
+    def handle(self, *args, **opts):
+        files, size = image_variants.prune(opts["max_bytes"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. Removed {files} files ({size / 1024 / 1024:.1f} MiB) "
+            f"from {image_variants.cache_root()}"))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from catalog.services import author_volumes
+
+
+class Command(BaseCommand):
+    help = ("Recompute the author <-> volume index and every author's "
+            "volume count and representative cover from scratch.")
+
+    def handle(self, *args, **opts):
+        rows = author_volumes.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Done. {rows} author/volume rows."))
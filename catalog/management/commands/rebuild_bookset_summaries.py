@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from catalog.services import bookset_summary
+
+
+class Command(BaseCommand):
+    help = ("Recompute every book set's stored representative author, "
+            "volume count and preview volumes.")
+
+    def handle(self, *args, **opts):
+        sets = bookset_summary.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Done. {sets} book sets."))
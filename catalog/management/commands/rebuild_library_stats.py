@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from catalog.services import stats
+
+
+class Command(BaseCommand):
+    help = "Recompute every section of the materialized library stats from scratch."
+
+    def handle(self, *args, **opts):
+        sections = stats.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            "Done. Rebuilt " + ", ".join(sections)
+        ))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from catalog.services import search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for authors, works, volumes and book sets."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500,
+                            help="Objects indexed per batch.")
+
+    def handle(self, *args, **opts):
+        counts = search_index.rebuild(batch_size=opts["batch_size"],
+                                      stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(
+            "Done. " + ", ".join(f"{k}={v}" for k, v in counts.items())
+        ))
@@ -0,0 +1,212 @@
+"""
+Per-request instrumentation that is cheap enough to leave on in production.
+
+For every request we count SQL queries and their time (via the connection
+execute_wrapper hook, on every configured database), fingerprint them to
+spot N+1 patterns, and time the view and template rendering. The numbers go
+out as a Server-Timing header (visible in the browser's network panel) and
+as one "catalog.metrics" log line per sampled request. A request that runs
+more queries than its view's budget always logs a warning.
+
+Settings:
+    REQUEST_METRICS_ENABLED        default True
+    REQUEST_METRICS_SERVER_TIMING  add the header (default True)
+    REQUEST_METRICS_SAMPLE_RATE    share of requests logged at INFO (default 1.0)
+    REQUEST_METRICS_BUDGETS        {url_name: max queries}
+    REQUEST_METRICS_DEFAULT_BUDGET max queries for other views (default None)
+
+A view can also carry its own budget: ``query_budget = 12`` on a class-based
+view, or the same attribute set on a function view.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends import django as django_backend
+
+logger = logging.getLogger("catalog.metrics")
+
+_current = contextvars.ContextVar("request_metrics", default=None)
+
+_NUMBERS = re.compile(r"\b\d+(\.\d+)?\b")
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_IN_LISTS = re.compile(r"\(\s*(%s|\?)(\s*,\s*(%s|\?))*\s*\)")
+
+
+def fingerprint(sql: str) -> str:
+    """SQL with literals and IN-list lengths erased, so N+1 queries collide."""
+    sql = _STRINGS.sub("?", sql)
+    sql = _NUMBERS.sub("?", sql)
+    return _IN_LISTS.sub("(...)", sql)
+
+
+class RequestMetrics:
+    __slots__ = ("queries", "db_time", "fingerprints", "template_time",
+                 "template_depth", "view_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.fingerprints = Counter()
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.view_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def duplicates(self) -> list[tuple[str, int]]:
+        return [(fp, n) for fp, n in self.fingerprints.most_common() if n > 1]
+
+
+# ---- Template timing ----------------------------------------
+
+_original_render = django_backend.Template.render
+
+
+def _timed_render(self, context=None, request=None):
+    metrics = _current.get()
+    if metrics is None:
+        return _original_render(self, context, request)
+    # nested render_to_string calls (template tags) count once, in the outer one
+    metrics.template_depth += 1
+    started = time.perf_counter()
+    try:
+        return _original_render(self, context, request)
+    finally:
+        metrics.template_depth -= 1
+        if not metrics.template_depth:
+            metrics.template_time += time.perf_counter() - started
+
+
+def _install_template_timer():
+    if django_backend.Template.render is not _timed_render:
+        django_backend.Template.render = _timed_render
+
+
+# ---- Middleware ----------------------------------------------
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_METRICS_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.server_timing = getattr(settings, "REQUEST_METRICS_SERVER_TIMING", True)
+        self.sample_rate = getattr(settings, "REQUEST_METRICS_SAMPLE_RATE", 1.0)
+        self.budgets = getattr(settings, "REQUEST_METRICS_BUDGETS", {})
+        self.default_budget = getattr(settings, "REQUEST_METRICS_DEFAULT_BUDGET", None)
+        _install_template_timer()
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(metrics))
+                response = self.get_response(request)
+                self._stop_view_clock(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - started
+
+        if self.server_timing:
+            response["Server-Timing"] = self.header(metrics, total)
+        self.report(request, response, metrics, total)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_view = view_func
+        request._metrics_view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # TemplateResponse renders after the view returns; stop the view clock
+        # here so the render lands in tpl, not view
+        self._stop_view_clock(request)
+        return response
+
+    @staticmethod
+    def _stop_view_clock(request):
+        started = getattr(request, "_metrics_view_started", None)
+        metrics = _current.get()
+        if started is not None and metrics is not None:
+            # function views render inside the view: keep that out of view time
+            metrics.view_time = max(
+                0.0, time.perf_counter() - started - metrics.template_time)
+            request._metrics_view_started = None
+
+    # ---- output --------------------------------------------
+
+    @staticmethod
+    def header(metrics, total) -> str:
+        ms = lambda seconds: f"{seconds * 1000:.1f}"
+        parts = [
+            f'db;dur={ms(metrics.db_time)};desc="{metrics.queries} queries"',
+            f"tpl;dur={ms(metrics.template_time)}",
+        ]
+        if metrics.view_time:
+            parts.append(f"view;dur={ms(metrics.view_time)}")
+        parts.append(f"total;dur={ms(total)}")
+        return ", ".join(parts)
+
+    def budget_for(self, request):
+        view = getattr(request, "_metrics_view", None)
+        view_class = getattr(view, "view_class", None)
+        for owner in (view_class, view):
+            budget = getattr(owner, "query_budget", None)
+            if budget is not None:
+                return budget
+        match = getattr(request, "resolver_match", None)
+        name = match.url_name if match else None
+        return self.budgets.get(name, self.default_budget)
+
+    def report(self, request, response, metrics, total):
+        match = getattr(request, "resolver_match", None)
+        name = (match.view_name if match else None) or request.path
+        duplicates = metrics.duplicates()
+        fields = {
+            "view": name,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": metrics.queries,
+            "db_ms": round(metrics.db_time * 1000, 1),
+            "duplicate_queries": sum(n - 1 for _, n in duplicates),
+            "tpl_ms": round(metrics.template_time * 1000, 1),
+            "view_ms": round(metrics.view_time * 1000, 1),
+            "total_ms": round(total * 1000, 1),
+        }
+
+        budget = self.budget_for(request)
+        if budget is not None and metrics.queries > budget:
+            worst = duplicates[0] if duplicates else ("", 0)
+            logger.warning(
+                "Query budget exceeded for %s: %d queries (budget %d); "
+                "most repeated (%dx): %s",
+                name, metrics.queries, budget, worst[1], worst[0][:300],
+                extra={"metrics": fields | {"budget": budget}},
+            )
+        elif random.random() < self.sample_rate:
+            logger.info(
+                "%(method)s %(path)s %(status)s view=%(view)s queries=%(queries)d "
+                "db_ms=%(db_ms)s dup=%(duplicate_queries)d tpl_ms=%(tpl_ms)s "
+                "view_ms=%(view_ms)s total_ms=%(total_ms)s",
+                fields, extra={"metrics": fields},
+            )
@@ -0,0 +1,97 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+FTS_SQLITE = [
+    """
+    CREATE VIRTUAL TABLE catalog_searchdocument_fts USING fts5(
+        title, body,
+        content='catalog_searchdocument',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER catalog_searchdocument_ai AFTER INSERT ON catalog_searchdocument BEGIN
+        INSERT INTO catalog_searchdocument_fts(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER catalog_searchdocument_ad AFTER DELETE ON catalog_searchdocument BEGIN
+        INSERT INTO catalog_searchdocument_fts(catalog_searchdocument_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER catalog_searchdocument_au AFTER UPDATE ON catalog_searchdocument BEGIN
+        INSERT INTO catalog_searchdocument_fts(catalog_searchdocument_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO catalog_searchdocument_fts(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+
+FTS_SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS catalog_searchdocument_au",
+    "DROP TRIGGER IF EXISTS catalog_searchdocument_ad",
+    "DROP TRIGGER IF EXISTS catalog_searchdocument_ai",
+    "DROP TABLE IF EXISTS catalog_searchdocument_fts",
+]
+
+FTS_POSTGRES = [
+    """
+    ALTER TABLE catalog_searchdocument ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX catalog_searchdocument_vector_idx
+    ON catalog_searchdocument USING GIN (search_vector)
+    """,
+]
+
+FTS_POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS catalog_searchdocument_vector_idx",
+    "ALTER TABLE catalog_searchdocument DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0075_alter_volume_sales_price_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(choices=[('author', 'Author'), ('work', 'Work'), ('volume', 'Volume'), ('bookset', 'BookSet')], max_length=20)),
+                ('entity_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('body', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('entity_type', 'entity_id'), name='uniq_searchdocument_entity')],
+            },
+        ),
+        migrations.RunPython(
+            _run({"sqlite": FTS_SQLITE, "postgresql": FTS_POSTGRES}),
+            _run({"sqlite": FTS_SQLITE_REVERSE,
+                  "postgresql": FTS_POSTGRES_REVERSE}),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:40
+
+import catalog.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0076_searchdocument'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='volumeimage',
+            name='original',
+            field=models.ImageField(blank=True, upload_to=catalog.models.volume_image_upload_to),
+        ),
+        migrations.AlterField(
+            model_name='volumeimage',
+            name='image_detail',
+            field=models.ImageField(blank=True, upload_to=catalog.models.volume_image_upload_to),
+        ),
+        migrations.AlterField(
+            model_name='volumeimage',
+            name='image_display',
+            field=models.ImageField(blank=True, upload_to=catalog.models.volume_image_upload_to),
+        ),
+        migrations.AlterField(
+            model_name='volumeimage',
+            name='image_thumb',
+            field=models.ImageField(blank=True, upload_to=catalog.models.volume_image_upload_to),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.1 on 2026-10-18 13:05
+
+import catalog.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0077_volumeimage_original'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booksetimage',
+            name='original',
+            field=models.ImageField(blank=True, upload_to=catalog.models.bookset_image_upload_to),
+        ),
+        migrations.AlterField(
+            model_name='booksetimage',
+            name='image_detail',
+            field=models.ImageField(blank=True, upload_to=catalog.models.bookset_image_upload_to),
+        ),
+        migrations.AlterField(
+            model_name='booksetimage',
+            name='image_display',
+            field=models.ImageField(blank=True, upload_to=catalog.models.bookset_image_upload_to),
+        ),
+        migrations.AlterField(
+            model_name='booksetimage',
+            name='image_thumb',
+            field=models.ImageField(blank=True, upload_to=catalog.models.bookset_image_upload_to),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 6.0.1 on 2026-10-18 15:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0079_statssection'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='volume',
+            index=models.Index(fields=['sort_title', 'title', 'id'], name='volume_title_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volume',
+            index=models.Index(fields=['date_added', 'id'], name='volume_added_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volume',
+            index=models.Index(fields=['publication_year', 'sort_title', 'id'], name='volume_pubyear_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volume',
+            index=models.Index(fields=['publisher', 'sort_title', 'id'], name='volume_publisher_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volume',
+            index=models.Index(fields=['acquisition_date', 'sort_title', 'id'], name='volume_acq_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volume',
+            index=models.Index(fields=['status', 'sort_title', 'id'], name='volume_status_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volume',
+            index=models.Index(fields=['estimated_value', 'sort_title', 'id'], name='volume_value_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volume',
+            index=models.Index(fields=['isbn13', 'sort_title', 'id'], name='volume_isbn_sort_idx'),
+        ),
+    ]
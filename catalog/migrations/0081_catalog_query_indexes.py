@@ -0,0 +1,53 @@
+# Generated by Django 6.0.1 on 2026-10-18 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0080_volume_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['sort_name', 'id'], name='author_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='work',
+            index=models.Index(fields=['sort_title', 'id'], name='work_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='work',
+            index=models.Index(fields=['author', 'sort_title'], name='work_author_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookset',
+            index=models.Index(fields=['title', 'id'], name='bookset_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookset',
+            index=models.Index(fields=['sort_title', 'id'], name='bookset_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookset',
+            index=models.Index(fields=['isbn13'], name='bookset_isbn13_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookset',
+            index=models.Index(fields=['isbn10'], name='bookset_isbn10_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volume',
+            index=models.Index(fields=['isbn10'], name='volume_isbn10_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volume',
+            index=models.Index(fields=['book_set', 'volume_number'], name='volume_set_number_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volume',
+            index=models.Index(condition=models.Q(('cover_image__isnull', True)), fields=['id'], name='volume_missing_cover_idx'),
+        ),
+    ]
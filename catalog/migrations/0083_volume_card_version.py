@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0082_rendered_markdown'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='volume',
+            name='card_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
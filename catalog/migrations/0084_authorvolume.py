@@ -0,0 +1,71 @@
+# Generated by Django 6.0.1 on 2026-10-18 17:40
+
+from collections import Counter
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate(apps, schema_editor):
+    Author = apps.get_model("catalog", "Author")
+    AuthorVolume = apps.get_model("catalog", "AuthorVolume")
+    Volume = apps.get_model("catalog", "Volume")
+    WorkLink = Volume._meta.get_field("works").remote_field.through
+
+    pairs = Counter(WorkLink.objects.values_list("work__author_id", "volume_id"))
+    titles = dict(Volume.objects.values_list("pk", "sort_title"))
+    AuthorVolume.objects.bulk_create(
+        [AuthorVolume(author_id=a, volume_id=v, work_count=n,
+                      sort_title=titles.get(v) or "")
+         for (a, v), n in pairs.items()],
+        batch_size=1000,
+    )
+
+    counts = Counter(a for a, _ in pairs)
+    covers = {}
+    for author_id, volume_id in (
+            AuthorVolume.objects
+            .filter(models.Q(volume__cover_image__isnull=False)
+                    | models.Q(volume__cover_url__gt=""))
+            .order_by("author_id", "sort_title", "volume_id")
+            .values_list("author_id", "volume_id")):
+        covers.setdefault(author_id, volume_id)
+    authors = [Author(pk=pk, volume_count=n, cover_volume_id=covers.get(pk))
+               for pk, n in counts.items()]
+    Author.objects.bulk_update(authors, ["volume_count", "cover_volume"],
+                               batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0083_volume_card_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='volume_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='cover_volume',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='catalog.volume'),
+        ),
+        migrations.CreateModel(
+            name='AuthorVolume',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('work_count', models.PositiveIntegerField(default=1)),
+                ('sort_title', models.CharField(blank=True, max_length=255)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='volume_links', to='catalog.author')),
+                ('volume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='author_links', to='catalog.volume')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('author', 'volume'), name='authorvolume_unique')],
+                'indexes': [models.Index(fields=['author', 'sort_title', 'volume'], name='authorvolume_sort_idx')],
+            },
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
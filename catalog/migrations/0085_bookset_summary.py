@@ -0,0 +1,66 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+PREVIEW_SIZE = 8
+
+
+def populate(apps, schema_editor):
+    BookSet = apps.get_model("catalog", "BookSet")
+    Volume = apps.get_model("catalog", "Volume")
+    WorkLink = Volume._meta.get_field("works").remote_field.through
+
+    members = {}
+    for pk, book_set_id, author_id in (
+            Volume.objects.filter(book_set__isnull=False)
+            .order_by("book_set_id", "volume_number", "sort_title", "id")
+            .values_list("pk", "book_set_id", "primary_work__author_id")):
+        members.setdefault(book_set_id, []).append((pk, author_id))
+
+    fallback = {}
+    for volume_id, author_id in (
+            WorkLink.objects
+            .filter(volume_id__in=[v[0][0] for v in members.values() if v[0][1] is None])
+            .order_by("volume_id", "work__sort_title", "work_id")
+            .values_list("volume_id", "work__author_id")):
+        fallback.setdefault(volume_id, author_id)
+
+    booksets = []
+    for book_set_id, vols in members.items():
+        first, author_id = vols[0]
+        booksets.append(BookSet(
+            pk=book_set_id,
+            representative_author_id=author_id or fallback.get(first),
+            volume_count=len(vols),
+            preview_volume_ids=[pk for pk, _ in vols[:PREVIEW_SIZE]],
+        ))
+    BookSet.objects.bulk_update(
+        booksets, ["representative_author", "volume_count", "preview_volume_ids"],
+        batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0084_authorvolume'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookset',
+            name='representative_author',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='catalog.author'),
+        ),
+        migrations.AddField(
+            model_name='bookset',
+            name='volume_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='bookset',
+            name='preview_volume_ids',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
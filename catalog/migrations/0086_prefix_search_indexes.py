@@ -0,0 +1,48 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:05
+
+from django.db import migrations
+
+# (index, table, column) behind catalog/services/autocomplete.py
+PREFIX_COLUMNS = [
+    ("work_sort_title_prefix_idx", "catalog_work", "sort_title"),
+    ("volume_sort_title_prefix_idx", "catalog_volume", "sort_title"),
+    ("bookset_sort_title_prefix_idx", "catalog_bookset", "sort_title"),
+    ("author_sort_name_prefix_idx", "catalog_author", "sort_name"),
+    ("author_full_name_prefix_idx", "catalog_author", "full_name"),
+]
+
+# istartswith is UPPER(col) LIKE UPPER('abc%') on PostgreSQL, and a
+# case-insensitive LIKE on SQLite, which only uses a NOCASE index
+PREFIX_SQL = {
+    "postgresql": [
+        f"CREATE INDEX IF NOT EXISTS {index} ON {table} (UPPER({column}) text_pattern_ops)"
+        for index, table, column in PREFIX_COLUMNS
+    ],
+    "sqlite": [
+        f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({column} COLLATE NOCASE)"
+        for index, table, column in PREFIX_COLUMNS
+    ],
+}
+
+PREFIX_SQL_REVERSE = {
+    vendor: [f"DROP INDEX IF EXISTS {index}" for index, _, _ in PREFIX_COLUMNS]
+    for vendor in ("postgresql", "sqlite")
+}
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0085_bookset_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(PREFIX_SQL), _run(PREFIX_SQL_REVERSE)),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 6.0.1 on 2026-10-18 19:40
+
+from django.db import migrations, models
+
+from catalog.utils.slugs import allocate_slug
+
+
+def dedupe_slugs(apps, schema_editor):
+    # Blank slugs and every copy of a duplicated slug but the oldest get a
+    # fresh one, so the unique constraint below can be added.
+    for name in ("Work", "BookSet"):
+        model = apps.get_model("catalog", name)
+        seen = set()
+        rows = model.objects.exclude(slug__isnull=True).order_by("pk")
+        for obj in rows.only("pk", "title", "slug"):
+            if obj.slug and obj.slug not in seen:
+                seen.add(obj.slug)
+                continue
+            obj.slug = allocate_slug(model, obj.title, instance=obj)
+            seen.add(obj.slug)
+            obj.save(update_fields=["slug"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0086_prefix_search_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="work",
+            name="slug",
+            field=models.SlugField(blank=True, max_length=120, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="bookset",
+            name="slug",
+            field=models.SlugField(blank=True, max_length=150, null=True, unique=True),
+        ),
+    ]
@@ -1,31 +1,97 @@
+import logging
 import os
 
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.text import slugify
 from markdownx.models import MarkdownxField
-from markdownx.utils import markdownify
 from simple_name_parser import NameParser
 
 from accounts.models import CustomUser
-from catalog.integrations.google_books_provider import GoogleBooksProvider
+from catalog.utils import markdown_render
 from catalog.utils.fuzzy_matching import normalize_name
 from catalog.utils.normalization import normalize_sort_title
+from catalog.utils.slugs import save_with_slug
+from jobs.queue import enqueue
 from django.contrib.auth import get_user_model
 from django.conf import settings
 User = get_user_model()
 
+logger = logging.getLogger(__name__)
+
 
 parser = NameParser()
 parse_name = parser.parse_name
 
 
+def _unmaintained_fields(instance) -> list[str]:
+    """
+    update_fields for saving an existing row without writing back the
+    ``maintained_fields`` it loaded -- those belong to catalog.services code
+    and may have moved on since.
+    """
+    return [f.name for f in instance._meta.concrete_fields
+            if not f.primary_key and f.name not in instance.maintained_fields]
+
+
+# ---- 0. Rendered Markdown --------------------------------
+
+class RenderedMarkdownModel(models.Model):
+    """
+    Keeps the HTML for each of ``markdown_fields`` in one JSON column,
+    {field: {"hash": ..., "html": ...}}, refreshed on save() when the
+    source changes. Detail pages read it back with the row and do no
+    Markdown work. A stale entry (queryset.update(), older rows) is
+    rendered in memory on read and never written from there: save() and
+    prerender_markdown are what persist it.
+    """
+    markdown_fields: tuple[str, ...] = ()
+
+    rendered_markdown = models.JSONField(default=dict, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def refresh_rendered_markdown(self) -> bool:
+        """Re-render fields whose source changed. True if anything did."""
+        changed = False
+        cache = self.rendered_markdown or {}
+        for field in self.markdown_fields:
+            source = getattr(self, field) or ""
+            digest = markdown_render.source_hash(source)
+            if cache.get(field, {}).get("hash") != digest:
+                cache[field] = {"hash": digest, "html": markdown_render.render(source)}
+                changed = True
+        self.rendered_markdown = cache
+        return changed
+
+    def markdown_html(self, field) -> str:
+        source = getattr(self, field) or ""
+        entry = (self.rendered_markdown or {}).get(field)
+        if entry and entry.get("hash") == markdown_render.source_hash(source):
+            return entry["html"]
+        # kept on this instance only, so a page GET never writes
+        self.refresh_rendered_markdown()
+        return self.rendered_markdown[field]["html"]
+
+    def save(self, *args, **kwargs):
+        changed = self.refresh_rendered_markdown()
+        update_fields = kwargs.get("update_fields")
+        # a read may already have refreshed the HTML in memory: saving a
+        # markdown field still has to store it
+        if update_fields is not None and (
+                changed or set(update_fields) & set(self.markdown_fields)):
+            kwargs["update_fields"] = {*update_fields, "rendered_markdown"}
+        super().save(*args, **kwargs)
+
+
 # ---- 1. Author -----------------------------------------
 
 
-class Author(models.Model):
+class Author(RenderedMarkdownModel):
     full_name = models.CharField(max_length=200, unique=True)
     first_name = models.CharField(max_length=100, blank=True, null=True)
     middle_name = models.CharField(max_length=100, blank=True, null=True)
@@ -39,10 +105,18 @@ class Author(models.Model):
     match_name = models.CharField(max_length=150, blank=True, null=True,
                                   unique=True)
     slug = models.SlugField(max_length=255, blank=True, unique=True)
+    # maintained by catalog/services/author_volumes.py, never by forms
+    volume_count = models.PositiveIntegerField(default=0, editable=False)
+    cover_volume = models.ForeignKey("Volume", on_delete=models.SET_NULL,
+                                     null=True, blank=True, editable=False,
+                                     related_name="+")
+
+    markdown_fields = ("bio",)
+    maintained_fields = ("volume_count", "cover_volume")
 
     @property
     def bio_html(self):
-        return markdownify(self.bio)
+        return self.markdown_html("bio")
 
     def save(self, *args, **kwargs):
         # Parse full_name into first and last names before saving.
@@ -64,23 +138,18 @@ class Author(models.Model):
         else:
             self.sort_name = full_sort_name
         self.match_name = normalize_name(self.full_name)
-        if not self.slug:
-            base = slugify(self.full_name)
-            slug = base
-            counter = 1
-
-            while Author.objects.filter(slug=slug).exists():
-                slug = f"{base}-{counter}"
-                counter += 1
-
-            self.slug = slug
-        super().save(*args, **kwargs)
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = _unmaintained_fields(self)
+        save_with_slug(self, self.full_name, super().save, *args, **kwargs)
 
     def get_absolute_url(self):
         return reverse("author_detail", args=[self.slug])
 
     class Meta:
         ordering = ['sort_name']
+        indexes = [
+            models.Index(fields=["sort_name", "id"], name="author_sort_idx"),
+        ]
 
     def __str__(self):
         return self.full_name
@@ -118,7 +187,7 @@ class Genre(models.Model):
 
 # -------- 2. Work -----------------------------------------
 
-class Work(models.Model):
+class Work(RenderedMarkdownModel):
 
     WORK_TYPE_CHOICES = [
         ("NOVEL", "Novel"),
@@ -161,38 +230,42 @@ class Work(models.Model):
                                                                   "ebook")
     notes = MarkdownxField(blank=True, null=True)
     text = MarkdownxField(blank=True, null=True)
-    slug = models.SlugField(max_length=120, null=True, blank=True)
+    slug = models.SlugField(max_length=120, unique=True, null=True, blank=True)
 
     def save(self, *args, **kwargs):
         self.sort_title = normalize_sort_title(self.title)
-        if not self.slug:
-            base = slugify(self.title)
-            slug = base
-            counter = 1
-
-            while Work.objects.filter(slug=slug).exists():
-                slug = f"{base}-{counter}"
-                counter += 1
-
-            self.slug = slug
-        super().save(*args, **kwargs)
+        save_with_slug(self, self.title, super().save, *args, **kwargs)
 
     class Meta:
         ordering = ['sort_title']
+        indexes = [
+            models.Index(fields=["sort_title", "id"], name="work_sort_idx"),
+            # an author's works, alphabetically (author detail/list prefetch)
+            models.Index(fields=["author", "sort_title"], name="work_author_sort_idx"),
+        ]
 
     @property
     def kind(self):
         return "Work"
 
+    # same interface as BookSet for the shared work/set list row
+    @property
+    def preview_volumes(self):
+        return self.volumes.all()
+
+    @property
+    def volume_count(self):
+        return len(self.volumes.all())
+
+    markdown_fields = ("notes", "text")
+
     @property
     def work_notes_html(self):
-        if not self.notes:
-            return ""
-        return markdownify(self.notes)
+        return self.markdown_html("notes")
 
     @property
     def work_text_html(self):
-        return markdownify(self.text)
+        return self.markdown_html("text")
 
     def get_absolute_url(self):
         return reverse("work_detail", args=[self.slug])
@@ -203,7 +276,7 @@ class Work(models.Model):
 
 # -------- 3. BookSet -------------------------------------
 
-class BookSet(models.Model):
+class BookSet(RenderedMarkdownModel):
     CONDITION_CHOICES = [
         ("AN", "As New"),
         ("FI", "Fine"),
@@ -253,18 +326,33 @@ class BookSet(models.Model):
     )
     notes = MarkdownxField(blank=True, null=True)
     sort_title = models.CharField(max_length=150, blank=True, null=True)
-    slug = models.SlugField(max_length=150, blank=True, null=True)
+    slug = models.SlugField(max_length=150, unique=True, blank=True, null=True)
+    # maintained by catalog/services/bookset_summary.py, never by forms
+    representative_author = models.ForeignKey(
+        Author, on_delete=models.SET_NULL, null=True, blank=True,
+        editable=False, related_name="+")
+    volume_count = models.PositiveIntegerField(default=0, editable=False)
+    preview_volume_ids = models.JSONField(default=list, blank=True, editable=False)
 
     class Meta:
         ordering = ['title']
+        indexes = [
+            models.Index(fields=["title", "id"], name="bookset_title_idx"),
+            models.Index(fields=["sort_title", "id"], name="bookset_sort_idx"),
+            models.Index(fields=["isbn13"], name="bookset_isbn13_idx"),
+            models.Index(fields=["isbn10"], name="bookset_isbn10_idx"),
+        ]
 
     @property
     def kind(self):
         return "BookSet"
 
+    markdown_fields = ("description",)
+    maintained_fields = ("representative_author", "volume_count", "preview_volume_ids")
+
     @property
     def bookset_description_html(self):
-        return markdownify(self.description)
+        return self.markdown_html("description")
 
     @property
     def cover_src(self) -> str | None:
@@ -274,12 +362,10 @@ class BookSet(models.Model):
         - else stock cover_url
         - else None
         """
-        if self.cover_image_id and getattr(self.cover_image, "image_display",
-                                           None):
-            try:
-                return self.cover_image.image_display.url
-            except Exception:
-                pass
+        if self.cover_image_id and self.cover_image:
+            url = self.cover_image.display_url
+            if url:
+                return url
         return self.cover_url or None
 
     @property
@@ -287,38 +373,22 @@ class BookSet(models.Model):
         return not bool(self.cover_image_id) and bool(self.cover_url)
 
     def save(self, *args, **kwargs):
-        if not self.cover_url and (self.isbn13 or self.isbn10):
-            set_lookup = GoogleBooksProvider()
-            if self.isbn13:
-                book = set_lookup.lookup(self.isbn13)
-            else:
-                book = set_lookup.lookup(self.isbn10)
-            self.cover_url = book["cover_url"]
-            print(self.cover_url)
-
         self.sort_title = normalize_sort_title(self.title)
-
-        super().save(*args, **kwargs)
-
         if self.isbn10 and not self.isbn13:
             self.isbn13 = self.convert_isbn10_to_13(self.isbn10)
         elif self.isbn13 and not self.isbn10:
             maybe10 = self.convert_isbn13_to_10(self.isbn13)
             if maybe10:
                 self.isbn10 = maybe10
-        self.sort_title = normalize_sort_title(self.title)
-        if not self.slug:
-            base = slugify(self.title)
-            slug = base
-            counter = 1
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = _unmaintained_fields(self)
 
-            while BookSet.objects.filter(slug=slug).exists():
-                slug = f"{base}-{counter}"
-                counter += 1
+        save_with_slug(self, self.title, super().save, *args, **kwargs)
 
-            self.slug = slug
-
-        super().save(*args, **kwargs)
+        if not self.cover_url and (self.isbn13 or self.isbn10):
+            # the Google Books lookup runs in the job worker (catalog/tasks.py)
+            enqueue("catalog.lookup_bookset_cover", {"bookset_id": self.pk},
+                    dedupe_key=f"bookset-cover:{self.pk}")
 
     # ISBN conversion functions ISBN10 to 13 and ISBN13 to 10
     @staticmethod
@@ -363,14 +433,17 @@ class BookSet(models.Model):
 
     @property
     def author(self):
-        # uses prefetched cache when available; does NOT hit DB
-        vols = list(self.volumes.all())
-        if not vols:
-            return ""
-        # pick a representative author however you want:
-        v0 = vols[0]
-        w = v0.primary_work or (v0.works.all()[0] if v0.works.all() else None)
-        return w.author if w else ""
+        # select_related("representative_author") in lists
+        return self.representative_author or ""
+
+    @property
+    def preview_volumes(self):
+        """The first few volumes, for covers; lists batch-load them with
+        bookset_summary.attach_previews()."""
+        if not hasattr(self, "_preview_volumes"):
+            from catalog.services.bookset_summary import attach_previews
+            attach_previews([self])
+        return self._preview_volumes
 
     def __str__(self):
         return self.title
@@ -378,11 +451,45 @@ class BookSet(models.Model):
 
 #-------- 3.25 Bookset Images ----------------------------
 
+class ImageVariantsMixin:
+    """
+    thumb/display/detail URLs for VolumeImage/BooksetImage. Images with an
+    `original` are served as on-demand variants (catalog.services.image_variants);
+    older rows fall back to their stored derivative files.
+    """
+
+    def variant_url(self, width, fmt="webp", **kwargs):
+        from catalog.services.image_variants import variant_url
+        return variant_url(self, width, fmt, **kwargs)
+
+    def _sized_url(self, size, field_name):
+        if self.original:
+            from catalog.utils.images.images import IMAGE_SIZES
+            return self.variant_url(IMAGE_SIZES[size])
+        f = getattr(self, field_name)
+        try:
+            return f.url if f else None
+        except ValueError:
+            return None
+
+    @property
+    def thumb_url(self):
+        return self._sized_url("thumb", "image_thumb")
+
+    @property
+    def display_url(self):
+        return self._sized_url("display", "image_display")
+
+    @property
+    def detail_url(self):
+        return self._sized_url("detail", "image_detail")
+
+
 def bookset_image_upload_to(instance, filename: str) -> str:
     base, _ = os.path.splitext(filename)
     return f"images/bookset/{instance.bookset_id}/{base}"
 
-class BooksetImage(models.Model):
+class BooksetImage(ImageVariantsMixin, models.Model):
     KIND_CHOICES = [
         ("COVER", "Cover"),
         ("LEFT", "Left"),
@@ -397,9 +504,10 @@ class BooksetImage(models.Model):
     caption = models.CharField(max_length=255, blank=True)
     sort_order = models.PositiveIntegerField(default=0)
 
-    image_thumb = models.ImageField(upload_to=bookset_image_upload_to)
-    image_display = models.ImageField(upload_to=bookset_image_upload_to)
-    image_detail = models.ImageField(upload_to=bookset_image_upload_to)
+    original = models.ImageField(upload_to=bookset_image_upload_to, blank=True)
+    image_thumb = models.ImageField(upload_to=bookset_image_upload_to, blank=True)
+    image_display = models.ImageField(upload_to=bookset_image_upload_to, blank=True)
+    image_detail = models.ImageField(upload_to=bookset_image_upload_to, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -410,7 +518,7 @@ class BooksetImage(models.Model):
         return f"{self.bookset} [{self.kind}]"
 
 # ------ 3.5 Bookshelf ----------------------------
-class Bookshelf(models.Model):
+class Bookshelf(RenderedMarkdownModel):
     class Meta:
         verbose_name_plural = "Bookshelves"
 
@@ -418,22 +526,14 @@ class Bookshelf(models.Model):
     slug = models.SlugField(max_length=50, unique=True, blank=True, null=True)
     description = MarkdownxField(blank=True, null=True)
 
+    markdown_fields = ("description",)
+
     @property
     def description_html(self):
-        return markdownify(self.description)
+        return self.markdown_html("description")
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base = slugify(self.name)
-            slug = base
-            counter = 1
-
-            while Bookshelf.objects.filter(slug=slug).exists():
-                slug = f"{base}-{counter}"
-                counter += 1
-
-            self.slug = slug
-        super().save(*args, **kwargs)
+        save_with_slug(self, self.name, super().save, *args, **kwargs)
 
     def get_absolute_url(self):
         return reverse("bookshelf_detail", args=[self.slug])
@@ -441,7 +541,7 @@ class Bookshelf(models.Model):
     def __str__(self):
         return self.name
 
-class Collection(models.Model):
+class Collection(RenderedMarkdownModel):
     class Meta:
         ordering = ["name"]
 
@@ -449,22 +549,14 @@ class Collection(models.Model):
     slug = models.SlugField(max_length=50, unique=True, blank=True)
     description = MarkdownxField(blank=True, null=True)
 
+    markdown_fields = ("description",)
+
     @property
     def description_html(self):
-        return markdownify(self.description)
+        return self.markdown_html("description")
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base = slugify(self.name)
-            slug = base
-            counter = 1
-
-            while Collection.objects.filter(slug=slug).exists():
-                slug = f"{base}-{counter}"
-                counter += 1
-
-            self.slug = slug
-        super().save(*args, **kwargs)
+        save_with_slug(self, self.name, super().save, *args, **kwargs)
 
     def get_absolute_url(self):
         return reverse("collection_detail", args=[self.slug])
@@ -490,7 +582,7 @@ class Bibliography(models.Model):
 
 # ------ 4. Volume ----------------------------------------
 
-class Volume(models.Model):
+class Volume(RenderedMarkdownModel):
     BINDING_CHOICES = [
         ("HC", "Hardcover"),
         ("PB", "Paperback"),
@@ -649,9 +741,29 @@ class Volume(models.Model):
 
     # Utility
     slug = models.SlugField(max_length=255, blank=True, unique=True)
+    # bumped whenever anything a list card shows changes (catalog/services/cards.py)
+    card_version = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["sort_title"]
+        # one per VolumeListView.SORTS key so cursor pages are index range
+        # scans (author sorts through a join; Author/Work carry that index)
+        indexes = [
+            models.Index(fields=["sort_title", "title", "id"], name="volume_title_sort_idx"),
+            models.Index(fields=["date_added", "id"], name="volume_added_sort_idx"),
+            models.Index(fields=["publication_year", "sort_title", "id"], name="volume_pubyear_sort_idx"),
+            models.Index(fields=["publisher", "sort_title", "id"], name="volume_publisher_sort_idx"),
+            models.Index(fields=["acquisition_date", "sort_title", "id"], name="volume_acq_sort_idx"),
+            models.Index(fields=["status", "sort_title", "id"], name="volume_status_sort_idx"),
+            models.Index(fields=["estimated_value", "sort_title", "id"], name="volume_value_sort_idx"),
+            models.Index(fields=["isbn13", "sort_title", "id"], name="volume_isbn_sort_idx"),
+            # isbn13 lookups use the index above
+            models.Index(fields=["isbn10"], name="volume_isbn10_idx"),
+            models.Index(fields=["book_set", "volume_number"], name="volume_set_number_idx"),
+            # only the handful of volumes backfill_google_covers still has to visit
+            models.Index(fields=["id"], condition=models.Q(cover_image__isnull=True),
+                         name="volume_missing_cover_idx"),
+        ]
 
     def __str__(self):
         if self.book_set:
@@ -709,12 +821,8 @@ class Volume(models.Model):
 
     @property
     def cover_src(self) -> str | None:
-        if self.cover_image_id and getattr(self.cover_image, "image_display",
-                                           None):
-            try:
-                return self.cover_image.image_display.url
-            except Exception:
-                return None
+        if self.cover_image_id and self.cover_image:
+            return self.cover_image.display_url
         return None
 
     @property
@@ -752,18 +860,7 @@ class Volume(models.Model):
         if self.acquisition_cost is None:
             self.acquisition_cost = 0
 
-        if not self.slug:
-            base = slugify(self.title)
-            slug = base
-            counter = 1
-
-            while Volume.objects.filter(slug=slug).exists():
-                slug = f"{base}-{counter}"
-                counter += 1
-
-            self.slug = slug
-
-        super().save(*args, **kwargs)
+        save_with_slug(self, self.title, super().save, *args, **kwargs)
 
     # ISBN conversion functions ISBN10 to 13 and ISBN13 to 10
     @staticmethod
@@ -788,13 +885,15 @@ class Volume(models.Model):
         check_digit = "X" if check == 10 else "0" if check == 11 else str(check)
         return core + check_digit
 
+    markdown_fields = ("notes", "edition_notes")
+
     @property
     def notes_html(self):
-        return markdownify(self.notes)
+        return self.markdown_html("notes")
 
     @property
     def edition_notes_html(self):
-        return markdownify(self.edition_notes)
+        return self.markdown_html("edition_notes")
 
     def get_absolute_url(self):
         return reverse("volume_detail", args=[self.slug])
@@ -805,7 +904,7 @@ def volume_image_upload_to(instance, filename: str) -> str:
     base, _ = os.path.splitext(filename)
     return f"images/volume/{instance.volume_id}/{base}"
 
-class VolumeImage(models.Model):
+class VolumeImage(ImageVariantsMixin, models.Model):
     KIND_CHOICES = [
         ("COVER", "Cover"),
         ("COPYRIGHT", "Copyright page"),
@@ -819,9 +918,13 @@ class VolumeImage(models.Model):
     caption = models.CharField(max_length=255, blank=True)
     sort_order = models.PositiveIntegerField(default=0)
 
-    image_thumb = models.ImageField(upload_to=volume_image_upload_to)
-    image_display = models.ImageField(upload_to=volume_image_upload_to)
-    image_detail = models.ImageField(upload_to=volume_image_upload_to)
+    # New uploads only store `original`; thumb/display/detail are then
+    # rendered on demand (see ImageVariantsMixin). The stored derivative
+    # fields are for older rows and IMAGE_LAZY_DERIVATIVES=False.
+    original = models.ImageField(upload_to=volume_image_upload_to, blank=True)
+    image_thumb = models.ImageField(upload_to=volume_image_upload_to, blank=True)
+    image_display = models.ImageField(upload_to=volume_image_upload_to, blank=True)
+    image_detail = models.ImageField(upload_to=volume_image_upload_to, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -870,3 +973,79 @@ class DevNote(models.Model):
 
     def __str__(self):
         return f"DevNote by {self.user} @ {self.created_at:%Y-%m-%d %H:%M}"
+
+
+# ----- 6 Search Index --------------------------------------
+class SearchDocument(models.Model):
+    """
+    One denormalized row per searchable object. The actual full-text index
+    (FTS5 on SQLite, tsvector/GIN on Postgres) lives on top of this table;
+    see catalog/services/search_index.py.
+    """
+    ENTITY_CHOICES = [
+        ("author", "Author"),
+        ("work", "Work"),
+        ("volume", "Volume"),
+        ("bookset", "BookSet"),
+    ]
+    entity_type = models.CharField(max_length=20, choices=ENTITY_CHOICES)
+    entity_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True, default="")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("entity_type", "entity_id"),
+                name="uniq_searchdocument_entity",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type}:{self.entity_id} {self.title}"
+
+
+# ----- 7 Library Stats Snapshot ----------------------------
+class StatsSection(models.Model):
+    """
+    Materialized piece of the stats page (see catalog/services/stats.py).
+    Signals adjust `data` in place or set `stale` for a recompute after
+    commit, bumping `version` either way, so reading the page is a single
+    small query.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    stale = models.BooleanField(default=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}{' (stale)' if self.stale else ''}"
+
+
+# ----- 8 Author <-> Volume index ----------------------------
+class AuthorVolume(models.Model):
+    """
+    One row per (author, volume) pair reachable through Volume.works, kept
+    in step by catalog/services/author_volumes.py. sort_title is copied from
+    the volume so an author's volumes page off a single index.
+    """
+    author = models.ForeignKey(Author, on_delete=models.CASCADE,
+                               related_name="volume_links")
+    volume = models.ForeignKey(Volume, on_delete=models.CASCADE,
+                               related_name="author_links")
+    work_count = models.PositiveIntegerField(default=1)
+    sort_title = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["author", "volume"],
+                                    name="authorvolume_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["author", "sort_title", "volume"],
+                         name="authorvolume_sort_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.author_id} -> {self.volume_id}"
@@ -0,0 +1,108 @@
+# catalog/services/author_volumes.py
+"""
+The author <-> volume index (AuthorVolume) and the Author.volume_count /
+Author.cover_volume derived from it.
+
+An author "has" a volume when one of the author's works is in it. Signals
+(catalog/signals.py) call sync_volumes() with the volumes whose works may
+have changed; it diffs their rows against Volume.works and then refreshes
+only the authors on either side of the diff. `manage.py
+rebuild_author_volumes` recomputes everything from scratch.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, Q
+
+from catalog.models import Author, AuthorVolume, Volume
+
+CHUNK = 500
+
+
+def _chunks(ids, size=CHUNK):
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def sync_volumes(volume_ids) -> set[int]:
+    """Bring the rows of these volumes in line with Volume.works. Returns
+    the ids of the authors whose rows changed."""
+    WorkLink = Volume.works.through
+    touched = set()
+    for ids in _chunks({pk for pk in volume_ids if pk}):
+        want = Counter(WorkLink.objects.filter(volume_id__in=ids)
+                       .values_list("work__author_id", "volume_id"))
+        have = {(link.author_id, link.volume_id): link
+                for link in AuthorVolume.objects.filter(volume_id__in=ids)}
+        titles = dict(Volume.objects.filter(pk__in=ids)
+                      .values_list("pk", "sort_title"))
+
+        gone = [link.pk for key, link in have.items() if key not in want]
+        new, changed = [], []
+        for (author_id, volume_id), n in want.items():
+            title = titles.get(volume_id) or ""
+            link = have.get((author_id, volume_id))
+            if link is None:
+                new.append(AuthorVolume(author_id=author_id, volume_id=volume_id,
+                                        work_count=n, sort_title=title))
+            elif (link.work_count, link.sort_title) != (n, title):
+                link.work_count, link.sort_title = n, title
+                changed.append(link)
+
+        if gone:
+            AuthorVolume.objects.filter(pk__in=gone).delete()
+        if new:
+            # a concurrent sync may have inserted the same pair
+            AuthorVolume.objects.bulk_create(new, ignore_conflicts=True)
+        if changed:
+            AuthorVolume.objects.bulk_update(changed, ["work_count", "sort_title"])
+
+        touched |= {a for a, _ in have} | {a for a, _ in want}
+
+    refresh_authors(touched)
+    return touched
+
+
+def refresh_authors(author_ids) -> None:
+    """Recompute volume_count and cover_volume for these authors."""
+    for ids in _chunks({pk for pk in author_ids if pk}):
+        links = AuthorVolume.objects.filter(author_id__in=ids)
+        counts = dict(links.values("author_id").annotate(n=Count("id"))
+                      .values_list("author_id", "n"))
+        # the first volume, by title, that has a picture of some kind
+        covers = {}
+        for author_id, volume_id in (
+                links.filter(Q(volume__cover_image__isnull=False)
+                             | Q(volume__cover_url__gt=""))
+                .order_by("author_id", "sort_title", "volume_id")
+                .values_list("author_id", "volume_id")):
+            covers.setdefault(author_id, volume_id)
+
+        stale = [
+            Author(pk=pk, volume_count=counts.get(pk, 0), cover_volume_id=covers.get(pk))
+            for pk, count, cover in Author.objects.filter(pk__in=ids)
+            .values_list("pk", "volume_count", "cover_volume_id")
+            if (count, cover) != (counts.get(pk, 0), covers.get(pk))
+        ]
+        if stale:
+            Author.objects.bulk_update(stale, ["volume_count", "cover_volume"])
+
+
+def volume_saved(volume) -> None:
+    """A volume's title or cover may have changed."""
+    author_ids = list(AuthorVolume.objects.filter(volume=volume)
+                      .values_list("author_id", flat=True))
+    if author_ids:
+        AuthorVolume.objects.filter(volume=volume).exclude(
+            sort_title=volume.sort_title or "").update(sort_title=volume.sort_title or "")
+        refresh_authors(author_ids)
+
+
+def rebuild() -> int:
+    """Recompute every row and every author's summary. Returns the row count."""
+    with transaction.atomic():
+        AuthorVolume.objects.all().delete()
+        sync_volumes(Volume.objects.values_list("pk", flat=True))
+        refresh_authors(Author.objects.values_list("pk", flat=True))
+    return AuthorVolume.objects.count()
@@ -0,0 +1,54 @@
+# catalog/services/autocomplete.py
+"""
+Typeahead suggestions for the relation widgets in catalog/widgets.py.
+
+The typed text is matched as a case-insensitive prefix (istartswith) of
+indexed columns. Migration 0086 backs these with UPPER(col)
+text_pattern_ops indexes on PostgreSQL and COLLATE NOCASE indexes on
+SQLite, which is what each backend needs to turn the LIKE 'abc%' into an
+index range scan.
+"""
+from dataclasses import dataclass, field
+from typing import Callable
+
+from django.db.models import Q
+
+from catalog.models import Author, BookSet, Bookshelf, Volume, Work
+from catalog.utils.normalization import normalize_sort_title
+
+LIMIT = 20
+
+
+@dataclass
+class Source:
+    model: type
+    fields: tuple[str, ...]       # prefix-matched columns
+    order_by: tuple[str, ...]
+    normalize: Callable[[str], str] = str.strip
+    select_related: tuple[str, ...] = field(default_factory=tuple)
+
+
+SOURCES = {
+    "work": Source(Work, ("sort_title",), ("sort_title", "id"), normalize_sort_title),
+    "author": Source(Author, ("sort_name", "full_name"), ("sort_name", "id")),
+    "volume": Source(Volume, ("sort_title",), ("sort_title", "id"), normalize_sort_title,
+                     select_related=("book_set",)),
+    "bookset": Source(BookSet, ("sort_title",), ("sort_title", "id"), normalize_sort_title),
+    "bookshelf": Source(Bookshelf, ("name",), ("name", "id")),
+}
+
+
+def suggest(kind, q, limit=LIMIT) -> list:
+    """Up to ``limit`` objects of ``kind`` whose indexed names start with ``q``."""
+    source = SOURCES[kind]
+    text = source.normalize((q or "").strip())
+    if not text:
+        return []
+    cond = Q()
+    for name in source.fields:
+        cond |= Q(**{f"{name}__istartswith": text})
+    return list(
+        source.model.objects.filter(cond)
+        .select_related(*source.select_related)
+        .order_by(*source.order_by)[:limit]
+    )
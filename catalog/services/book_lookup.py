@@ -1,49 +1,37 @@
-from catalog.utils.fuzzy_matching import (name_match, normalize_name,
-                                          normalize_title, title_match)
+import logging
 
 from catalog.integrations.google_books_provider import GoogleBooksProvider
-from catalog.models import Author, AuthorAlias, Work
+from catalog.models import Author, Work
+from catalog.services import matcher_index
+
+logger = logging.getLogger(__name__)
 
 def resolve_author(name: str):
     """Return best-matching Author instance, accounting for aliases and fuzzy similarity."""
     if not name:
         return Author.objects.filter(full_name="Unknown Author").first()
 
-    normalized_target = normalize_name(name)
-
-    # Step 1: Check aliases first (direct or fuzzy)
-    for alias in AuthorAlias.objects.select_related("author"):
-        if name_match(alias.alias, normalized_target) >= 90:
-            return alias.author
-
-    # Step 2: Check direct author names
-    for author_instance in Author.objects.all():
-        if name_match(author_instance.match_name, normalized_target) >= 90:
-            return author_instance
+    # Aliases first, then author names (see MatcherIndex.best_author)
+    author_id = matcher_index.get_index().best_author(name)
+    if author_id is not None:
+        author = Author.objects.filter(pk=author_id).first()
+        if author:
+            return author
 
-    # Step 3: Fallback
+    # Fallback
     return Author.objects.filter(full_name="Unknown Author").first()
 
 
-
 def resolve_work(title: str):
     """Return best-matching Work instance (or Unknown Work), using fuzzy title matching."""
     if not title:
         return Work.objects.filter(title="Unknown Work").first()
 
-    normalized_title = normalize_title(title)
-    best_match = None
-    best_score = 0
-
-    for work_instance in Work.objects.all():
-        score = title_match(work_instance.title, normalized_title)
-        print(f"work score: {score}")
-        if score > best_score:
-            best_score = score
-            best_match = work_instance
-    print(f"best score: {best_score}, best match: {best_match}, {type(best_match)}")
-    if best_match and best_score >= 80:
-        return best_match
+    work_id = matcher_index.get_index().best_work(title)
+    if work_id is not None:
+        work = Work.objects.filter(pk=work_id).first()
+        if work:
+            return work
 
     # No sufficiently close match found — create or fallback
     return Work.objects.filter(title="Unknown Work").first()
@@ -61,6 +49,8 @@ def perform_isbn_lookup(isbn):
 
     author = resolve_author(author_name)
     work = resolve_work(title)
+    logger.debug("ISBN %s: %r by %r -> work %s, author %s", isbn, title,
+                 author_name, getattr(work, "pk", None), getattr(author, "pk", None))
 
     return {"result": result, "author": author, "work": work}
 
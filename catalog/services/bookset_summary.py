@@ -0,0 +1,99 @@
+# catalog/services/bookset_summary.py
+"""
+What the set lists show for a BookSet, stored on the row:
+
+- representative_author: the author of the first volume's primary work
+  (or of its first work), as BookSet.author used to work out per render;
+- volume_count;
+- preview_volume_ids: the first PREVIEW_SIZE volumes, in set order.
+
+Signals (catalog/signals.py) call refresh() when a volume joins, leaves or
+is reordered in a set, when a volume's works change, and when a work moves
+to another author. A page of sets then needs one query for the sets and
+one, attach_previews(), for all their preview volumes.
+"""
+from django.db.models import Q
+
+from catalog.models import BookSet, Volume
+
+PREVIEW_SIZE = 8
+SET_ORDER = ("volume_number", "sort_title", "id")
+
+
+def _first_work_authors(volume_ids):
+    """{volume_id: author_id of its first work by title}."""
+    WorkLink = Volume.works.through
+    authors = {}
+    for volume_id, author_id in (
+            WorkLink.objects.filter(volume_id__in=volume_ids)
+            .order_by("volume_id", "work__sort_title", "work_id")
+            .values_list("volume_id", "work__author_id")):
+        authors.setdefault(volume_id, author_id)
+    return authors
+
+
+def refresh(bookset_ids) -> None:
+    bookset_ids = {pk for pk in bookset_ids if pk}
+    if not bookset_ids:
+        return
+    members = {pk: [] for pk in bookset_ids}
+    for pk, book_set_id, author_id in (
+            Volume.objects.filter(book_set_id__in=bookset_ids)
+            .order_by("book_set_id", *SET_ORDER)
+            .values_list("pk", "book_set_id", "primary_work__author_id")):
+        members[book_set_id].append((pk, author_id))
+
+    fallback = _first_work_authors(
+        [vols[0][0] for vols in members.values() if vols and vols[0][1] is None])
+
+    stale = []
+    for bookset in BookSet.objects.filter(pk__in=bookset_ids).only(
+            "pk", "representative_author", "volume_count", "preview_volume_ids"):
+        vols = members[bookset.pk]
+        author_id = None
+        if vols:
+            first, author_id = vols[0]
+            author_id = author_id or fallback.get(first)
+        summary = (author_id, len(vols), [pk for pk, _ in vols[:PREVIEW_SIZE]])
+        if summary != (bookset.representative_author_id, bookset.volume_count,
+                       bookset.preview_volume_ids):
+            (bookset.representative_author_id, bookset.volume_count,
+             bookset.preview_volume_ids) = summary
+            stale.append(bookset)
+    if stale:
+        BookSet.objects.bulk_update(
+            stale, ["representative_author", "volume_count", "preview_volume_ids"])
+
+
+def refresh_for_volumes(volume_ids) -> None:
+    refresh(Volume.objects.filter(pk__in=list(volume_ids), book_set__isnull=False)
+            .values_list("book_set_id", flat=True).distinct())
+
+
+def refresh_for_work(work) -> None:
+    refresh(Volume.objects.filter(Q(works=work) | Q(primary_work=work),
+                                  book_set__isnull=False)
+            .values_list("book_set_id", flat=True).distinct())
+
+
+def attach_previews(booksets) -> None:
+    """Load the preview volumes of all these sets with one query."""
+    booksets = list(booksets)
+    ids = {pk for b in booksets for pk in (b.preview_volume_ids or [])}
+    volumes = {}
+    if ids:
+        volumes = Volume.objects.select_related("cover_image").only(
+            "id", "slug", "title", "sort_title", "cover_url", "cover_image_id",
+            "cover_image__id", "cover_image__original",
+            "cover_image__image_display", "cover_image__image_thumb",
+        ).in_bulk(ids)
+    for b in booksets:
+        b._preview_volumes = [volumes[pk] for pk in (b.preview_volume_ids or [])
+                              if pk in volumes]
+
+
+def rebuild(chunk=500) -> int:
+    ids = list(BookSet.objects.values_list("pk", flat=True))
+    for start in range(0, len(ids), chunk):
+        refresh(ids[start:start + chunk])
+    return len(ids)
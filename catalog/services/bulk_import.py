@@ -0,0 +1,352 @@
+# catalog/services/bulk_import.py
+"""
+Bulk ISBN import.
+
+The one-at-a-time flow (isbn_lookup_view -> perform_isbn_lookup ->
+volume_create_view) costs one Google Books round trip, two fuzzy scans and a
+handful of INSERTs per book. For a shelf of scanned barcodes we instead:
+
+1. parse + validate + dedupe the whole stream up front,
+2. drop ISBNs we already hold (one query),
+3. fetch metadata through a bounded thread pool sharing a token bucket
+   (cache hits don't spend tokens),
+4. resolve every distinct author/title once against the shared MatcherIndex,
+5. create all Volumes with bulk_create and their works / bookshelves rows
+   with bulk_create on the through tables.
+
+bulk_create skips save() and signals, so sort_title / isbn10 / slug are
+filled in here and the search index and stats are updated explicitly.
+Covers are not downloaded; run backfill_google_covers afterwards.
+
+The upload view runs small batches inline; larger ones go to the job
+worker (catalog.import_isbns in catalog/tasks.py), which leaves the rows
+in the shared cache under a report key for the view to show.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, fields
+
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+
+from catalog.integrations.google_books_provider import GoogleBooksProvider
+from catalog.models import Author, Volume, Work
+from catalog.services import author_volumes, matcher_index, search_index, stats
+from catalog.utils.date_parser import parse_published_date
+from catalog.utils.isbn_conversion_util import is_valid_isbn10, is_valid_isbn13
+from catalog.utils.normalization import normalize_sort_title
+from catalog.utils.rate_limit import TokenBucket
+from catalog.utils.slugs import assign_slugs
+
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 5.0  # Google Books requests / second, across all workers
+
+REPORT_KEY = "isbn_import:report:{}"
+REPORT_TIMEOUT = 60 * 60 * 24
+
+# row statuses
+CREATED = "created"
+WOULD_CREATE = "would_create"   # dry run
+EXISTS = "exists"               # already in the catalog
+DUPLICATE = "duplicate"         # repeated earlier in the same stream
+INVALID = "invalid"             # bad length / checksum
+NOT_FOUND = "not_found"         # Google Books had nothing usable
+ERROR = "error"                 # transport / unexpected failure
+
+_ISBN_CHARS = re.compile(r"[^0-9Xx]")
+_SPLIT = re.compile(r"[\s,;|]+")
+
+
+@dataclass
+class ImportRow:
+    line: int
+    raw: str
+    isbn13: str = ""
+    status: str = ""
+    message: str = ""
+    title: str = ""
+    author: str = ""
+    work: str = ""
+    volume_id: int | None = None
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+REPORT_FIELDS = [f.name for f in fields(ImportRow)]
+
+
+# ---- Parsing ------------------------------------------------
+
+def _looks_like_isbn(token: str) -> bool:
+    # Headers ("isbn"), prices and years are not ISBN attempts; anything
+    # with a run of digits is, and gets reported if it doesn't validate.
+    return sum(ch.isdigit() for ch in token) >= 5
+
+
+def parse_isbns(text: str) -> list[ImportRow]:
+    """
+    Accepts one ISBN per line, separator-delimited ISBNs, or a CSV whose
+    header has an "isbn" column (then only that column is read).
+    """
+    lines = text.splitlines()
+    rows: list[ImportRow] = []
+
+    isbn_col = None
+    first = next((i for i, l in enumerate(lines) if l.strip()), None)
+    if first is not None:
+        header = next(csv.reader([lines[first]]))
+        lowered = [h.strip().lower() for h in header]
+        if not any(_looks_like_isbn(h) for h in header):
+            isbn_col = next((i for i, h in enumerate(lowered) if "isbn" in h),
+                            None)
+
+    if isbn_col is not None:
+        reader = csv.reader(io.StringIO("\n".join(lines[first + 1:])))
+        for offset, cells in enumerate(reader):
+            if isbn_col < len(cells) and cells[isbn_col].strip():
+                rows.append(ImportRow(line=first + 2 + offset,
+                                      raw=cells[isbn_col].strip()))
+        return rows
+
+    for lineno, line in enumerate(lines, 1):
+        for token in _SPLIT.split(line.strip().strip('"')):
+            token = token.strip('"\'')
+            if token and _looks_like_isbn(token):
+                rows.append(ImportRow(line=lineno, raw=token))
+    return rows
+
+
+def normalize(row: ImportRow) -> None:
+    """Validate the raw value and fill in isbn13, or mark the row invalid."""
+    cleaned = _ISBN_CHARS.sub("", row.raw).upper()
+    if len(cleaned) == 10 and is_valid_isbn10(cleaned):
+        row.isbn13 = GoogleBooksProvider.normalize_isbn(cleaned)
+    elif len(cleaned) == 13 and is_valid_isbn13(cleaned):
+        row.isbn13 = cleaned
+    else:
+        row.status = INVALID
+        row.message = "Not a valid ISBN-10/ISBN-13"
+
+
+# ---- Fetching -----------------------------------------------
+
+def fetch_metadata(isbns, *, workers: int = DEFAULT_WORKERS,
+                   rate: float = DEFAULT_RATE, lookup=None) -> dict:
+    """
+    Look up each ISBN concurrently. Returns {isbn: data dict | Exception}.
+    At most ``workers`` requests are in flight and at most ``rate`` start
+    per second; ISBNs already in the Google Books cache skip the limiter.
+    """
+    lookup = lookup or GoogleBooksProvider.lookup
+    bucket = TokenBucket(rate)
+
+    def _one(isbn):
+        if not GoogleBooksProvider.is_cached(isbn):
+            bucket.acquire()
+        return lookup(isbn)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(_one, isbn): isbn for isbn in isbns}
+        for future in as_completed(futures):
+            isbn = futures[future]
+            try:
+                results[isbn] = future.result()
+            except Exception as e:
+                results[isbn] = e
+    return results
+
+
+# ---- Resolution ---------------------------------------------
+
+def resolve_batch(authors, titles):
+    """
+    Resolve each distinct author name / work title once. Returns
+    ({name: Author | None}, {title: Work | None}); unmatched entries map to
+    the "Unknown Author" / "Unknown Work" placeholders when they exist,
+    the same fallback resolve_author / resolve_work use.
+    """
+    index = matcher_index.get_index()
+    author_ids = {name: index.best_author(name) for name in set(authors) if name}
+    work_ids = {title: index.best_work(title) for title in set(titles) if title}
+
+    author_objs = Author.objects.in_bulk(
+        [i for i in author_ids.values() if i is not None])
+    work_objs = Work.objects.select_related("author").in_bulk(
+        [i for i in work_ids.values() if i is not None])
+    unknown_author = Author.objects.filter(full_name="Unknown Author").first()
+    unknown_work = Work.objects.filter(title="Unknown Work").first()
+
+    return (
+        {name: author_objs.get(i, unknown_author) for name, i in author_ids.items()},
+        {title: work_objs.get(i, unknown_work) for title, i in work_ids.items()},
+    )
+
+
+# ---- Creation -----------------------------------------------
+
+def build_volume(isbn13: str, data: dict, work: Work | None) -> Volume:
+    publication_date = parse_published_date(data.get("published_date"))
+    title = (data.get("title") or "")[:255]
+    return Volume(
+        title=title,
+        sort_title=normalize_sort_title(title),
+        isbn13=isbn13,
+        isbn10=data.get("isbn_10") or Volume.convert_isbn13_to_10(isbn13),
+        publisher=(data.get("publisher") or "")[:200] or None,
+        publication_date=publication_date,
+        publication_year=publication_date.year if publication_date else None,
+        description=data.get("description") or None,
+        cover_url=data.get("cover_url") or None,
+        volume_json=data,
+        primary_work=work,
+        acquisition_cost=0,
+    )
+
+
+def _create_bulk(pending, bookshelf):
+    volumes = [v for _, v, _ in pending]
+    assign_slugs(volumes, "title")
+    Volume.objects.bulk_create(volumes, batch_size=200)
+
+    WorkLink = Volume.works.through
+    WorkLink.objects.bulk_create(
+        [WorkLink(volume_id=v.pk, work_id=w.pk) for _, v, w in pending if w],
+        batch_size=500,
+    )
+    if bookshelf is not None:
+        ShelfLink = Volume.bookshelves.through
+        ShelfLink.objects.bulk_create(
+            [ShelfLink(volume_id=v.pk, bookshelf_id=bookshelf.pk)
+             for v in volumes],
+            batch_size=500,
+        )
+
+
+def _create_one_by_one(pending, bookshelf):
+    # Fallback when the bulk insert collides (e.g. a slug taken by a
+    # concurrent save): save() allocates its own slug and fires signals.
+    for row, volume, work in pending:
+        volume.pk = None
+        volume.slug = ""
+        try:
+            with transaction.atomic():
+                volume.save()
+                if work:
+                    volume.works.add(work)
+                if bookshelf is not None:
+                    volume.bookshelves.add(bookshelf)
+        except Exception as e:
+            row.status, row.message = ERROR, f"Save failed: {e}"
+            volume.pk = None
+
+
+def import_isbns(text: str, *, workers: int = DEFAULT_WORKERS,
+                 rate: float = DEFAULT_RATE, dry_run: bool = False,
+                 bookshelf=None, lookup=None) -> list[ImportRow]:
+    """Run the whole pipeline over ``text``; one ImportRow per ISBN seen."""
+    rows = parse_isbns(text)
+
+    first_seen: dict[str, ImportRow] = {}
+    for row in rows:
+        normalize(row)
+        if row.status:
+            continue
+        if row.isbn13 in first_seen:
+            row.status = DUPLICATE
+            row.message = f"Same ISBN as line {first_seen[row.isbn13].line}"
+        else:
+            first_seen[row.isbn13] = row
+
+    existing = dict(
+        Volume.objects.filter(isbn13__in=list(first_seen))
+        .values_list("isbn13", "pk")
+    )
+    for isbn13, row in first_seen.items():
+        if isbn13 in existing:
+            row.status, row.volume_id = EXISTS, existing[isbn13]
+            row.message = "Already in catalog"
+
+    todo = [row for row in first_seen.values() if not row.status]
+    fetched = fetch_metadata([r.isbn13 for r in todo], workers=workers,
+                             rate=rate, lookup=lookup)
+
+    found = []
+    for row in todo:
+        data = fetched.get(row.isbn13)
+        if isinstance(data, LookupError):
+            row.status, row.message = NOT_FOUND, str(data)
+        elif isinstance(data, Exception):
+            row.status, row.message = ERROR, f"Lookup failed: {data}"
+        elif not data or not data.get("title"):
+            row.status, row.message = NOT_FOUND, "Incomplete data returned"
+        else:
+            row.title = data["title"]
+            found.append((row, data))
+
+    authors, works = resolve_batch(
+        [data.get("author") or "Unknown Author" for _, data in found],
+        [data["title"] for _, data in found],
+    )
+
+    pending = []
+    for row, data in found:
+        author = authors.get(data.get("author") or "Unknown Author")
+        work = works.get(data["title"])
+        row.author = author.full_name if author else ""
+        row.work = work.title if work else ""
+        pending.append((row, build_volume(row.isbn13, data, work), work))
+
+    if dry_run:
+        for row, _, _ in pending:
+            row.status = WOULD_CREATE
+        return rows
+
+    if pending:
+        try:
+            with transaction.atomic():
+                _create_bulk(pending, bookshelf)
+        except IntegrityError:
+            _create_one_by_one(pending, bookshelf)
+
+        created_ids = []
+        for row, volume, _ in pending:
+            if volume.pk and row.status != ERROR:
+                row.status, row.volume_id = CREATED, volume.pk
+                created_ids.append(volume.pk)
+        # bulk_create bypasses the post_save reindex/stats signals
+        transaction.on_commit(
+            lambda: search_index.index_entities("volume", created_ids))
+        author_volumes.sync_volumes(created_ids)
+        stats.invalidate("volumes", "prices", "bookshelves", "counts",
+                         author_ids={w.author_id for _, _, w in pending if w})
+
+    return rows
+
+
+def summarize(rows: list[ImportRow]) -> Counter:
+    return Counter(row.status for row in rows)
+
+
+def write_report(rows: list[ImportRow], fh) -> None:
+    writer = csv.DictWriter(fh, fieldnames=REPORT_FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row.as_dict())
+
+
+def save_report(key: str, rows: list[ImportRow]) -> None:
+    caches["shared"].set(REPORT_KEY.format(key), [row.as_dict() for row in rows],
+                         REPORT_TIMEOUT)
+
+
+def load_report(key: str) -> list[ImportRow] | None:
+    """The rows saved under ``key``, or None while the import is still running."""
+    saved = caches["shared"].get(REPORT_KEY.format(key))
+    return None if saved is None else [ImportRow(**row) for row in saved]
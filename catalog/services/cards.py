@@ -0,0 +1,63 @@
+# catalog/services/cards.py
+"""
+Fragment cache for the volume cards on grid and list pages.
+
+A card is cached under (template, volume pk, volume.card_version). Signals
+(catalog/signals.py) bump card_version whenever the volume, its cover image,
+its works or their authors change, so an out-of-date card is simply never
+asked for again and ages out of the cache. A page fetches all of its cards
+with one get_many() and renders -- and stores -- only the misses.
+
+Cards embed the cover URL, so with signed S3 URLs the settings cap
+CARD_CACHE_TIMEOUT at half the signature lifetime.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F, QuerySet, prefetch_related_objects
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+from catalog.models import Volume
+
+CARD_VERSION = 1  # bump when a card template changes
+
+# everything a card template touches; fetched for the misses only
+MISS_PREFETCH = ("cover_image", "primary_work__author", "works__author")
+
+
+def _cache():
+    return caches[getattr(settings, "CARD_CACHE_ALIAS", "default")]
+
+
+def card_key(template_name, volume) -> str:
+    return f"card:{CARD_VERSION}:{template_name}:{volume.pk}:{volume.card_version}"
+
+
+def render_cards(volumes, template_name):
+    """[(volume, html), ...] in the order given, one cache round trip."""
+    volumes = list(volumes)
+    if not volumes:
+        return []
+    cache = _cache()
+    keys = {v.pk: card_key(template_name, v) for v in volumes}
+    cards = cache.get_many(list(set(keys.values())))
+
+    misses = list({v.pk: v for v in volumes if keys[v.pk] not in cards}.values())
+    if misses:
+        prefetch_related_objects(misses, *MISS_PREFETCH)
+        template = get_template(template_name)
+        fresh = {keys[v.pk]: str(template.render({"volume": v})) for v in misses}
+        cache.set_many(fresh, timeout=getattr(settings, "CARD_CACHE_TIMEOUT", None))
+        cards.update(fresh)
+
+    return [(v, mark_safe(cards[keys[v.pk]])) for v in volumes]
+
+
+def bump(volumes) -> None:
+    """Invalidate the cards of a Volume queryset or an iterable of pks."""
+    if not isinstance(volumes, QuerySet):
+        volumes = list(volumes)
+        if not volumes:
+            return
+        volumes = Volume.objects.filter(pk__in=volumes)
+    volumes.update(card_version=F("card_version") + 1)
@@ -4,12 +4,12 @@ import os
 from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 from django.core.files.base import ContentFile
-from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import transaction
 
 from catalog.models import Volume, VolumeImage
-from catalog.utils.images.images import process_upload
+from catalog.utils.images.images import process_bytes
 
 
 def _https(url: str) -> str:
@@ -33,8 +33,13 @@ def _guess_ext(url: str, content_type: str) -> str:
     return ext if ext in {".jpg", ".jpeg", ".png", ".webp"} else ".jpg"
 
 
+# One pooled session for all downloads (backfill runs these from threads)
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+
 def _download_image_bytes(url: str, timeout: int = 12) -> tuple[bytes, str]:
-    r = requests.get(
+    r = _session.get(
         url,
         timeout=timeout,
         allow_redirects=True,
@@ -97,7 +102,48 @@ def _download_image_bytes(url: str, timeout: int = 12) -> tuple[bytes, str]:
 #     except Exception:
 #         return False
 
+# Payloads under this are usually non-image / blocked / junk responses
+MIN_COVER_BYTES = 2_000
+
+
+def download_cover(volume_or_url) -> bytes | None:
+    """Fetch the stock cover bytes, or None if it's too small to be real."""
+    url = getattr(volume_or_url, "cover_url", volume_or_url)
+    data, _ = _download_image_bytes(_https(url))
+    return data if len(data) >= MIN_COVER_BYTES else None
+
+
 @transaction.atomic
+def attach_cover(volume: Volume, base: str, thumb: bytes, display: bytes,
+                 detail: bytes) -> bool:
+    """
+    Store already-encoded WEBP variants as the volume's COVER image. The
+    transaction only covers these writes, not the download or encoding.
+    Returns False if the volume got a cover in the meantime.
+    """
+    volume = Volume.objects.select_for_update().get(pk=volume.pk)
+    if volume.cover_image_id:
+        return False
+
+    vi = VolumeImage(
+        volume=volume,
+        kind="COVER",
+        caption="Stock cover (cached from Google)",
+        sort_order=0,
+    )
+
+    # The pipeline produces WEBP, so name them .webp
+    vi.image_thumb.save(f"{base}-thumb.webp", ContentFile(thumb), save=False)
+    vi.image_display.save(f"{base}-display.webp", ContentFile(display), save=False)
+    vi.image_detail.save(f"{base}-detail.webp", ContentFile(detail), save=False)
+
+    vi.save()
+
+    volume.cover_image = vi
+    volume.save(update_fields=["cover_image"])
+    return True
+
+
 def cache_google_cover_for_volume(volume: Volume) -> bool:
     """
     Download volume.cover_url once (Google thumbnail), process it through the same
@@ -110,45 +156,13 @@ def cache_google_cover_for_volume(volume: Volume) -> bool:
     if volume.cover_image_id:
         return False
 
-    cover_url = getattr(volume, "cover_url", None)
-    if not cover_url:
+    if not getattr(volume, "cover_url", None):
         return False
 
-    url = _https(cover_url)
-
     try:
-        data, ctype = _download_image_bytes(url)
-
-        # Reject tiny payloads (often non-image / blocked / junk responses)
-        if len(data) < 2_000:
+        data = download_cover(volume)
+        if data is None:
             return False
-
-        # Feed bytes into the same pipeline used for uploads
-        uploaded = SimpleUploadedFile(
-            name="google-cover.jpg",                 # name is mostly for Pillow; extension not critical
-            content=data,
-            content_type=ctype or "image/jpeg",
-        )
-
-        base, thumb_cf, display_cf, detail_cf = process_upload(uploaded)
-
-        vi = VolumeImage(
-            volume=volume,
-            kind="COVER",
-            caption="Stock cover (cached from Google)",
-            sort_order=0,
-        )
-
-        # Your pipeline returns WEBP ContentFiles, so name them .webp
-        vi.image_thumb.save(f"{base}-thumb.webp", thumb_cf, save=False)
-        vi.image_display.save(f"{base}-display.webp", display_cf, save=False)
-        vi.image_detail.save(f"{base}-detail.webp", detail_cf, save=False)
-
-        vi.save()
-
-        volume.cover_image = vi
-        volume.save(update_fields=["cover_image"])
-        return True
-
+        return attach_cover(volume, *process_bytes(data))
     except Exception:
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,98 @@
+# catalog/services/direct_uploads.py
+"""
+Browser -> bucket image uploads, so upload bytes never pass through a
+gunicorn worker (MEDIA_STORAGE="s3" with DIRECT_UPLOADS on):
+
+1. presign(): a fresh object name for the volume, a presigned POST the
+   browser can send the file to (type and size enforced by the bucket),
+   and a signed token naming that object;
+2. the browser POSTs the file straight to storage;
+3. confirm(): checks the tokens and that the objects exist, then attaches
+   them as VolumeImage originals (images.attach_originals), which queues
+   derivative generation like a regular upload. Objects that are already
+   attached are skipped, so a replayed token can't create a second row
+   sharing (and, on delete, removing) the first row's file.
+"""
+import posixpath
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from catalog.models import Volume, VolumeImage, volume_image_upload_to
+from catalog.services import images
+
+SALT = "catalog.direct_uploads"
+# object names carry a random token and are never rewritten
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def enabled() -> bool:
+    return (getattr(settings, "DIRECT_UPLOADS", False)
+            and getattr(settings, "MEDIA_STORAGE", "filesystem") == "s3")
+
+
+def max_bytes() -> int:
+    return getattr(settings, "DIRECT_UPLOAD_MAX_BYTES", 25 * 1024 * 1024)
+
+
+def expires() -> int:
+    return getattr(settings, "DIRECT_UPLOAD_EXPIRES", 600)
+
+
+def new_name(volume) -> str:
+    """Storage name for one more original of ``volume`` (as _save_original)."""
+    return volume_image_upload_to(VolumeImage(volume=volume),
+                                  f"{uuid.uuid4().hex[:12]}_original")
+
+
+def sign(volume, name) -> str:
+    return signing.dumps({"volume": volume.pk, "name": name}, salt=SALT)
+
+
+def unsign(volume, token) -> str:
+    """The object name in ``token``; BadSignature if forged, expired or not for ``volume``."""
+    data = signing.loads(token, salt=SALT, max_age=expires() + 60 * 60)
+    if data.get("volume") != volume.pk:
+        raise signing.BadSignature("Upload token is for another volume.")
+    return data["name"]
+
+
+def presigned_post(name, content_type) -> dict:
+    """{"url", "fields"} for a browser form POST of ``name`` to the bucket."""
+    storage = default_storage
+    key = posixpath.join(storage.location, name) if storage.location else name
+    return storage.connection.meta.client.generate_presigned_post(
+        storage.bucket_name, key,
+        Fields={"Content-Type": content_type, "Cache-Control": CACHE_CONTROL},
+        Conditions=[
+            {"Content-Type": content_type},
+            {"Cache-Control": CACHE_CONTROL},
+            ["content-length-range", 1, max_bytes()],
+        ],
+        ExpiresIn=expires(),
+    )
+
+
+def presign(volume, content_type) -> dict:
+    if not content_type.startswith("image/"):
+        raise ValueError("Only image files can be uploaded.")
+    name = new_name(volume)
+    return {**presigned_post(name, content_type), "token": sign(volume, name)}
+
+
+def confirm(volume, tokens) -> list:
+    """The VolumeImages created; tokens for objects already attached are ignored."""
+    names = list(dict.fromkeys(unsign(volume, token) for token in tokens))
+    missing = [name for name in names if not default_storage.exists(name)]
+    if missing:
+        raise ValueError(f"{len(missing)} upload(s) did not reach storage.")
+    with transaction.atomic():
+        # lock the volume so two replays of a token can't both pass the check
+        Volume.objects.select_for_update().filter(pk=volume.pk).first()
+        attached = set(VolumeImage.objects.filter(original__in=names)
+                       .values_list("original", flat=True))
+        return images.attach_originals(
+            volume=volume, names=[name for name in names if name not in attached])
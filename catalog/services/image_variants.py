@@ -0,0 +1,170 @@
+# catalog/services/image_variants.py
+"""
+On-demand image derivatives.
+
+New uploads keep only their original. Any (width, format, quality) variant
+is rendered the first time it is requested and written to a
+content-addressed cache under MEDIA_ROOT/derived/. The key hashes the
+image's identity, a fingerprint of its original's file name (originals get
+unique names and are never rewritten) and the variant parameters -- so the
+key never goes stale and doubles as a strong ETag, and a cache hit needs no
+DB query at all.
+
+Hits bump the cached file's mtime; prune() deletes least-recently-used
+files once the cache grows past IMAGE_VARIANT_CACHE_MAX_BYTES.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.urls import reverse
+
+from catalog.models import BooksetImage, VolumeImage
+from catalog.utils.images.images import IMAGE_SIZES, WEBP_QUALITY, render_variant
+
+PIPELINE_VERSION = 1  # bump to invalidate every cached variant
+DEFAULT_WIDTHS = (120, 240, 480, 900, 1200, 1800)
+DEFAULT_QUALITIES = (60, 75, 85, 95)
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+MODELS = {"volume": VolumeImage, "bookset": BooksetImage}
+
+_lock = threading.Lock()
+_written_since_prune = 0
+
+
+def cache_root() -> Path:
+    return Path(getattr(settings, "IMAGE_VARIANT_CACHE_DIR", "")
+                or Path(settings.MEDIA_ROOT) / "derived")
+
+
+def max_bytes() -> int:
+    return getattr(settings, "IMAGE_VARIANT_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+
+
+def allowed_widths() -> set[int]:
+    return (set(getattr(settings, "IMAGE_VARIANT_WIDTHS", DEFAULT_WIDTHS))
+            | set(IMAGE_SIZES.values()))
+
+
+def allowed_qualities() -> set[int]:
+    return set(DEFAULT_QUALITIES) | {WEBP_QUALITY}
+
+
+def source_version(name: str) -> str:
+    return hashlib.sha1(name.encode()).hexdigest()[:16]
+
+
+def variant_key(model: str, pk: int, version: str, width: int, fmt: str,
+                quality: int) -> str:
+    raw = f"{PIPELINE_VERSION}|{model}|{pk}|{version}|{width}|{fmt}|{quality}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def variant_path(key: str, fmt: str) -> Path:
+    return cache_root() / key[:2] / key[2:4] / f"{key}.{fmt}"
+
+
+def model_name(image) -> str:
+    return "bookset" if isinstance(image, BooksetImage) else "volume"
+
+
+def variant_url(image, width: int, fmt: str = "webp",
+                quality: int = WEBP_QUALITY) -> str:
+    url = reverse("image_variant", kwargs={
+        "model": model_name(image),
+        "pk": image.pk,
+        "version": source_version(image.original.name),
+        "width": width,
+        "fmt": fmt,
+    })
+    return url if quality == WEBP_QUALITY else f"{url}?q={quality}"
+
+
+def cached_variant(key: str, fmt: str) -> Path | None:
+    """The cached file, with its mtime bumped for LRU, or None."""
+    path = variant_path(key, fmt)
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return path
+
+
+def create_variant(image, key: str, width: int, fmt: str,
+                   quality: int) -> Path:
+    with image.original.open("rb") as fh:
+        data = render_variant(fh, width, fmt, quality)
+
+    path = variant_path(key, fmt)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Concurrent first requests may both render; os.replace keeps it atomic.
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+    _note_write(len(data))
+    return path
+
+
+def _note_write(size: int) -> None:
+    global _written_since_prune
+    with _lock:
+        _written_since_prune += size
+        due = _written_since_prune > max_bytes() // 20
+        if due:
+            _written_since_prune = 0
+    if due:
+        prune()
+
+
+def prune(limit: int | None = None, low_water: float = 0.9) -> tuple[int, int]:
+    """
+    If the cache exceeds ``limit`` bytes, delete least recently used files
+    until it is under ``low_water * limit``. Returns (files, bytes) removed.
+    """
+    limit = max_bytes() if limit is None else limit
+    root = cache_root()
+    now = time.time()
+
+    entries, total = [], 0
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if filename.endswith(".tmp"):
+                if st.st_mtime < now - 3600:  # left behind by a killed worker
+                    _unlink(path)
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+    if total <= limit:
+        return 0, 0
+
+    removed_files = removed_bytes = 0
+    target = limit * low_water
+    for _, size, path in sorted(entries):
+        if total <= target:
+            break
+        if _unlink(path):
+            total -= size
+            removed_files += 1
+            removed_bytes += size
+    return removed_files, removed_bytes
+
+
+def _unlink(path) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
@@ -1,34 +1,75 @@
 # catalog/services/images.py (recommended)
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.files.base import ContentFile
 from django.db import transaction
 from django.db.models import Max
 
+from jobs.queue import enqueue
+
 from ..models import VolumeImage
-from ..utils.images.images import process_upload
+from ..utils.images.images import process_many
+
+logger = logging.getLogger(__name__)
+
+
+def _save_derivatives(img, base, thumb, display, detail):
+    img.image_thumb.save(f"{base}_thumb.webp", ContentFile(thumb), save=False)
+    img.image_display.save(f"{base}_display.webp", ContentFile(display), save=False)
+    img.image_detail.save(f"{base}_detail.webp", ContentFile(detail), save=False)
+
+
+def _save_original(img, f):
+    f.seek(0)
+    img.original.save(f"{uuid.uuid4().hex[:12]}_original", f, save=False)
+
+
+def lazy_derivatives() -> bool:
+    return getattr(settings, "IMAGE_LAZY_DERIVATIVES", True)
+
 
+def save_upload(img, f):
+    """Attach one uploaded file to an unsaved VolumeImage/BooksetImage."""
+    if lazy_derivatives():
+        _save_original(img, f)
+    else:
+        _save_derivatives(img, *process_many([f])[0])
 
-def ingest_volume_images(*, volume, files, set_first_as_cover: bool = True):
+
+def ingest_volume_images(*, volume, files, set_first_as_cover: bool = True,
+                         run_async: bool | None = None):
     """
     Creates VolumeImage rows from uploaded files, assigns increasing sort_order,
     and optionally sets volume.cover_image to the first created image.
+
+    By default (IMAGE_LAZY_DERIVATIVES) only the originals are stored and
+    sizes are rendered on first view. Otherwise derivatives are made eagerly:
+    in parallel on the image process pool before touching the DB, or with
+    IMAGE_DERIVATIVES_ASYNC by the job worker (catalog/tasks.py), the
+    request having stored just the originals.
     """
     if not files:
         return []
 
-    start = (
-        VolumeImage.objects.filter(volume=volume).aggregate(m=Max("sort_order")).get("m") or 0
-    )
+    lazy = lazy_derivatives()
+    if run_async is None:
+        run_async = getattr(settings, "IMAGE_DERIVATIVES_ASYNC", False)
+
+    start = _last_sort_order(volume)
+
+    processed = None if (lazy or run_async) else process_many(files)
 
     created = []
     with transaction.atomic():
         for idx, f in enumerate(files, start=1):
             img = VolumeImage(volume=volume, sort_order=start + idx)
 
-            # Reuse your existing processing pipeline
-            base, thumb, display, detail = process_upload(f)  # <-- import this
-
-            img.image_thumb.save(f"{base}_thumb.webp", thumb, save=False)
-            img.image_display.save(f"{base}_display.webp", display, save=False)
-            img.image_detail.save(f"{base}_detail.webp", detail, save=False)
+            if processed is None:
+                _save_original(img, f)
+            else:
+                _save_derivatives(img, *processed[idx - 1])
 
             img.save()
             created.append(img)
@@ -37,4 +78,64 @@ def ingest_volume_images(*, volume, files, set_first_as_cover: bool = True):
             volume.cover_image = created[0]
             volume.save(update_fields=["cover_image"])
 
+        if run_async and not lazy:
+            # queued in this transaction: the worker sees it once the rows commit
+            schedule_derivatives([img.pk for img in created])
+
     return created
+
+
+def attach_originals(*, volume, names, set_first_as_cover: bool = False):
+    """
+    VolumeImage rows for originals that are already in storage (browser
+    uploads straight to the bucket, catalog/services/direct_uploads.py).
+    Derivatives are left to the on-demand variants, or queued for the job
+    worker when IMAGE_LAZY_DERIVATIVES is off.
+    """
+    if not names:
+        return []
+    start = _last_sort_order(volume)
+    with transaction.atomic():
+        created = VolumeImage.objects.bulk_create([
+            VolumeImage(volume=volume, sort_order=start + idx, original=name)
+            for idx, name in enumerate(names, start=1)
+        ])
+        if set_first_as_cover:
+            volume.cover_image = created[0]
+            volume.save(update_fields=["cover_image"])
+        if not lazy_derivatives():
+            schedule_derivatives([img.pk for img in created])
+    return created
+
+
+def _last_sort_order(volume) -> int:
+    return (
+        VolumeImage.objects.filter(volume=volume).aggregate(m=Max("sort_order")).get("m") or 0
+    )
+
+
+def schedule_derivatives(image_ids) -> None:
+    enqueue("catalog.generate_image_derivatives", {"image_ids": list(image_ids)})
+
+
+def generate_derivatives(image_ids=None) -> int:
+    """
+    Fill in thumb/display/detail for images that only have an original.
+    ``None`` means every pending image. Returns the number processed.
+    """
+    qs = VolumeImage.objects.filter(image_thumb="").exclude(original="")
+    if image_ids is not None:
+        qs = qs.filter(pk__in=image_ids)
+    images = list(qs)
+    if not images:
+        return 0
+
+    datas = []
+    for img in images:
+        with img.original.open("rb") as fh:
+            datas.append(fh.read())
+
+    for img, result in zip(images, process_many(datas)):
+        _save_derivatives(img, *result)
+        img.save(update_fields=["image_thumb", "image_display", "image_detail"])
+    return len(images)
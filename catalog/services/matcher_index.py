@@ -0,0 +1,269 @@
+# catalog/services/matcher_index.py
+"""
+Process-level fuzzy matching index for resolve_author / resolve_work.
+
+The old resolvers walked every AuthorAlias / Author / Work row and re-ran
+normalize_name() (a fresh NameParser each time) on both sides per row. Here
+the normalized keys are computed once, kept in contiguous lists, and scored
+with rapidfuzz's C implementation (process.extract) over a *block* of
+candidates that share a surname / title token. If the block has nothing
+above the cutoff we fall back to scoring the full list, so blocking never
+loses a match the old linear scan would have found.
+
+Invalidation: post_save/post_delete signals patch this process's index in
+place and bump a generation counter in the "shared" cache, which every
+process sees; other processes notice the new generation on their next
+lookup and rebuild.
+"""
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+
+from django.core.cache import caches
+from rapidfuzz import fuzz, process
+
+from catalog.utils.fuzzy_matching import normalize_name, normalize_title
+
+GENERATION_KEY = "catalog:matcher_index:generation"
+
+AUTHOR_CUTOFF = 90
+WORK_CUTOFF = 80
+
+TITLE_STOPWORDS = {"the", "a", "an", "of", "and", "in", "on", "to", "for"}
+
+
+def _name_key(name: str) -> str:
+    try:
+        return normalize_name(name) if name else ""
+    except (IndexError, AttributeError):
+        return ""
+
+
+def _name_blocks(key: str) -> set[str]:
+    # key looks like "jrr tolkien" / "tolkien" / "jr smith jr";
+    # the leading initials are too unselective to block on.
+    tokens = key.split()
+    if len(tokens) > 1:
+        tokens = tokens[1:]
+    return {t for t in tokens if len(t) > 1}
+
+
+def _title_blocks(key: str) -> set[str]:
+    return {t for t in key.split()
+            if len(t) > 2 and t not in TITLE_STOPWORDS}
+
+
+class _Table:
+    """Parallel id/key lists plus an inverted token -> positions map."""
+
+    def __init__(self, block_fn):
+        self.block_fn = block_fn
+        self.ids: list[int] = []
+        self.keys: list[str] = []
+        self.positions: dict[int, list[int]] = defaultdict(list)
+        self.blocks: dict[str, set[int]] = defaultdict(set)
+        self.free: list[int] = []  # blanked slots, reused by add()
+
+    def add(self, obj_id: int, key: str) -> None:
+        if self.free:
+            pos = self.free.pop()
+            self.ids[pos] = obj_id
+            self.keys[pos] = key
+        else:
+            pos = len(self.keys)
+            self.ids.append(obj_id)
+            self.keys.append(key)
+        self.positions[obj_id].append(pos)
+        for token in self.block_fn(key):
+            self.blocks[token].add(pos)
+
+    def remove(self, obj_id: int) -> None:
+        # Blank the slot rather than shifting the lists; "" never scores.
+        # The next add() takes it over, so edits don't grow the lists.
+        for pos in self.positions.pop(obj_id, []):
+            for token in self.block_fn(self.keys[pos]):
+                self.blocks[token].discard(pos)
+            self.keys[pos] = ""
+            self.free.append(pos)
+
+    def extract(self, query: str, scorer, limit: int,
+                score_cutoff: float) -> list[tuple[int, float]]:
+        if not query:
+            return []
+
+        candidates = sorted(
+            {pos for t in self.block_fn(query) for pos in self.blocks.get(t, ())}
+        )
+        results = []
+        if candidates:
+            choices = [self.keys[p] for p in candidates]
+            results = [
+                (self.ids[candidates[i]], score)
+                for _, score, i in process.extract(
+                    query, choices, scorer=scorer, processor=None,
+                    limit=limit, score_cutoff=score_cutoff)
+            ]
+
+        if not results or results[0][1] < max(score_cutoff, 1):
+            results = [
+                (self.ids[i], score)
+                for _, score, i in process.extract(
+                    query, self.keys, scorer=scorer, processor=None,
+                    limit=limit, score_cutoff=score_cutoff)
+            ]
+        return _dedupe(results, limit)
+
+
+def _dedupe(results, limit):
+    seen = set()
+    out = []
+    for obj_id, score in results:
+        if obj_id in seen:
+            continue
+        seen.add(obj_id)
+        out.append((obj_id, score))
+    return out[:limit]
+
+
+class MatcherIndex:
+    """
+    Keys reproduce what the old name_match()/title_match() compared:
+    name_match(a, b) normalizes both of its arguments, and the resolvers
+    passed in an already-normalized target (and Author.match_name is itself
+    normalize_name(full_name)).
+    """
+
+    def __init__(self, authors=(), aliases=(), works=()):
+        self.authors = _Table(_name_blocks)
+        self.aliases = _Table(_name_blocks)
+        self.works = _Table(_title_blocks)
+        for author_id, match_name in authors:
+            self.add_author(author_id, match_name)
+        for author_id, alias in aliases:
+            self.aliases.add(author_id, _name_key(alias))
+        for work_id, title in works:
+            self.add_work(work_id, title)
+
+    @classmethod
+    def from_db(cls) -> "MatcherIndex":
+        from catalog.models import Author, AuthorAlias, Work
+
+        return cls(
+            authors=Author.objects.values_list("pk", "match_name").iterator(),
+            aliases=AuthorAlias.objects.values_list("author_id", "alias").iterator(),
+            works=Work.objects.values_list("pk", "title").iterator(),
+        )
+
+    # ---- maintenance ----
+
+    def add_author(self, author_id, match_name):
+        self.authors.remove(author_id)
+        self.authors.add(author_id, _name_key(match_name))
+
+    def remove_author(self, author_id):
+        self.authors.remove(author_id)
+        self.aliases.remove(author_id)
+
+    def set_aliases(self, author_id, aliases):
+        self.aliases.remove(author_id)
+        for alias in aliases:
+            self.aliases.add(author_id, _name_key(alias))
+
+    def add_work(self, work_id, title):
+        self.works.remove(work_id)
+        self.works.add(work_id, normalize_title(title or ""))
+
+    def remove_work(self, work_id):
+        self.works.remove(work_id)
+
+    # ---- queries ----
+
+    @staticmethod
+    def author_query(name: str) -> str:
+        return _name_key(_name_key(name))
+
+    def match_authors(self, name: str, limit: int = 5,
+                      score_cutoff: float = 0) -> list[tuple[int, float]]:
+        """Top-k (author_id, score), alias hits ranked alongside names."""
+        query = self.author_query(name)
+        hits = (
+            self.aliases.extract(query, fuzz.token_sort_ratio, limit, score_cutoff)
+            + self.authors.extract(query, fuzz.token_sort_ratio, limit, score_cutoff)
+        )
+        hits.sort(key=lambda h: h[1], reverse=True)
+        return _dedupe(hits, limit)
+
+    def best_author(self, name: str, score_cutoff: float = AUTHOR_CUTOFF):
+        """Alias matches win over direct name matches, as before."""
+        query = self.author_query(name)
+        for table in (self.aliases, self.authors):
+            hits = table.extract(query, fuzz.token_sort_ratio, 1, score_cutoff)
+            if hits:
+                return hits[0][0]
+        return None
+
+    def match_works(self, title: str, limit: int = 5,
+                    score_cutoff: float = 0) -> list[tuple[int, float]]:
+        query = normalize_title(title or "")
+        return self.works.extract(query, fuzz.token_set_ratio, limit,
+                                  score_cutoff)
+
+    def best_work(self, title: str, score_cutoff: float = WORK_CUTOFF):
+        hits = self.match_works(title, limit=1, score_cutoff=score_cutoff)
+        return hits[0][0] if hits else None
+
+
+# ---- process-level singleton --------------------------------
+
+_lock = threading.RLock()
+_index: MatcherIndex | None = None
+_generation = None
+
+
+def _current_generation():
+    return caches["shared"].get(GENERATION_KEY, 0)
+
+
+def get_index() -> MatcherIndex:
+    global _index, _generation
+    generation = _current_generation()
+    with _lock:
+        if _index is None or generation != _generation:
+            _index = MatcherIndex.from_db()
+            _generation = generation
+        return _index
+
+
+def _bump_generation():
+    cache = caches["shared"]
+    try:
+        return cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, None)
+        return 1
+
+
+def apply_change(mutate) -> None:
+    """
+    Apply ``mutate(index)`` to this process's index (if built) and publish a
+    new generation so other processes rebuild. If someone else bumped the
+    generation in the meantime our copy is stale anyway: drop it.
+    """
+    global _index, _generation
+    with _lock:
+        new_generation = _bump_generation()
+        if _index is None:
+            return
+        if _generation is not None and new_generation == _generation + 1:
+            mutate(_index)
+            _generation = new_generation
+        else:
+            _index = None
+
+
+def invalidate() -> None:
+    global _index
+    with _lock:
+        _index = None
+        _bump_generation()
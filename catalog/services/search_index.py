@@ -0,0 +1,332 @@
+# catalog/services/search_index.py
+"""
+Full-text search index for Authors, Works, Volumes and BookSets.
+
+Every searchable object gets one denormalized ``SearchDocument`` row (title +
+a body of related text such as author names, genres and notes). The database
+then does the heavy lifting:
+
+- SQLite: an FTS5 external-content table kept in sync by triggers
+- Postgres: a stored ``tsvector`` column with a GIN index
+
+Both are created in migration 0076. Any other backend falls back to a plain
+``icontains`` scan over the single documents table (still no joins).
+"""
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from catalog.models import Author, BookSet, SearchDocument, Volume, Work
+
+ENTITY_MODELS = {
+    "author": Author,
+    "work": Work,
+    "volume": Volume,
+    "bookset": BookSet,
+}
+
+FTS_TABLE = "catalog_searchdocument_fts"
+
+# Snippet markers: control characters survive escape() untouched and never
+# appear in catalog text, so they can be swapped for <mark> tags afterwards.
+_HL_START = "\x02"
+_HL_END = "\x03"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class SearchHit:
+    entity_id: int
+    rank: float
+    snippet: str
+
+
+# ---- Query building -----------------------------------
+
+def tokenize_query(q: str) -> list[str]:
+    return _TOKEN_RE.findall((q or "").lower())
+
+
+def build_fts_query(q: str) -> str:
+    """'tolk lord' -> '"tolk"* "lord"*' (implicit AND, prefix match)."""
+    return " ".join(f'"{t}"*' for t in tokenize_query(q))
+
+
+def build_tsquery(q: str) -> str:
+    """'tolk lord' -> 'tolk:* & lord:*'"""
+    return " & ".join(f"{t}:*" for t in tokenize_query(q))
+
+
+def highlight(snippet: str) -> str:
+    """Escape a raw snippet and turn the markers into <mark> tags."""
+    html = escape(snippet or "")
+    html = html.replace(_HL_START, "<mark>").replace(_HL_END, "</mark>")
+    return mark_safe(html)
+
+
+# ---- Document building --------------------------------
+
+def _join(*parts) -> str:
+    return "\n".join(str(p) for p in parts if p)
+
+
+def _author_documents(ids):
+    for a in Author.objects.filter(pk__in=ids).prefetch_related("aliases"):
+        yield SearchDocument(
+            entity_type="author",
+            entity_id=a.pk,
+            title=a.full_name,
+            body=_join(a.nationality, *[al.alias for al in a.aliases.all()],
+                       a.bio),
+        )
+
+
+def _work_documents(ids):
+    qs = (
+        Work.objects.filter(pk__in=ids)
+        .select_related("author")
+        .prefetch_related("genre")
+    )
+    for w in qs:
+        yield SearchDocument(
+            entity_type="work",
+            entity_id=w.pk,
+            title=w.title,
+            body=_join(w.author.full_name, w.get_work_type_display(),
+                       *[g.name for g in w.genre.all()], w.notes),
+        )
+
+
+def _volume_documents(ids):
+    qs = (
+        Volume.objects.filter(pk__in=ids)
+        .select_related("book_set")
+        .prefetch_related("works__author", "works__genre")
+    )
+    for v in qs:
+        works = list(v.works.all())
+        yield SearchDocument(
+            entity_type="volume",
+            entity_id=v.pk,
+            title=v.title,
+            body=_join(
+                *[w.title for w in works],
+                *{w.author.full_name for w in works},
+                *{g.name for w in works for g in w.genre.all()},
+                v.book_set.title if v.book_set else None,
+                v.publisher, v.illustrator, v.edition, v.isbn13, v.isbn10,
+            ),
+        )
+
+
+def _bookset_documents(ids):
+    qs = BookSet.objects.filter(pk__in=ids).prefetch_related(
+        "volumes__works__author")
+    for bs in qs:
+        vols = list(bs.volumes.all())
+        works = [w for v in vols for w in v.works.all()]
+        yield SearchDocument(
+            entity_type="bookset",
+            entity_id=bs.pk,
+            title=bs.title,
+            body=_join(
+                bs.illustrator, bs.publisher,
+                *[v.title for v in vols],
+                *{w.title for w in works},
+                *{w.author.full_name for w in works},
+            ),
+        )
+
+
+DOCUMENT_BUILDERS = {
+    "author": _author_documents,
+    "work": _work_documents,
+    "volume": _volume_documents,
+    "bookset": _bookset_documents,
+}
+
+
+# ---- Index maintenance --------------------------------
+
+def index_entities(entity_type: str, ids) -> int:
+    """(Re)build the documents for the given ids. Missing ids are dropped."""
+    ids = {int(i) for i in ids if i is not None}
+    if not ids:
+        return 0
+
+    docs = list(DOCUMENT_BUILDERS[entity_type](ids))
+    with transaction.atomic():
+        SearchDocument.objects.filter(
+            entity_type=entity_type, entity_id__in=ids
+        ).delete()
+        SearchDocument.objects.bulk_create(docs)
+    return len(docs)
+
+
+def remove_entity(entity_type: str, entity_id: int) -> None:
+    SearchDocument.objects.filter(
+        entity_type=entity_type, entity_id=entity_id
+    ).delete()
+
+
+def related_targets(instance) -> dict[str, set[int]]:
+    """
+    Which documents mention this object? An author's name appears in its
+    works, their volumes and those volumes' sets, so a rename fans out.
+    """
+    targets = defaultdict(set)
+
+    if isinstance(instance, Author):
+        targets["author"].add(instance.pk)
+        targets["work"].update(
+            Work.objects.filter(author=instance).values_list("pk", flat=True))
+        targets["volume"].update(
+            Volume.objects.filter(works__author=instance)
+            .values_list("pk", flat=True))
+        targets["bookset"].update(
+            BookSet.objects.filter(volumes__works__author=instance)
+            .values_list("pk", flat=True))
+    elif isinstance(instance, Work):
+        targets["work"].add(instance.pk)
+        targets["volume"].update(
+            instance.volumes.values_list("pk", flat=True))
+        targets["bookset"].update(
+            BookSet.objects.filter(volumes__works=instance)
+            .values_list("pk", flat=True))
+    elif isinstance(instance, Volume):
+        targets["volume"].add(instance.pk)
+        if instance.book_set_id:
+            targets["bookset"].add(instance.book_set_id)
+    elif isinstance(instance, BookSet):
+        targets["bookset"].add(instance.pk)
+
+    return targets
+
+
+def reindex_related(instance) -> None:
+    """Schedule a reindex of everything that embeds ``instance`` (on commit)."""
+    targets = related_targets(instance)
+
+    def _run():
+        for entity_type, ids in targets.items():
+            index_entities(entity_type, ids)
+
+    transaction.on_commit(_run)
+
+
+def rebuild(batch_size: int = 500, stdout=None) -> dict[str, int]:
+    counts = {}
+    SearchDocument.objects.all().delete()
+    for entity_type, model in ENTITY_MODELS.items():
+        ids = list(model.objects.order_by("pk").values_list("pk", flat=True))
+        total = 0
+        for start in range(0, len(ids), batch_size):
+            total += index_entities(entity_type, ids[start:start + batch_size])
+        counts[entity_type] = total
+        if stdout:
+            stdout.write(f"Indexed {total} {entity_type} documents")
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('optimize')")
+    return counts
+
+
+# ---- Querying -----------------------------------------
+
+def _search_sqlite(q, entity_type, limit):
+    match = build_fts_query(q)
+    if not match:
+        return []
+    sql = f"""
+        SELECT d.entity_id,
+               bm25({FTS_TABLE}, 10.0, 1.0) AS rank,
+               snippet({FTS_TABLE}, -1, %s, %s, '…', 16)
+        FROM {FTS_TABLE}
+        JOIN catalog_searchdocument d ON d.id = {FTS_TABLE}.rowid
+        WHERE {FTS_TABLE} MATCH %s AND d.entity_type = %s
+        ORDER BY rank
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [_HL_START, _HL_END, match, entity_type, limit])
+        # bm25() is "lower is better"; flip it so callers can sort descending
+        return [SearchHit(row[0], -row[1], row[2]) for row in cursor.fetchall()]
+
+
+def _search_postgres(q, entity_type, limit):
+    tsquery = build_tsquery(q)
+    if not tsquery:
+        return []
+    options = f"StartSel={_HL_START}, StopSel={_HL_END}, MaxWords=24, MinWords=8"
+    sql = """
+        SELECT d.entity_id,
+               ts_rank(d.search_vector, query) AS rank,
+               ts_headline('english', d.title || ' ' || d.body, query, %s)
+        FROM catalog_searchdocument d, to_tsquery('english', %s) query
+        WHERE d.entity_type = %s AND d.search_vector @@ query
+        ORDER BY rank DESC
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [options, tsquery, entity_type, limit])
+        return [SearchHit(*row) for row in cursor.fetchall()]
+
+
+def _fallback_snippet(doc, tokens, width=120):
+    text = f"{doc.title} {doc.body}".replace("\n", " ")
+    lower = text.lower()
+    pos = min((lower.find(t) for t in tokens if t in lower), default=0)
+    start = max(pos - width // 3, 0)
+    snippet = text[start:start + width]
+    for t in tokens:
+        snippet = re.sub(
+            f"({re.escape(t)}\\w*)", f"{_HL_START}\\1{_HL_END}", snippet,
+            flags=re.I)
+    return ("…" if start else "") + snippet
+
+
+def _search_fallback(q, entity_type, limit):
+    tokens = tokenize_query(q)
+    if not tokens:
+        return []
+    cond = Q()
+    for t in tokens:
+        cond &= Q(title__icontains=t) | Q(body__icontains=t)
+    docs = SearchDocument.objects.filter(cond, entity_type=entity_type)[:limit]
+    return [SearchHit(d.entity_id, 0.0, _fallback_snippet(d, tokens))
+            for d in docs]
+
+
+def search(q: str, entity_type: str, limit: int = 100) -> list[SearchHit]:
+    """Ranked hits (best first) for one entity type."""
+    if connection.vendor == "sqlite":
+        return _search_sqlite(q, entity_type, limit)
+    if connection.vendor == "postgresql":
+        return _search_postgres(q, entity_type, limit)
+    return _search_fallback(q, entity_type, limit)
+
+
+def hydrate(queryset, hits: list[SearchHit]) -> list:
+    """
+    Load the objects for ``hits`` in rank order and attach ``search_snippet``.
+    Hits whose object has since been deleted are skipped.
+    """
+    objs = queryset.in_bulk([h.entity_id for h in hits])
+    results = []
+    for h in hits:
+        obj = objs.get(h.entity_id)
+        if obj is None:
+            continue
+        obj.search_rank = h.rank
+        obj.search_snippet = highlight(h.snippet)
+        results.append(obj)
+    return results
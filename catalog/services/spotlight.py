@@ -0,0 +1,80 @@
+# catalog/services/spotlight.py
+"""
+The dashboard's random volume ("Book Roulette").
+
+Only volumes worth showing are candidates: still in the collection, with a
+cover and a description. Their ids are kept as one array in the "shared"
+cache, dropped by the Volume signals whenever a volume is saved or deleted
+and re-read on the next pick, so a pick is a random index into a list plus
+one primary-key lookup -- never a COUNT and OFFSET over the whole table.
+Being shared, a drop made by one process is seen by all of them.
+
+With SPOTLIGHT_DAILY the pick is seeded by the date and stored in the same
+cache, so every process shows the same "spotlight of the day" until
+midnight.
+"""
+import datetime
+import random
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Q
+
+from catalog.models import Volume
+
+IDS_KEY = "spotlight:ids"
+DAY_KEY = "spotlight:day:{}"
+IDS_TIMEOUT = 60 * 60 * 24
+
+
+def candidates():
+    return (
+        Volume.objects
+        .filter(disposition__isnull=True)
+        .filter(Q(cover_image__isnull=False) | Q(cover_url__gt=""))
+        .exclude(description__isnull=True).exclude(description="")
+    )
+
+
+def candidate_ids() -> list[int]:
+    cache = caches["shared"]
+    ids = cache.get(IDS_KEY)
+    if ids is None:
+        ids = list(candidates().order_by("pk").values_list("pk", flat=True))
+        cache.set(IDS_KEY, ids, IDS_TIMEOUT)
+    return ids
+
+
+def invalidate() -> None:
+    caches["shared"].delete(IDS_KEY)
+
+
+def _load(pk):
+    return (Volume.objects.select_related("cover_image")
+            .defer("rendered_markdown").filter(pk=pk).first())
+
+
+def pick(today=None):
+    """A random candidate volume, or None if there are none."""
+    daily = getattr(settings, "SPOTLIGHT_DAILY", False)
+    cache = caches["shared"]
+    today = today or datetime.date.today()
+    for _ in range(2):  # a stale id (deleted meanwhile) costs one retry
+        ids = candidate_ids()
+        if not ids:
+            return None
+        if daily:
+            key = DAY_KEY.format(today.isoformat())
+            pk = cache.get(key)
+            if pk is None:
+                pk = ids[random.Random(today.toordinal()).randrange(len(ids))]
+                cache.set(key, pk, IDS_TIMEOUT)
+        else:
+            pk = random.choice(ids)
+        volume = _load(pk)
+        if volume is not None:
+            return volume
+        invalidate()
+        if daily:
+            cache.delete(key)
+    return None
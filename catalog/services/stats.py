@@ -1,19 +1,205 @@
 # catalog/services/stats.py
-from django.db.models import Avg, Count, Max, Sum
-from catalog.models import Author, Bookshelf, Collection, Volume, Work
+"""
+Library statistics, materialized.
+
+Each section below is stored as a StatsSection row, so the stats page is one
+query for the snapshot rows. Signals (catalog/signals.py) keep them current:
+
+- totals and price figures are adjusted in place by adjust() and
+  price_changed(), inside the writing transaction;
+- the author lists -- the expensive part -- are patched per author, and
+  only when that author's entry actually changes;
+- the small per-shelf/per-collection lists are flagged stale by
+  invalidate() and recomputed right after commit.
+
+A section that is stale or predates a field it needs is left for its
+recompute. `manage.py rebuild_library_stats` recomputes everything.
+"""
+import json
+from decimal import Decimal
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Avg, Count, F, Max, Sum
+from catalog.models import (Author, BookSet, Bookshelf, Collection, StatsSection,
+                            Volume, Work)
 
 UNKNOWN_AUTHOR_NAME = "Unknown Author"
 
 def get_library_stats():
+    rows = {row.name: row for row in StatsSection.objects.all()}
     stats = {}
-    stats.update(_volume_stats())
-    stats.update(_price_stats())
-    stats.update(_author_stats())
-    stats.update(_bookshelf_stats())
-    stats.update(_collection_stats())
-    stats.update(_works_stats())
+    for name in SECTIONS:
+        row = rows.get(name)
+        # missing/stale only if a refresh failed or hasn't run yet
+        data = row.data if row is not None and not row.stale else refresh_section(name)
+        stats.update(data)
+    _decode_prices(stats)
     return stats
 
+
+def get_counts():
+    """Just the headline totals (the dashboard): one small row."""
+    row = StatsSection.objects.filter(name="counts").first()
+    return row.data if row is not None and not row.stale else refresh_section("counts")
+
+
+# ---- Snapshot maintenance ------------------------------------
+
+def _jsonable(data):
+    return json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+
+def _decode_prices(stats):
+    for key in ("total_volume_cost", "avg_volume_cost", "max_volume_cost"):
+        if stats.get(key) is not None:
+            stats[key] = Decimal(str(stats[key]))
+
+def refresh_section(name):
+    """Recompute one section and store it (unless it changed meanwhile)."""
+    row, _ = StatsSection.objects.get_or_create(name=name)
+    version = row.version
+    data = _jsonable(SECTIONS[name]())
+    # A write that landed while we were computing bumped `version`; leave
+    # the row stale so that write's own refresh (or the next read) redoes it.
+    StatsSection.objects.filter(name=name, version=version).update(
+        data=data, stale=False)
+    return data
+
+def refresh_stale():
+    for name in StatsSection.objects.filter(stale=True).values_list("name", flat=True):
+        if name in SECTIONS:
+            refresh_section(name)
+
+def rebuild():
+    return {name: refresh_section(name) for name in SECTIONS}
+
+def invalidate(*sections, author_ids=()):
+    """
+    Record that ``sections`` changed (flagged now, so a rollback un-flags
+    them) and refresh them after commit. ``author_ids`` are re-counted
+    individually in the author lists.
+    """
+    if sections:
+        StatsSection.objects.filter(name__in=sections).update(
+            stale=True, version=F("version") + 1)
+    ids = {i for i in author_ids if i is not None}
+
+    def _run():
+        if ids:
+            update_authors(ids)
+        refresh_stale()
+
+    transaction.on_commit(_run)
+
+def _locked(names):
+    """Fresh rows for ``names``, locked until the transaction ends."""
+    rows = StatsSection.objects.select_for_update().filter(name__in=names, stale=False)
+    return {row.name: row for row in rows}
+
+def _store(row, data):
+    data = _jsonable(data)
+    if data != row.data:
+        # bumping version keeps a concurrent refresh_section from
+        # overwriting this with figures computed before the change
+        row.data, row.version = data, row.version + 1
+        row.save(update_fields=["data", "version", "updated_at"])
+
+def adjust(deltas):
+    """Add ``{section: {key: delta}}`` to stored totals, e.g. on a new volume."""
+    deltas = {name: d for name, d in deltas.items() if any(d.values())}
+    if not deltas:
+        return
+    with transaction.atomic():
+        for name, row in _locked(deltas).items():
+            if not deltas[name].keys() <= row.data.keys():
+                invalidate(name)
+                continue
+            _store(row, {**row.data, **{key: row.data[key] + delta
+                                        for key, delta in deltas[name].items()}})
+
+def _price(value):
+    # as stored by Volume.price, so figures match a recompute
+    value = Decimal(str(value)).quantize(Decimal("0.01")) if value is not None else None
+    return value if value and value > 0 else None
+
+def price_changed(volume_id, title, old, new):
+    """
+    Fold one volume's price change into the prices section (None or 0 means
+    unpriced). Only the most expensive volume getting cheaper, or going,
+    needs the section recomputed.
+    """
+    old, new = _price(old), _price(new)
+    with transaction.atomic():
+        row = _locked(["prices"]).get("prices")
+        if row is None:
+            return
+        if "priced_volume_count" not in row.data:
+            invalidate("prices")
+            return
+        data = row.data
+        count = data["priced_volume_count"] + (new is not None) - (old is not None)
+        total = (_price(data["total_volume_cost"]) or 0) + (new or 0) - (old or 0)
+        top = _price(data["max_volume_cost"])
+        tops = [v for v in data["max_cost_volumes"] if v["id"] != volume_id]
+        if new is not None and (top is None or new > top):
+            top, tops = new, []
+        if new is not None and new == top:
+            tops.append({"id": volume_id, "title": title, "price": new})
+        if count and not tops:
+            invalidate("prices")
+            return
+        _store(row, {
+            "total_volume_cost": total if count else None,
+            "avg_volume_cost": total / count if count else None,
+            "max_volume_cost": top if count else None,
+            "max_cost_volumes": tops,
+            "priced_volume_count": count,
+        })
+
+def _author_rows(qs):
+    return list(
+        qs.exclude(full_name=UNKNOWN_AUTHOR_NAME)
+        .values("id", "slug", "full_name")
+        .annotate(works_count=Count("works", distinct=True),
+                  volumes_count=Count("works__volumes", distinct=True))
+    )
+
+def _by_count(rows, key):
+    ranked = [{"id": r["id"], "slug": r["slug"], "full_name": r["full_name"],
+               "count": r[key]} for r in rows]
+    ranked.sort(key=lambda r: (-r["count"], r["full_name"]))
+    return ranked
+
+def update_authors(author_ids):
+    """Patch just these authors' entries in the author lists."""
+    author_ids = set(author_ids)
+    with transaction.atomic():
+        row = StatsSection.objects.select_for_update().filter(name="authors").first()
+        if row is None or row.stale or "works_by_author" not in row.data:
+            # nothing to patch; a full recompute will pick these up
+            return
+        fresh = _author_rows(Author.objects.filter(pk__in=author_ids))
+
+        by_id = {
+            a["id"]: {"id": a["id"], "slug": a["slug"], "full_name": a["full_name"],
+                      "works_count": a["count"]}
+            for a in row.data["works_by_author"]
+        }
+        for a in row.data["volumes_by_author"]:
+            if a["id"] in by_id:
+                by_id[a["id"]]["volumes_count"] = a["count"]
+        for author_id in author_ids:
+            by_id.pop(author_id, None)
+        for a in fresh:
+            by_id[a["id"]] = a
+
+        rows = list(by_id.values())
+        _store(row, {
+            "total_authors": len(rows),
+            "works_by_author": _by_count(rows, "works_count"),
+            "volumes_by_author": _by_count(rows, "volumes_count"),
+        })
+
 def _volume_stats():
     total_volumes = Volume.objects.count()
 
@@ -24,7 +210,7 @@ def _volume_stats():
 def _price_stats():
     priced_volumes = Volume.objects.filter(price__gt=0)
     agg = priced_volumes.aggregate(total=Sum("price"), avg=Avg("price"),
-                           max=Max("price"))
+                           max=Max("price"), count=Count("pk"))
 
     total_volume_cost = agg["total"]
     avg_volume_cost = agg['avg']
@@ -39,29 +225,16 @@ def _price_stats():
         "avg_volume_cost": avg_volume_cost,
         "max_volume_cost": max_volume_cost,
         "max_cost_volumes": max_cost_volumes,
+        "priced_volume_count": agg["count"],
     }
 
 def _author_stats():
-    base = Author.objects.exclude(full_name=UNKNOWN_AUTHOR_NAME)
-
-    total_authors = base.count()
-
-    works_by_author = list(
-        base.values("id", "slug", "full_name")
-        .annotate(count=Count("works", distinct=True))
-        .order_by("-count")
-    )
-
-    volumes_by_author = list(
-        base.values("id", "slug", "full_name")
-        .annotate(count=Count("works__volumes", distinct=True))
-        .order_by("-count")
-    )
+    rows = _author_rows(Author.objects.all())
 
     return {
-        "total_authors": total_authors,
-        "works_by_author": works_by_author,
-        "volumes_by_author": volumes_by_author,
+        "total_authors": len(rows),
+        "works_by_author": _by_count(rows, "works_count"),
+        "volumes_by_author": _by_count(rows, "volumes_count"),
     }
 
 
@@ -93,3 +266,21 @@ def _works_stats():
         "total_works": total_works,
     }
 
+def _count_stats():
+    return {
+        "volume_count": Volume.objects.count(),
+        "work_count": Work.objects.count(),
+        "author_count": Author.objects.count(),
+        "set_count": BookSet.objects.count(),
+    }
+
+
+SECTIONS = {
+    "volumes": _volume_stats,
+    "prices": _price_stats,
+    "authors": _author_stats,
+    "bookshelves": _bookshelf_stats,
+    "collections": _collection_stats,
+    "works": _works_stats,
+    "counts": _count_stats,
+}
@@ -0,0 +1,315 @@
+# catalog/services/synthetic_catalog.py
+"""
+Synthetic catalog data for load testing (gen_catalog, bench_views).
+
+generate(n) tops the database up to ``n`` synthetic volumes. Rows are
+built in memory and written with bulk_create, so save() and signals don't
+run. The derived columns (sort_title, sort_name, match_name, slug, isbn10)
+are filled in here, and the search index, matcher index and stats snapshot
+are refreshed at the end.
+
+Shapes are loosely modeled on the real catalog:
+- authors ~ n/8, with a long tail of authors who have one work and a few
+  with dozens;
+- works ~ 0.8n, so some works have several editions, and one volume in
+  ten is an omnibus holding two or three works;
+- about one volume in five belongs to a numbered set;
+- some years, ISBNs, values and acquisition dates are missing.
+
+Synthetic volumes are marked with source="synthetic", which lets later
+runs top up to a target size and lets --clear find them.
+"""
+from __future__ import annotations
+
+import datetime
+import io
+import random
+from decimal import Decimal
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from catalog.models import (Author, BookSet, Bookshelf, Collection, Volume,
+                            VolumeImage, Work)
+from catalog.services import author_volumes, bookset_summary, matcher_index, search_index, stats
+from catalog.utils.fuzzy_matching import normalize_name
+from catalog.utils.normalization import normalize_sort_title
+from catalog.utils.slugs import assign_slugs
+
+SOURCE = "synthetic"
+PLACEHOLDER_DIR = "synthetic"
+PLACEHOLDER_COUNT = 8
+
+GIVEN = ("Anne", "Arthur", "Beatrice", "Charles", "Clara", "Daniel", "Dorothy",
+         "Edith", "Edward", "Eleanor", "Frances", "George", "Harriet", "Henry",
+         "Iris", "James", "Jane", "John", "Joseph", "Katherine", "Laura",
+         "Louisa", "Margaret", "Mary", "Matthew", "Nathaniel", "Olive", "Oscar",
+         "Patrick", "Rachel", "Robert", "Ruth", "Samuel", "Sarah", "Thomas",
+         "Virginia", "Walter", "William", "Willa", "Zora")
+SURNAMES = ("Abbott", "Ashdown", "Barlow", "Bramwell", "Carrington", "Colby",
+            "Dalton", "Drummond", "Ellery", "Fairfax", "Fenwick", "Garland",
+            "Greaves", "Hallam", "Hargreave", "Ingram", "Jessop", "Kendrick",
+            "Lindqvist", "Lockhart", "Marlowe", "Merriweather", "Norwood",
+            "Oakes", "Pemberton", "Prescott", "Quill", "Radcliffe", "Rowntree",
+            "Sheridan", "Stanhope", "Thackery", "Underhill", "Vance", "Whitlock",
+            "Winslow", "Yardley", "Yeats", "Zeller", "Ashcombe")
+ADJECTIVES = ("Silent", "Golden", "Hidden", "Last", "Winter", "Broken", "Distant",
+              "Crimson", "Lonely", "Wandering", "Forgotten", "Bright", "Northern",
+              "Secret", "Long", "Burning", "Quiet", "Shattered", "Summer", "Hollow")
+NOUNS = ("River", "House", "Garden", "Letters", "Orchard", "Harbor", "Voyage",
+         "Inheritance", "Shadow", "Lighthouse", "Kingdom", "Meadow", "Tide",
+         "Archive", "Cathedral", "Fields", "Island", "Mirror", "Road", "Poems",
+         "Stories", "Hours", "Crossing", "Season", "Country")
+PATTERNS = ("The {adj} {noun}", "{noun} of the {adj} {noun2}", "A {adj} {noun}",
+            "{noun}", "The {noun} and the {noun2}", "{adj} {noun}: A Novel",
+            "Collected {noun}", "{noun} in {adj} Light")
+PUBLISHERS = ("Penguin", "Vintage", "Knopf", "Faber & Faber", "Library of America",
+              "Oxford University Press", "Everyman's Library", "Modern Library",
+              "Folio Society", "Chatto & Windus", "Scribner", "Norton", None)
+SHELVES = ("Favorites", "To Read", "Signed", "First Editions", "Poetry",
+           "Reference", "Travel", "Gifts", "Office", "Bedroom", "Storage",
+           "Fine Press", "Childhood", "Criticism", "Letters & Diaries",
+           "Loaned Out", "Duplicates", "For Sale", "Rare", "Series")
+COLLECTIONS = ("Victorian Novels", "Modernism", "Pulitzer Winners",
+               "Booker Winners", "Russian Classics", "Southern Gothic",
+               "Nature Writing", "The Inklings", "War Literature",
+               "Harlem Renaissance")
+
+
+def _isbn13(rng) -> str:
+    core = "978" + "".join(str(rng.randrange(10)) for _ in range(9))
+    total = sum((1 if i % 2 == 0 else 3) * int(d) for i, d in enumerate(core))
+    return core + str((10 - total % 10) % 10)
+
+
+def _title(rng) -> str:
+    return rng.choice(PATTERNS).format(
+        adj=rng.choice(ADJECTIVES), noun=rng.choice(NOUNS), noun2=rng.choice(NOUNS))
+
+
+def _popularity(rng, count):
+    # heavy-tailed weights: a few prolific authors, many with one book
+    return [rng.paretovariate(1.2) for _ in range(count)]
+
+
+def placeholder_images() -> list[str]:
+    """Small JPEGs in default storage, shared by every synthetic cover."""
+    from PIL import Image  # only needed when images are requested
+
+    names = []
+    for i in range(PLACEHOLDER_COUNT):
+        name = f"{PLACEHOLDER_DIR}/placeholder_{i}.jpg"
+        if not default_storage.exists(name):
+            shade = 60 + i * 20
+            buf = io.BytesIO()
+            Image.new("RGB", (600, 900), (shade, 90, 255 - shade)).save(buf, "JPEG", quality=70)
+            name = default_storage.save(name, ContentFile(buf.getvalue()))
+        names.append(name)
+    return names
+
+
+def _unique_author_names(rng, count, taken):
+    """[(given, surname, full_name)], none of them in ``taken``."""
+    names = []
+    attempts = 0
+    while len(names) < count:
+        attempts += 1
+        given, surname = rng.choice(GIVEN), rng.choice(SURNAMES)
+        if attempts > count * 4:
+            surname = f"{surname}-{attempts}"  # name space exhausted at huge scales
+        middle = f" {chr(65 + rng.randrange(26))}." if attempts > count else ""
+        name = f"{given}{middle} {surname}"
+        match = normalize_name(name)
+        if name in taken or match in taken:
+            continue
+        taken.update((name, match))
+        names.append((given, surname, name))
+    return names
+
+
+def _named_rows(model, names):
+    existing = set(model.objects.filter(name__in=names).values_list("name", flat=True))
+    rows = [model(name=n) for n in names if n not in existing]
+    assign_slugs(rows, "name")
+    model.objects.bulk_create(rows)
+    return list(model.objects.filter(name__in=names))
+
+
+def generate(volumes: int, *, seed: int = 0, images: bool = True,
+             batch_size: int = 1000, log=None) -> dict[str, int]:
+    """Add synthetic rows until there are ``volumes`` synthetic volumes."""
+    log = log or (lambda message: None)
+    existing = Volume.objects.filter(source=SOURCE).count()
+    n = volumes - existing
+    if n <= 0:
+        log(f"Already {existing} synthetic volumes; nothing to add.")
+        return {"volumes": 0}
+
+    rng = random.Random(f"{seed}:{existing}")
+    today = datetime.date.today()
+    created = {}
+
+    with transaction.atomic():
+        taken = set(Author.objects.values_list("full_name", flat=True))
+        taken |= set(Author.objects.exclude(match_name=None)
+                     .values_list("match_name", flat=True))
+        authors = []
+        for given, surname, name in _unique_author_names(rng, max(1, n // 8), taken):
+            authors.append(Author(
+                full_name=name, first_name=given, last_name=surname,
+                sort_name=f"{surname} {given}", match_name=normalize_name(name),
+                nationality=rng.choice(("American", "British", "Irish", "Canadian", None)),
+            ))
+        assign_slugs(authors, "full_name")
+        Author.objects.bulk_create(authors, batch_size=batch_size)
+        created["authors"] = len(authors)
+        log(f"authors: {len(authors)}")
+
+        weights = _popularity(rng, len(authors))
+        work_count = max(len(authors), int(n * 0.8))
+        # every author gets a work (so clear() can reach it), the rest by weight
+        owners = authors + rng.choices(authors, weights=weights, k=work_count - len(authors))
+        works = []
+        for author in owners:
+            title = _title(rng)
+            works.append(Work(
+                title=title, sort_title=normalize_sort_title(title), author=author,
+                first_published=rng.randint(1600, today.year),
+                work_type=rng.choice(("NOVEL", "NOVEL", "POETRY_COLLECTION",
+                                      "ESSAY_COLLECTION", "NONFICTION", "PLAY")),
+            ))
+        assign_slugs(works, "title")
+        Work.objects.bulk_create(works, batch_size=batch_size)
+        created["works"] = len(works)
+        log(f"works: {len(works)}")
+
+        booksets = []
+        for _ in range(max(1, n // 50)):
+            title = f"The {rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} Series"
+            booksets.append(BookSet(
+                title=title, sort_title=normalize_sort_title(title), source=SOURCE,
+                publisher=rng.choice(PUBLISHERS), total_volumes=rng.randint(2, 12),
+                publication_year=rng.randint(1900, today.year),
+            ))
+        assign_slugs(booksets, "title")
+        BookSet.objects.bulk_create(booksets, batch_size=batch_size)
+        created["booksets"] = len(booksets)
+
+        shelves = _named_rows(Bookshelf, list(SHELVES))
+        collections = _named_rows(Collection, list(COLLECTIONS))
+
+        new_volumes, links = [], []
+        set_counters = {}
+        for i in range(n):
+            volume_works = rng.sample(works, k=rng.choice((1,) * 9 + (2, 3)))
+            if i < len(works) and works[i] not in volume_works:
+                volume_works[0] = works[i]  # every work gets a volume
+            primary = volume_works[0]
+            year = rng.randint(max(primary.first_published or 1800, 1800), today.year) \
+                if rng.random() > 0.1 else None
+            isbn13 = _isbn13(rng) if rng.random() > 0.1 else None
+            acquired = (today - datetime.timedelta(days=rng.randrange(365 * 30))
+                        if rng.random() > 0.3 else None)
+            price = Decimal(rng.randrange(100, 20000)) / 100
+            volume = Volume(
+                title=primary.title, sort_title=primary.sort_title,
+                primary_work=primary, publisher=rng.choice(PUBLISHERS),
+                publication_year=year,
+                publication_date=datetime.date(year, 1, 1) if year else None,
+                isbn13=isbn13,
+                isbn10=Volume.convert_isbn13_to_10(isbn13) if isbn13 else None,
+                binding=rng.choice(("HC", "PB", "HC")),
+                status=rng.choice(("Catalog", "Catalog", "Catalog", "Inventory")),
+                acquisition_date=acquired,
+                acquisition_year=acquired.year if acquired else None,
+                price=price, acquisition_cost=price,
+                estimated_value=(price * Decimal(rng.uniform(0.5, 3))).quantize(Decimal("0.01"))
+                if rng.random() > 0.4 else None,
+                source=SOURCE,
+            )
+            if rng.random() < 0.2:
+                book_set = rng.choice(booksets)
+                set_counters[book_set.pk] = set_counters.get(book_set.pk, 0) + 1
+                volume.book_set = book_set
+                volume.volume_number = set_counters[book_set.pk]
+            new_volumes.append(volume)
+            links.append(volume_works)
+
+        assign_slugs(new_volumes, "title")
+        Volume.objects.bulk_create(new_volumes, batch_size=batch_size)
+        created["volumes"] = len(new_volumes)
+        log(f"volumes: {len(new_volumes)}")
+
+        WorkLink = Volume.works.through
+        WorkLink.objects.bulk_create(
+            [WorkLink(volume_id=v.pk, work_id=w.pk)
+             for v, ws in zip(new_volumes, links) for w in ws],
+            batch_size=batch_size)
+
+        ShelfLink = Volume.bookshelves.through
+        ShelfLink.objects.bulk_create(
+            [ShelfLink(volume_id=v.pk, bookshelf_id=s.pk)
+             for v in new_volumes if rng.random() < 0.3
+             for s in rng.sample(shelves, k=rng.randint(1, 2))],
+            batch_size=batch_size)
+
+        CollectionLink = Work.collections.through
+        CollectionLink.objects.bulk_create(
+            [CollectionLink(work_id=w.pk, collection_id=rng.choice(collections).pk)
+             for w in works if rng.random() < 0.1],
+            batch_size=batch_size, ignore_conflicts=True)
+
+        if images:
+            placeholders = placeholder_images()
+            covers = [VolumeImage(volume=v, kind="COVER", sort_order=1,
+                                  original=rng.choice(placeholders))
+                      for v in new_volumes if rng.random() < 0.7]
+            VolumeImage.objects.bulk_create(covers, batch_size=batch_size)
+            for image in covers:
+                image.volume.cover_image = image
+            Volume.objects.bulk_update([i.volume for i in covers], ["cover_image"],
+                                       batch_size=batch_size)
+            created["images"] = len(covers)
+            log(f"images: {len(covers)}")
+
+    # bulk_create skipped the signals that keep these in step
+    for entity_type, rows in (("author", authors), ("work", works),
+                              ("bookset", booksets), ("volume", new_volumes)):
+        ids = [r.pk for r in rows]
+        for start in range(0, len(ids), batch_size):
+            search_index.index_entities(entity_type, ids[start:start + batch_size])
+    author_volumes.sync_volumes(v.pk for v in new_volumes)
+    bookset_summary.refresh(b.pk for b in booksets)
+    matcher_index.invalidate()
+    stats.rebuild()
+    log("search index, author volumes, set summaries, matcher index and stats refreshed")
+    return created
+
+
+def clear(chunk: int = 500) -> int:
+    """
+    Delete synthetic volumes and sets, then the works and authors they
+    left without any volumes. Bookshelves and collections are kept.
+    """
+    with transaction.atomic():
+        work_ids = list(Volume.works.through.objects
+                        .filter(volume__source=SOURCE)
+                        .values_list("work_id", flat=True).distinct())
+        deleted, _ = Volume.objects.filter(source=SOURCE).delete()
+        BookSet.objects.filter(source=SOURCE).delete()
+
+        author_ids = set()
+        for start in range(0, len(work_ids), chunk):
+            orphans = Work.objects.filter(pk__in=work_ids[start:start + chunk],
+                                          volumes__isnull=True,
+                                          reading_path_items__isnull=True)
+            author_ids.update(orphans.values_list("author_id", flat=True))
+            orphans.delete()
+        author_ids = list(author_ids)
+        for start in range(0, len(author_ids), chunk):
+            Author.objects.filter(pk__in=author_ids[start:start + chunk],
+                                  works__isnull=True).delete()
+    matcher_index.invalidate()
+    stats.rebuild()
+    return deleted
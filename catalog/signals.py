@@ -1,11 +1,452 @@
-from django.db.models.signals import post_delete
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
 from django.dispatch import receiver
 
-from .models import VolumeImage
+from .models import (Author, AuthorAlias, BookSet, Bookshelf, Collection,
+                     Genre, Volume, VolumeImage, Work)
+from . import tasks
+from .services import (author_volumes, bookset_summary, cards, matcher_index,
+                       search_index, spotlight, stats)
+
 
 @receiver(post_delete, sender=VolumeImage)
 def delete_volume_image_files(sender, instance, **kwargs):
-    for field_name in ("image_thumb", "image_display", "image_detail"):
+    # storage deletes run in the job worker; the job rolls back with the row
+    files = []
+    for field_name in ("original", "image_thumb", "image_display", "image_detail"):
         f = getattr(instance, field_name, None)
         if f and f.name:
-            f.delete(save=False)
+            files.append([field_name, f.name])
+    if files:
+        tasks.delete_image_files.enqueue({"files": files})
+
+
+# ---- Search index ---------------------------------------
+
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Work)
+@receiver(post_save, sender=Volume)
+@receiver(post_save, sender=BookSet)
+def reindex_on_save(sender, instance, raw=False, **kwargs):
+    if raw:  # loaddata
+        return
+    search_index.reindex_related(instance)
+
+
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=Work)
+@receiver(post_delete, sender=Volume)
+@receiver(post_delete, sender=BookSet)
+def remove_from_index(sender, instance, **kwargs):
+    entity_type = sender.__name__.lower()
+    pk = instance.pk
+    transaction.on_commit(lambda: search_index.remove_entity(entity_type, pk))
+
+    # a deleted volume drops out of its set's document
+    if sender is Volume and instance.book_set_id:
+        book_set_id = instance.book_set_id
+        transaction.on_commit(
+            lambda: search_index.index_entities("bookset", [book_set_id]))
+
+
+@receiver(post_save, sender=AuthorAlias)
+@receiver(post_delete, sender=AuthorAlias)
+def reindex_alias_author(sender, instance, **kwargs):
+    author_id = instance.author_id
+    transaction.on_commit(
+        lambda: search_index.index_entities("author", [author_id]))
+
+
+@receiver(post_save, sender=Genre)
+def reindex_genre_works(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    work_ids = list(instance.works.values_list("pk", flat=True))
+    volume_ids = list(
+        Volume.objects.filter(works__in=work_ids).values_list("pk", flat=True))
+
+    def _run():
+        search_index.index_entities("work", work_ids)
+        search_index.index_entities("volume", volume_ids)
+
+    transaction.on_commit(_run)
+
+
+@receiver(m2m_changed, sender=Volume.works.through)
+@receiver(m2m_changed, sender=Work.genre.through)
+def reindex_on_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        search_index.reindex_related(instance)
+        return
+
+    # reverse side: e.g. work.volumes.add(...) / genre.works.add(...)
+    model = kwargs["model"]
+    for obj in model.objects.filter(pk__in=pk_set or []):
+        search_index.reindex_related(obj)
+
+
+# ---- Fuzzy matcher index (resolve_author / resolve_work) ---
+
+@receiver(post_save, sender=Author)
+def matcher_author_saved(sender, instance, **kwargs):
+    author_id, match_name = instance.pk, instance.match_name
+    transaction.on_commit(lambda: matcher_index.apply_change(
+        lambda idx: idx.add_author(author_id, match_name)))
+
+
+@receiver(post_delete, sender=Author)
+def matcher_author_deleted(sender, instance, **kwargs):
+    author_id = instance.pk
+    transaction.on_commit(lambda: matcher_index.apply_change(
+        lambda idx: idx.remove_author(author_id)))
+
+
+@receiver(post_save, sender=AuthorAlias)
+@receiver(post_delete, sender=AuthorAlias)
+def matcher_alias_changed(sender, instance, **kwargs):
+    author_id = instance.author_id
+
+    def _run():
+        aliases = list(AuthorAlias.objects.filter(author_id=author_id)
+                       .values_list("alias", flat=True))
+        matcher_index.apply_change(
+            lambda idx: idx.set_aliases(author_id, aliases))
+
+    transaction.on_commit(_run)
+
+
+@receiver(post_save, sender=Work)
+def matcher_work_saved(sender, instance, **kwargs):
+    work_id, title = instance.pk, instance.title
+    transaction.on_commit(lambda: matcher_index.apply_change(
+        lambda idx: idx.add_work(work_id, title)))
+
+
+@receiver(post_delete, sender=Work)
+def matcher_work_deleted(sender, instance, **kwargs):
+    work_id = instance.pk
+    transaction.on_commit(lambda: matcher_index.apply_change(
+        lambda idx: idx.remove_work(work_id)))
+
+
+# ---- Library stats snapshot (catalog/services/stats.py) ----
+
+@receiver(pre_save, sender=Volume)
+def stats_volume_remember_price(sender, instance, raw=False, **kwargs):
+    if raw or not instance.pk:
+        return
+    instance._stats_old = (
+        Volume.objects.filter(pk=instance.pk)
+        .values_list("price", "title").first()
+    )
+
+
+@receiver(post_save, sender=Volume)
+def stats_volume_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        stats.adjust({"volumes": {"total_volumes": 1}, "counts": {"volume_count": 1}})
+    old_price, old_title = getattr(instance, "_stats_old", None) or (None, None)
+    # the title is only stored for the most expensive volumes
+    if instance.price != old_price or (instance.price and instance.title != old_title):
+        stats.price_changed(instance.pk, instance.title, old_price, instance.price)
+
+
+@receiver(pre_delete, sender=Volume)
+def stats_volume_deleted(sender, instance, **kwargs):
+    # pre_delete: the works/bookshelves links are gone by post_delete
+    author_ids = set(instance.works.values_list("author_id", flat=True))
+    stats.adjust({"volumes": {"total_volumes": -1}, "counts": {"volume_count": -1}})
+    stats.price_changed(instance.pk, instance.title, instance.price, None)
+    stats.invalidate("bookshelves", author_ids=author_ids)
+
+
+@receiver(m2m_changed, sender=Volume.works.through)
+def stats_volume_works_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        # pk_set is None for clear(); remember whose counts are about to drop
+        if reverse:
+            instance._stats_author_ids = {instance.author_id}
+        else:
+            instance._stats_author_ids = set(
+                instance.works.values_list("author_id", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if action == "post_clear":
+        author_ids = getattr(instance, "_stats_author_ids", set())
+    elif reverse:  # work.volumes.add(...)
+        author_ids = {instance.author_id}
+    else:
+        author_ids = set(Work.objects.filter(pk__in=pk_set)
+                         .values_list("author_id", flat=True))
+    stats.invalidate(author_ids=author_ids)
+
+
+@receiver(m2m_changed, sender=Volume.bookshelves.through)
+def stats_bookshelves_changed(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        stats.invalidate("bookshelves")
+
+
+@receiver(m2m_changed, sender=Work.collections.through)
+def stats_collections_changed(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        stats.invalidate("collections")
+
+
+@receiver(pre_save, sender=Work)
+def stats_work_remember_author(sender, instance, raw=False, **kwargs):
+    if raw or not instance.pk:
+        return
+    instance._stats_old_author_id = (
+        Work.objects.filter(pk=instance.pk)
+        .values_list("author_id", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Work)
+def stats_work_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    author_ids = {instance.author_id, getattr(instance, "_stats_old_author_id", None)}
+    if created:
+        stats.adjust({"works": {"total_works": 1}, "counts": {"work_count": 1}})
+        stats.invalidate(author_ids=author_ids)
+    elif len(author_ids - {None}) > 1:  # moved to another author
+        stats.invalidate(author_ids=author_ids)
+
+
+@receiver(post_delete, sender=Work)
+def stats_work_deleted(sender, instance, **kwargs):
+    stats.adjust({"works": {"total_works": -1}, "counts": {"work_count": -1}})
+    stats.invalidate("collections", author_ids={instance.author_id})
+
+
+@receiver(pre_save, sender=Author)
+def stats_author_remember_name(sender, instance, raw=False, **kwargs):
+    if raw or not instance.pk:
+        return
+    instance._stats_old_name = (
+        Author.objects.filter(pk=instance.pk)
+        .values_list("full_name", "slug").first()
+    )
+
+
+@receiver(post_save, sender=Author)
+def stats_author_saved(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        stats.adjust({"counts": {"author_count": 1}})
+    # the lists only show the name and slug; counts change via works/volumes
+    if getattr(instance, "_stats_old_name", None) != (instance.full_name, instance.slug):
+        stats.invalidate(author_ids={instance.pk})
+
+
+@receiver(post_delete, sender=Author)
+def stats_author_deleted(sender, instance, **kwargs):
+    stats.adjust({"counts": {"author_count": -1}})
+    stats.invalidate(author_ids={instance.pk})
+
+
+@receiver(post_save, sender=BookSet)
+def stats_bookset_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        stats.adjust({"counts": {"set_count": 1}})
+
+
+@receiver(post_delete, sender=BookSet)
+def stats_bookset_deleted(sender, instance, **kwargs):
+    stats.adjust({"counts": {"set_count": -1}})
+
+
+@receiver(post_save, sender=Bookshelf)
+@receiver(post_delete, sender=Bookshelf)
+def stats_bookshelf_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        stats.invalidate("bookshelves")
+
+
+@receiver(post_save, sender=Collection)
+@receiver(post_delete, sender=Collection)
+def stats_collection_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        stats.invalidate("collections")
+
+
+# ---- Volume card cache (catalog/services/cards.py) --------
+
+@receiver(post_save, sender=Volume)
+def cards_volume_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    cards.bump([instance.pk])
+    instance.card_version += 1
+
+
+@receiver(post_save, sender=VolumeImage)
+@receiver(post_delete, sender=VolumeImage)
+def cards_image_changed(sender, instance, raw=False, **kwargs):
+    # a new cover is set on the volume (and saved) separately; this covers
+    # re-uploads and deletes of the image that is already the cover
+    if not raw and instance.volume_id:
+        cards.bump(Volume.objects.filter(pk=instance.volume_id,
+                                         cover_image_id=instance.pk))
+
+
+@receiver(post_save, sender=Work)
+@receiver(pre_delete, sender=Work)
+def cards_work_changed(sender, instance, raw=False, **kwargs):
+    if raw or kwargs.get("created"):
+        return
+    cards.bump(Volume.objects.filter(
+        Q(works=instance.pk) | Q(primary_work=instance.pk)))
+
+
+@receiver(post_save, sender=Author)
+@receiver(pre_delete, sender=Author)
+def cards_author_changed(sender, instance, raw=False, **kwargs):
+    if raw or kwargs.get("created"):
+        return
+    cards.bump(Volume.objects.filter(works__author=instance.pk))
+
+
+@receiver(m2m_changed, sender=Volume.works.through)
+def cards_volume_works_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:  # volume.works.add(...)
+        if action in ("post_add", "post_remove", "post_clear"):
+            cards.bump([instance.pk])
+            instance.card_version += 1
+        return
+    # work.volumes.add(...): the volumes are in pk_set, except for clear()
+    if action == "pre_clear":
+        instance._cards_volume_ids = list(instance.volumes.values_list("pk", flat=True))
+    elif action == "post_clear":
+        cards.bump(getattr(instance, "_cards_volume_ids", []))
+    elif action in ("post_add", "post_remove"):
+        cards.bump(pk_set or [])
+
+
+# ---- Author <-> volume index (catalog/services/author_volumes.py) ----
+
+@receiver(m2m_changed, sender=Volume.works.through)
+def author_volumes_works_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:  # volume.works.add(...)
+        if action in ("post_add", "post_remove", "post_clear"):
+            author_volumes.sync_volumes([instance.pk])
+        return
+    if action == "pre_clear":
+        instance._author_volume_ids = list(instance.volumes.values_list("pk", flat=True))
+    elif action == "post_clear":
+        author_volumes.sync_volumes(getattr(instance, "_author_volume_ids", []))
+    elif action in ("post_add", "post_remove"):
+        author_volumes.sync_volumes(pk_set or [])
+
+
+@receiver(post_save, sender=Work)
+def author_volumes_work_saved(sender, instance, created, raw=False, **kwargs):
+    # a new work has no volumes yet; an old one may have changed author
+    if not raw and not created:
+        author_volumes.sync_volumes(instance.volumes.values_list("pk", flat=True))
+
+
+@receiver(pre_delete, sender=Work)
+def author_volumes_work_deleting(sender, instance, **kwargs):
+    # the through rows go without an m2m_changed signal
+    instance._author_volume_ids = list(instance.volumes.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Work)
+def author_volumes_work_deleted(sender, instance, **kwargs):
+    author_volumes.sync_volumes(getattr(instance, "_author_volume_ids", []))
+
+
+@receiver(post_save, sender=Volume)
+def author_volumes_volume_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw and not created:
+        author_volumes.volume_saved(instance)
+
+
+@receiver(pre_delete, sender=Volume)
+def author_volumes_volume_deleting(sender, instance, **kwargs):
+    instance._author_ids = list(instance.author_links.values_list("author_id", flat=True))
+
+
+@receiver(post_delete, sender=Volume)
+def author_volumes_volume_deleted(sender, instance, **kwargs):
+    author_volumes.refresh_authors(getattr(instance, "_author_ids", []))
+
+
+# ---- Dashboard spotlight (catalog/services/spotlight.py) --
+
+@receiver(post_save, sender=Volume)
+@receiver(post_delete, sender=Volume)
+@receiver(post_delete, sender=VolumeImage)  # may have been a cover
+def spotlight_volume_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(spotlight.invalidate)
+
+
+# ---- BookSet list summary (catalog/services/bookset_summary.py) ----
+
+@receiver(pre_save, sender=Volume)
+def bookset_summary_remember_set(sender, instance, raw=False, **kwargs):
+    if raw or not instance.pk:
+        return
+    instance._summary_old_set = (
+        Volume.objects.filter(pk=instance.pk)
+        .values_list("book_set_id", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Volume)
+def bookset_summary_volume_saved(sender, instance, raw=False, **kwargs):
+    # number, title, primary work or the set itself may have changed
+    if not raw:
+        bookset_summary.refresh({instance.book_set_id,
+                                 getattr(instance, "_summary_old_set", None)})
+
+
+@receiver(post_delete, sender=Volume)
+def bookset_summary_volume_deleted(sender, instance, **kwargs):
+    bookset_summary.refresh([instance.book_set_id])
+
+
+@receiver(m2m_changed, sender=Volume.works.through)
+def bookset_summary_works_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            bookset_summary.refresh([instance.book_set_id])
+        return
+    # work.volumes.add(...): the volumes are in pk_set, except for clear()
+    if action == "pre_clear":
+        instance._summary_volume_ids = list(instance.volumes.values_list("pk", flat=True))
+    elif action == "post_clear":
+        bookset_summary.refresh_for_volumes(getattr(instance, "_summary_volume_ids", []))
+    elif action in ("post_add", "post_remove"):
+        bookset_summary.refresh_for_volumes(pk_set or [])
+
+
+@receiver(post_save, sender=Work)
+def bookset_summary_work_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw and not created:
+        bookset_summary.refresh_for_work(instance)
+
+
+@receiver(pre_delete, sender=Work)
+def bookset_summary_work_deleting(sender, instance, **kwargs):
+    instance._summary_set_ids = list(
+        Volume.objects.filter(Q(works=instance) | Q(primary_work=instance),
+                              book_set__isnull=False)
+        .values_list("book_set_id", flat=True).distinct())
+
+
+@receiver(post_delete, sender=Work)
+def bookset_summary_work_deleted(sender, instance, **kwargs):
+    bookset_summary.refresh(getattr(instance, "_summary_set_ids", []))
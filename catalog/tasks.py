@@ -0,0 +1,82 @@
+# catalog/tasks.py
+"""
+Catalog work that used to block requests, run by `manage.py run_worker`
+(jobs/queue.py): Google lookups and downloads, Pillow encoding and storage
+deletes. Network errors propagate so the queue retries with backoff.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+
+from catalog.integrations.google_books_provider import GoogleBooksProvider
+from catalog.models import BookSet, Bookshelf, Volume, VolumeImage
+from catalog.services import bulk_import, image_variants, images
+from catalog.services.covers_google import attach_cover, download_cover
+from catalog.utils.images.images import process_bytes
+from jobs.queue import task
+
+
+@task("catalog.cache_google_cover", priority=10)
+def cache_google_cover(volume_id):
+    """Store a volume's stock cover_url as its cover image."""
+    volume = Volume.objects.filter(pk=volume_id).only(
+        "id", "cover_url", "cover_image").first()
+    if volume is None or volume.cover_image_id or not volume.cover_url:
+        return
+    data = download_cover(volume)
+    if data is not None:
+        attach_cover(volume, *process_bytes(data))
+
+
+@task("catalog.lookup_bookset_cover", priority=5)
+def lookup_bookset_cover(bookset_id):
+    """Fill in a set's cover_url from Google Books by its ISBN."""
+    book_set = BookSet.objects.filter(pk=bookset_id).only(
+        "id", "cover_url", "isbn13", "isbn10").first()
+    if book_set is None or book_set.cover_url:
+        return
+    isbn = book_set.isbn13 or book_set.isbn10
+    if not isbn:
+        return
+    try:
+        book = GoogleBooksProvider.lookup(isbn)
+    except LookupError:
+        return  # Google doesn't know the ISBN; not worth a retry
+    if book.get("cover_url"):
+        # update(): nothing that BookSet's signals maintain depends on it
+        (BookSet.objects.filter(pk=bookset_id)
+         .filter(Q(cover_url="") | Q(cover_url__isnull=True))
+         .update(cover_url=book["cover_url"]))
+
+
+# not retried: a rerun would report this run's volumes as already held
+@task("catalog.import_isbns", max_attempts=1)
+def import_isbns(text, report_key, dry_run=False, bookshelf_id=None):
+    """An ISBN upload too big to import in the request (isbn_import_view)."""
+    bookshelf = Bookshelf.objects.filter(pk=bookshelf_id).first() if bookshelf_id else None
+    rows = bulk_import.import_isbns(
+        text,
+        workers=settings.ISBN_IMPORT_WORKERS,
+        rate=settings.ISBN_IMPORT_RATE,
+        dry_run=dry_run,
+        bookshelf=bookshelf,
+    )
+    bulk_import.save_report(report_key, rows)
+
+
+@task("catalog.generate_image_derivatives", priority=5)
+def generate_image_derivatives(image_ids):
+    images.generate_derivatives(image_ids)
+
+
+@task("catalog.delete_image_files", max_attempts=3)
+def delete_image_files(files):
+    """``files``: [field_name, file_name] pairs of a deleted VolumeImage."""
+    for field_name, name in files:
+        VolumeImage._meta.get_field(field_name).storage.delete(name)
+
+
+@task("catalog.prune_image_cache", every=timedelta(hours=1))
+def prune_image_cache():
+    image_variants.prune()
@@ -0,0 +1,33 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from catalog.models import Bookshelf, Volume
+
+
+class AdminBulkActionTest(TestCase):
+    def setUp(self):
+        self.client.force_login(get_user_model().objects.create_superuser(
+            "admin", "admin@example.com", "x"))
+
+    def test_add_to_bookshelf_inserts_missing_links_only(self):
+        shelf = Bookshelf.objects.create(name="Victorian")
+        volumes = [Volume.objects.create(title=f"Volume {n}") for n in range(3)]
+        volumes[0].bookshelves.add(shelf)
+
+        response = self.client.post(reverse("admin:catalog_volume_changelist"), {
+            "action": "add_to_bookshelf_bulk",
+            "_selected_action": [v.pk for v in volumes],
+            "bookshelf": shelf.pk,
+            "apply": "1",
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(shelf.volumes.count(), 3)
+
+    def test_changelist_defers_large_columns(self):
+        Volume.objects.create(title="Bleak House", description="x" * 5000,
+                              volume_json={"big": "y" * 5000})
+        response = self.client.get(reverse("admin:catalog_volume_changelist"))
+        self.assertContains(response, "Bleak House")
+        volume = response.context["cl"].result_list[0]
+        self.assertLessEqual({"description", "volume_json"}, volume.get_deferred_fields())
@@ -0,0 +1,186 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.signing import BadSignature
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from catalog.models import Volume, VolumeImage
+from catalog.services import direct_uploads, image_variants
+from catalog.utils.images.images import process_bytes, process_many
+
+
+def _jpeg_bytes(size=(2400, 3600)):
+    buf = BytesIO()
+    Image.new("RGB", size, (120, 30, 30)).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+@override_settings(IMAGE_PROCESS_WORKERS=-1)
+class ImagePipelineTest(SimpleTestCase):
+    def test_progressive_variants_have_expected_widths(self):
+        base, thumb, display, detail = process_bytes(_jpeg_bytes())
+        widths = [Image.open(BytesIO(b)).size[0] for b in (thumb, display, detail)]
+        self.assertEqual(widths, [240, 900, 1800])
+        self.assertEqual(Image.open(BytesIO(thumb)).format, "WEBP")
+
+    def test_small_images_are_not_upscaled(self):
+        _, thumb, display, detail = process_bytes(_jpeg_bytes((200, 300)))
+        self.assertEqual(Image.open(BytesIO(detail)).size, (200, 300))
+
+    def test_process_many_keeps_input_order(self):
+        results = process_many([_jpeg_bytes((1000, 500)), _jpeg_bytes((500, 1000))])
+        heights = [Image.open(BytesIO(r[3])).size[1] for r in results]
+        self.assertEqual(heights, [500, 1000])
+
+
+class ImageVariantViewTest(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media,
+                                              IMAGE_VARIANT_CACHE_DIR="")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        volume = Volume.objects.create(title="Variant Test")
+        self.image = VolumeImage(volume=volume)
+        self.image.original.save("orig", ContentFile(_jpeg_bytes((1200, 1600))),
+                                 save=False)
+        self.image.save()
+
+    def test_variant_is_rendered_once_then_served_with_etag(self):
+        url = self.image.thumb_url
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/webp")
+        self.assertIn("immutable", response["Cache-Control"])
+        body = b"".join(response.streaming_content)
+        self.assertEqual(Image.open(BytesIO(body)).size[0], 240)
+
+        etag = response["ETag"]
+        with self.assertNumQueries(0):  # cache hit never touches the DB
+            again = self.client.get(url)
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(again["ETag"], etag)
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_unknown_width_or_stale_version_is_404(self):
+        self.assertEqual(self.client.get(
+            self.image.variant_url(241)).status_code, 404)
+        stale = self.image.thumb_url.replace(
+            image_variants.source_version(self.image.original.name), "0" * 16)
+        self.assertEqual(self.client.get(stale).status_code, 404)
+
+    def test_prune_evicts_least_recently_used(self):
+        self.client.get(self.image.thumb_url)
+        self.client.get(self.image.display_url)
+        thumb_key = image_variants.variant_key(
+            "volume", self.image.pk,
+            image_variants.source_version(self.image.original.name),
+            240, "webp", 85)
+        thumb_path = image_variants.variant_path(thumb_key, "webp")
+        os.utime(thumb_path, (0, 0))  # make the thumb the oldest
+
+        others = sum(p.stat().st_size
+                     for p in image_variants.cache_root().rglob("*.webp")
+                     if p != thumb_path)
+        files, _ = image_variants.prune(limit=others, low_water=1.0)
+        self.assertEqual(files, 1)
+        self.assertFalse(thumb_path.exists())
+
+
+class MediaServingTest(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        (self.root / "images").mkdir()
+        (self.root / "images" / "0123456789ab_thumb.webp").write_bytes(b"0123456789")
+        (self.root / "images" / "notes.txt").write_bytes(b"plain")
+        media_root = override_settings(MEDIA_ROOT=self.root, MEDIA_ACCEL="")
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+
+    def url(self, path):
+        return reverse("media", kwargs={"path": path})
+
+    def test_content_addressed_files_are_immutable_and_revalidate(self):
+        response = self.client.get(self.url("images/0123456789ab_thumb.webp"))
+        self.assertEqual(b"".join(response.streaming_content), b"0123456789")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(response["Content-Type"], "image/webp")
+
+        again = self.client.get(self.url("images/0123456789ab_thumb.webp"),
+                                HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+        other = self.client.get(self.url("images/notes.txt"))
+        self.assertNotIn("immutable", other["Cache-Control"])
+
+    def test_range_and_missing_files(self):
+        response = self.client.get(self.url("images/0123456789ab_thumb.webp"),
+                                   HTTP_RANGE="bytes=2-4")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), b"234")
+        self.assertEqual(response["Content-Range"], "bytes 2-4/10")
+
+        response = self.client.get(self.url("images/0123456789ab_thumb.webp"),
+                                   HTTP_RANGE="bytes=20-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(self.client.get(self.url("images/nope.webp")).status_code, 404)
+        self.assertEqual(self.client.get(self.url("../settings.py")).status_code, 404)
+
+    @override_settings(MEDIA_ACCEL="nginx")
+    def test_proxy_offload(self):
+        response = self.client.get(self.url("images/notes.txt"))
+        self.assertEqual(response["X-Accel-Redirect"], "/protected-media/images/notes.txt")
+
+
+class DirectUploadTest(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        media_root = override_settings(MEDIA_ROOT=tmp.name, IMAGE_LAZY_DERIVATIVES=True)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+        self.volume = Volume.objects.create(title="Uploaded")
+
+    def test_confirm_attaches_stored_objects(self):
+        name = direct_uploads.new_name(self.volume)
+        default_storage.save(name, ContentFile(b"image bytes"))
+        token = direct_uploads.sign(self.volume, name)
+
+        [image] = direct_uploads.confirm(self.volume, [token])
+        self.assertEqual((image.volume_id, image.original.name), (self.volume.pk, name))
+
+        other = Volume.objects.create(title="Other")
+        with self.assertRaises(BadSignature):
+            direct_uploads.confirm(other, [token])
+        missing = direct_uploads.sign(self.volume, direct_uploads.new_name(self.volume))
+        with self.assertRaises(ValueError):
+            direct_uploads.confirm(self.volume, [missing])
+
+    def test_replayed_confirm_attaches_nothing(self):
+        name = direct_uploads.new_name(self.volume)
+        default_storage.save(name, ContentFile(b"image bytes"))
+        token = direct_uploads.sign(self.volume, name)
+
+        self.assertEqual(len(direct_uploads.confirm(self.volume, [token, token])), 1)
+        self.assertEqual(direct_uploads.confirm(self.volume, [token]), [])
+        self.assertEqual(VolumeImage.objects.filter(original=name).count(), 1)
+
+    def test_endpoints_need_bucket_storage(self):
+        user = get_user_model().objects.create_user("uploader", password="x")
+        self.client.force_login(user)
+        response = self.client.post(
+            reverse("volume_image_presign", args=[self.volume.pk]),
+            {"content_type": "image/jpeg"})
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,133 @@
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from catalog.integrations.google_books_provider import GoogleBooksProvider
+from catalog.models import Author, Volume, Work
+from catalog.services import bulk_import, matcher_index, search_index
+
+
+@override_settings(CACHES={
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "google_books": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "google-books-tests",
+    },
+})
+class GoogleBooksProviderCacheTest(SimpleTestCase):
+    def setUp(self):
+        caches["google_books"].clear()
+
+    def _response(self, payload):
+        response = MagicMock()
+        response.json.return_value = payload
+        return response
+
+    @patch.object(GoogleBooksProvider, "session")
+    def test_hit_is_served_from_cache_for_isbn10_and_13(self, session):
+        session.return_value.get.return_value = self._response({
+            "totalItems": 1,
+            "items": [{"volumeInfo": {"title": "The Hobbit"}}],
+        })
+
+        first = GoogleBooksProvider.lookup("978-0-395-25730-2")
+        second = GoogleBooksProvider.lookup("0395257301")
+
+        self.assertEqual(first["title"], "The Hobbit")
+        self.assertEqual(second, first)
+        session.return_value.get.assert_called_once()
+
+    @patch.object(GoogleBooksProvider, "session")
+    def test_negative_result_is_cached(self, session):
+        session.return_value.get.return_value = self._response(
+            {"totalItems": 0})
+
+        for _ in range(2):
+            with self.assertRaises(LookupError):
+                GoogleBooksProvider.lookup("9780000000002")
+
+        session.return_value.get.assert_called_once()
+
+
+class ParseISBNsTest(SimpleTestCase):
+    def test_plain_lines_and_separators(self):
+        rows = bulk_import.parse_isbns("9780395257302\n0-395-25730-1, 12345\n\n")
+        self.assertEqual([(r.line, r.raw) for r in rows],
+                         [(1, "9780395257302"), (2, "0-395-25730-1"),
+                          (2, "12345")])
+
+    def test_csv_reads_only_isbn_column(self):
+        rows = bulk_import.parse_isbns(
+            "Title,ISBN,Pages\nThe Hobbit,978-0-395-25730-2,310000\n")
+        self.assertEqual([(r.line, r.raw) for r in rows],
+                         [(2, "978-0-395-25730-2")])
+
+    def test_normalize_validates_checksum(self):
+        good = bulk_import.ImportRow(line=1, raw="0395257301")
+        bad = bulk_import.ImportRow(line=2, raw="9780395257303")
+        bulk_import.normalize(good)
+        bulk_import.normalize(bad)
+        self.assertEqual(good.isbn13, "9780395257302")
+        self.assertEqual(bad.status, bulk_import.INVALID)
+
+
+@override_settings(CACHES={
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "google_books": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "bulk-import-tests",
+    },
+    "shared": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+               "LOCATION": "bulk-import-shared"},
+})
+class BulkImportTest(TestCase):
+    def setUp(self):
+        self.author = Author.objects.create(full_name="J. R. R. Tolkien")
+        self.work = Work.objects.create(title="The Hobbit", author=self.author)
+        matcher_index.invalidate()
+
+    def fake_lookup(self, isbn):
+        if isbn == "9780395257302":
+            return {"title": "The Hobbit", "author": "J.R.R. Tolkien",
+                    "published_date": "1978", "isbn_13": isbn}
+        raise LookupError("No results found")
+
+    def test_import_creates_volumes_and_reports_each_row(self):
+        text = "9780395257302\n0395257301\n12345\n9780000000002\n"
+        with self.captureOnCommitCallbacks(execute=True):
+            rows = bulk_import.import_isbns(text, workers=2, rate=100,
+                                            lookup=self.fake_lookup)
+
+        self.assertEqual([r.status for r in rows],
+                         [bulk_import.CREATED, bulk_import.DUPLICATE,
+                          bulk_import.INVALID, bulk_import.NOT_FOUND])
+        volume = Volume.objects.get(pk=rows[0].volume_id)
+        self.assertEqual(volume.slug, "the-hobbit")
+        self.assertEqual(volume.isbn10, "0395257301")
+        self.assertEqual(volume.publication_year, 1978)
+        self.assertEqual(list(volume.works.all()), [self.work])
+        self.assertEqual(volume.primary_work, self.work)
+        self.assertEqual(search_index.search("hobbit", "volume")[0].entity_id,
+                         volume.pk)
+
+        again = bulk_import.import_isbns("978-0-395-25730-2",
+                                         lookup=self.fake_lookup)
+        self.assertEqual(again[0].status, bulk_import.EXISTS)
+        self.assertEqual(Volume.objects.count(), 1)
+
+    @override_settings(ISBN_IMPORT_INLINE_ROWS=1, JOBS_EAGER=True)
+    def test_large_upload_is_queued_and_reported(self):
+        self.client.force_login(get_user_model().objects.create_user("importer", password="x"))
+        with patch("catalog.services.bulk_import.GoogleBooksProvider.lookup",
+                   side_effect=self.fake_lookup):
+            response = self.client.post(reverse("isbn_import"),
+                                        {"isbns": "9780395257302\n9780000000002"})
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("?report=", response.url)
+
+        response = self.client.get(response.url)
+        self.assertEqual([r.status for r in response.context["rows"]],
+                         [bulk_import.CREATED, bulk_import.NOT_FOUND])
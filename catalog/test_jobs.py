@@ -0,0 +1,31 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from catalog.integrations.google_books_provider import GoogleBooksProvider
+from catalog.models import BookSet, Volume, VolumeImage
+from jobs.models import Job
+from jobs.worker import Worker
+
+
+class BackgroundJobsTest(TestCase):
+    @patch.object(GoogleBooksProvider, "lookup",
+                  return_value={"cover_url": "https://example.com/set.jpg"})
+    def test_bookset_cover_lookup_is_queued(self, lookup):
+        book_set = BookSet.objects.create(title="Boxed Tolkien", isbn13="9780395257302")
+        lookup.assert_not_called()
+        self.assertTrue(Job.objects.filter(name="catalog.lookup_bookset_cover").exists())
+
+        Worker().run(burst=True)
+        book_set.refresh_from_db()
+        self.assertEqual(book_set.cover_url, "https://example.com/set.jpg")
+
+    def test_image_files_are_deleted_by_the_worker(self):
+        volume = Volume.objects.create(title="Pictured")
+        image = VolumeImage.objects.create(volume=volume, original="volumes/x.jpg")
+        with patch.object(VolumeImage._meta.get_field("original").storage,
+                          "delete") as delete:
+            image.delete()
+            delete.assert_not_called()
+            Worker().run(burst=True)
+        delete.assert_called_once_with("volumes/x.jpg")
@@ -0,0 +1,149 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from catalog.models import Author, AuthorVolume, BookSet, Collection, Volume, Work
+from catalog.services import author_volumes, bookset_summary
+from catalog.utils import markdown_render, slugs
+
+
+class SlugAllocationTest(TestCase):
+    def test_collisions_resolved_in_one_query(self):
+        author = Author.objects.create(full_name="Emily Dickinson")
+        for _ in range(3):
+            Work.objects.create(title="Poems", author=author)
+        Work.objects.create(title="Poems and Songs", author=author)
+        with self.assertNumQueries(1):
+            slug = slugs.allocate_slug(Work, "Poems")
+        self.assertEqual(slug, "poems-3")
+
+    def test_bulk_assignment_is_unique_within_the_batch(self):
+        Volume.objects.create(title="Emma")
+        batch = [Volume(title="Emma"), Volume(title="Emma"), Volume(title="Persuasion")]
+        with self.assertNumQueries(1):
+            slugs.assign_slugs(batch, "title")
+        self.assertEqual([v.slug for v in batch], ["emma-1", "emma-2", "persuasion"])
+
+    def test_save_retries_when_a_concurrent_writer_took_the_slug(self):
+        Collection.objects.create(name="Poetry")
+        real_taken = slugs._taken
+        calls = []
+
+        def stale_then_real(*args, **kwargs):
+            # first scan misses the row, as if it was inserted just after
+            calls.append(1)
+            return set() if len(calls) == 1 else real_taken(*args, **kwargs)
+
+        late = Collection(name="Poetry!")
+        with patch("catalog.utils.slugs._taken", side_effect=stale_then_real):
+            late.save()
+        self.assertEqual(late.slug, "poetry-1")
+        self.assertEqual(len(calls), 2)
+
+
+class RenderedMarkdownTest(TestCase):
+    def test_html_is_stored_on_save_and_read_without_rendering(self):
+        author = Author.objects.create(full_name="Mary Shelley", bio="*Frankenstein*")
+        fresh = Author.objects.get(pk=author.pk)
+        with patch.object(markdown_render, "render") as render, \
+                self.assertNumQueries(0):
+            html = fresh.bio_html
+        render.assert_not_called()
+        self.assertIn("<em>Frankenstein</em>", html)
+
+    def test_stale_html_is_rerendered_in_memory_without_writing(self):
+        author = Author.objects.create(full_name="Mary Shelley", bio="old")
+        Author.objects.filter(pk=author.pk).update(bio="**new**")
+        fresh = Author.objects.get(pk=author.pk)
+        with self.assertNumQueries(0):
+            self.assertIn("<strong>new</strong>", fresh.bio_html)
+        stored = Author.objects.get(pk=author.pk).rendered_markdown["bio"]
+        self.assertNotIn("<strong>new</strong>", stored["html"])
+
+        fresh.save()
+        stored = Author.objects.get(pk=author.pk).rendered_markdown["bio"]
+        self.assertIn("<strong>new</strong>", stored["html"])
+
+    def test_prerender_command_fills_missing_rows(self):
+        author = Author.objects.create(full_name="Mary Shelley", bio="_x_")
+        Author.objects.filter(pk=author.pk).update(rendered_markdown={})
+        call_command("prerender_markdown", stdout=StringIO())
+        stored = Author.objects.get(pk=author.pk).rendered_markdown
+        self.assertIn("<em>x</em>", stored["bio"]["html"])
+
+
+class AuthorVolumeIndexTest(TestCase):
+    def test_index_follows_work_and_volume_changes(self):
+        author = Author.objects.create(full_name="Jane Austen")
+        emma = Work.objects.create(title="Emma", author=author)
+        persuasion = Work.objects.create(title="Persuasion", author=author)
+        volume = Volume.objects.create(title="Two Novels",
+                                       cover_url="https://example.com/c.jpg")
+        volume.works.add(emma, persuasion)
+
+        link = AuthorVolume.objects.get()
+        self.assertEqual((link.author_id, link.volume_id, link.work_count),
+                         (author.pk, volume.pk, 2))
+        author.save()  # a stale in-memory volume_count must not be written back
+        author.refresh_from_db()
+        self.assertEqual((author.volume_count, author.cover_volume_id), (1, volume.pk))
+
+        persuasion.delete()
+        self.assertEqual(AuthorVolume.objects.get().work_count, 1)
+
+        volume.delete()
+        author.refresh_from_db()
+        self.assertEqual((author.volume_count, author.cover_volume_id), (0, None))
+        self.assertEqual(author_volumes.rebuild(), 0)
+
+    def test_author_list_reads_volumes_from_the_index(self):
+        for i in range(3):
+            author = Author.objects.create(full_name=f"Author Number{i}")
+            work = Work.objects.create(title=f"Work {i}", author=author)
+            Volume.objects.create(title=f"Volume {i}").works.add(work)
+        response = self.client.get(reverse("author_list"))
+        self.assertEqual(
+            [len(a.unique_volumes) for a in response.context["authors_display"]],
+            [1, 1, 1])
+
+
+class BookSetSummaryTest(TestCase):
+    def test_summary_follows_volumes_and_works(self):
+        author = Author.objects.create(full_name="Leo Tolstoy")
+        other = Author.objects.create(full_name="Anton Chekhov")
+        work = Work.objects.create(title="War and Peace", author=author)
+        book_set = BookSet.objects.create(title="Collected Tolstoy")
+        second = Volume.objects.create(title="Volume Two", volume_number=2,
+                                       book_set=book_set)
+        first = Volume.objects.create(title="Volume One", volume_number=1,
+                                      book_set=book_set)
+        first.works.add(work)
+
+        book_set.save()  # stale in-memory summary fields must not be written back
+        book_set.refresh_from_db()
+        self.assertEqual((book_set.representative_author_id, book_set.volume_count,
+                          book_set.preview_volume_ids),
+                         (author.pk, 2, [first.pk, second.pk]))
+
+        work.author = other
+        work.save()
+        book_set.refresh_from_db()
+        self.assertEqual(book_set.author, other)
+
+        first.delete()
+        book_set.refresh_from_db()
+        self.assertEqual((book_set.author, book_set.volume_count,
+                          book_set.preview_volume_ids), ("", 1, [second.pk]))
+
+    def test_set_list_loads_previews_in_one_query(self):
+        for i in range(3):
+            book_set = BookSet.objects.create(title=f"Set {i}")
+            Volume.objects.create(title=f"Volume {i}", book_set=book_set)
+        sets = list(BookSet.objects.all())
+        with self.assertNumQueries(1):
+            bookset_summary.attach_previews(sets)
+        self.assertEqual([[v.title for v in s.preview_volumes] for s in sets],
+                         [["Volume 0"], ["Volume 1"], ["Volume 2"]])
@@ -0,0 +1,113 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from catalog.middleware import fingerprint
+from catalog.models import Author, Volume, Work
+from catalog.services import synthetic_catalog
+from catalog.utils import keyset
+
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self):
+        years = [1990, None, 1985, 1990, None, 2001, 1985]
+        self.volumes = [
+            Volume.objects.create(title=f"Book {i}", publication_year=year)
+            for i, year in enumerate(years)
+        ]
+
+    def walk(self, fields, descending, size=2):
+        qs = Volume.objects.all()
+        page = keyset.paginate(qs, fields, descending=descending, page_size=size)
+        pages = [page]
+        while page.has_next:
+            page = keyset.paginate(qs, fields, descending=descending,
+                                   page_size=size, cursor=page.next_cursor)
+            pages.append(page)
+        return pages
+
+    def test_pages_cover_every_row_once_with_nulls_last(self):
+        fields = ["publication_year", "sort_title", "id"]
+        for descending in (False, True):
+            ids = [v.pk for p in self.walk(fields, descending) for v in p]
+            present = sorted(
+                (v for v in self.volumes if v.publication_year is not None),
+                key=lambda v: (v.publication_year, v.sort_title, v.pk),
+                reverse=descending)
+            missing = sorted(
+                (v for v in self.volumes if v.publication_year is None),
+                key=lambda v: (v.sort_title, v.pk), reverse=descending)
+            self.assertEqual(ids, [v.pk for v in present + missing])
+
+    def test_before_cursor_returns_previous_page(self):
+        fields = ["publication_year", "sort_title", "id"]
+        pages = self.walk(fields, False, size=3)
+        back = keyset.paginate(Volume.objects.all(), fields, page_size=3,
+                               cursor=pages[1].prev_cursor,
+                               direction=keyset.PREV)
+        self.assertEqual([v.pk for v in back], [v.pk for v in pages[0]])
+        self.assertFalse(back.has_previous)
+
+    def test_cursor_from_another_sort_starts_over(self):
+        cursor = keyset.encode_cursor("title:asc", ["x", "x", 1])
+        self.assertIsNone(keyset.decode_cursor(cursor, "title:desc", 3))
+        self.assertIsNone(keyset.decode_cursor("not-a-cursor", "title:asc", 3))
+        self.assertEqual(keyset.decode_cursor(cursor, "title:asc", 3),
+                         ["x", "x", 1])
+
+
+class ExplainQueriesCommandTest(TestCase):
+    def test_reports_each_query_before_and_after(self):
+        Volume.objects.create(title="Middlemarch", isbn13="9780141439549")
+        out = StringIO()
+        call_command("explain_queries", repeat=1, stdout=out)
+        output = out.getvalue()
+        self.assertIn("Without indexes", output)
+        self.assertIn("volume_list sort=pub_year", output)
+        self.assertIn("volume_by_isbn13", output)
+        # the dropped indexes came back with the rollback
+        with connection.cursor() as cursor:
+            names = connection.introspection.get_constraints(
+                cursor, Volume._meta.db_table)
+        self.assertIn("volume_missing_cover_idx", names)
+
+
+class RequestMetricsMiddlewareTest(TestCase):
+    def test_fingerprint_collapses_literals(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id = 12 AND name = 'x' AND k IN (%s, %s)"),
+            fingerprint("SELECT * FROM t WHERE id = 7 AND name = 'yy' AND k IN (%s)"),
+        )
+
+    def test_server_timing_header_and_budget_warning(self):
+        for i in range(3):
+            Author.objects.create(full_name=f"Author {i}")
+        with self.settings(REQUEST_METRICS_BUDGETS={"author_list": 0}), \
+                self.assertLogs("catalog.metrics", "WARNING") as logs:
+            response = self.client.get(reverse("author_list"))
+        self.assertEqual(response.status_code, 200)
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn("tpl;dur=", timing)
+        self.assertIn("Query budget exceeded", logs.output[0])
+
+
+class SyntheticCatalogTest(TestCase):
+    def test_generate_tops_up_to_scale(self):
+        created = synthetic_catalog.generate(40, images=False)
+        self.assertEqual(created["volumes"], 40)
+        self.assertEqual(Volume.objects.filter(source="synthetic").count(), 40)
+        # every work has a volume, every author a work
+        self.assertFalse(Work.objects.filter(volumes__isnull=True).exists())
+        self.assertFalse(Author.objects.filter(works__isnull=True).exists())
+        self.assertEqual(Volume.objects.values("slug").distinct().count(), 40)
+
+        synthetic_catalog.generate(60, images=False)
+        self.assertEqual(Volume.objects.filter(source="synthetic").count(), 60)
+
+        synthetic_catalog.clear()
+        self.assertFalse(Volume.objects.exists())
+        self.assertFalse(Author.objects.exists())
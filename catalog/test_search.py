@@ -0,0 +1,134 @@
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from catalog.forms import VolumeForm
+from catalog.models import Author, BookSet, Volume, Work
+from catalog.services import autocomplete, search_index
+from catalog.services.matcher_index import MatcherIndex
+
+
+class SearchQueryBuildingTest(TestCase):
+    def test_fts_query_is_prefix_and(self):
+        self.assertEqual(search_index.build_fts_query("Tolk  lord!"),
+                         '"tolk"* "lord"*')
+
+    def test_tsquery_is_prefix_and(self):
+        self.assertEqual(search_index.build_tsquery("tolk lord"),
+                         "tolk:* & lord:*")
+
+    def test_quotes_and_operators_are_dropped(self):
+        self.assertEqual(search_index.build_fts_query('"NEAR( OR'),
+                         '"near"* "or"*')
+
+    def test_highlight_escapes_text(self):
+        html = search_index.highlight("<b>\x02Tolk\x03ien")
+        self.assertEqual(html, "&lt;b&gt;<mark>Tolk</mark>ien")
+
+
+class SearchIndexTest(TestCase):
+    def test_work_found_by_author_prefix(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            author = Author.objects.create(full_name="J. R. R. Tolkien")
+        with self.captureOnCommitCallbacks(execute=True):
+            work = Work.objects.create(title="The Silmarillion", author=author)
+
+        hits = search_index.search("tolk", "work")
+        self.assertEqual([h.entity_id for h in hits], [work.pk])
+
+        author_hits = search_index.search("tolkien", "author")
+        self.assertEqual([h.entity_id for h in author_hits], [author.pk])
+
+
+class SearchResultsViewTest(TestCase):
+    def test_work_and_set_hits_render_volume_counts(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            author = Author.objects.create(full_name="Frank Herbert")
+            work = Work.objects.create(title="Dune Messiah", author=author)
+            book_set = BookSet.objects.create(title="Dune Chronicles")
+        with self.captureOnCommitCallbacks(execute=True):
+            for n in (1, 2):
+                Volume.objects.create(title=f"Volume {n}",
+                                      book_set=book_set).works.add(work)
+
+        response = self.client.get(reverse("search_results"), {"q": "dune"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([w.num_volumes for w in response.context["works"]], [2])
+        self.assertEqual([bs.volume_count for bs in response.context["booksets"]], [2])
+        self.assertContains(response, "2 volumes", count=2)
+
+
+class MatcherIndexTest(SimpleTestCase):
+    def setUp(self):
+        self.index = MatcherIndex(
+            authors=[(1, "jrr tolkien"), (2, "f herbert"), (3, "c s lewis")],
+            aliases=[(3, "Clive Staples Lewis")],
+            works=[(10, "The Silmarillion"), (11, "Dune"),
+                   (12, "The Lord of the Rings")],
+        )
+
+    def test_best_work_tolerates_case_and_punctuation(self):
+        self.assertEqual(self.index.best_work("the lord of the rings!"), 12)
+
+    def test_best_work_falls_back_past_blocking(self):
+        # "Silmarilion" shares no token with "silmarillion"
+        self.assertEqual(self.index.best_work("Silmarilion"), 10)
+
+    def test_no_work_below_cutoff(self):
+        self.assertIsNone(self.index.best_work("Moby Dick"))
+
+    def test_match_works_returns_scored_top_k(self):
+        hits = self.index.match_works("Dune", limit=2)
+        self.assertEqual(hits[0][0], 11)
+        self.assertEqual(hits[0][1], 100)
+
+    def test_removed_work_is_not_matched(self):
+        self.index.remove_work(11)
+        self.assertIsNone(self.index.best_work("Dune"))
+
+    def test_edits_reuse_freed_slots(self):
+        size = len(self.index.works.keys)
+        for n in range(50):
+            self.index.add_work(11, f"Dune {n}")
+        self.assertEqual(len(self.index.works.keys), size)
+        self.assertEqual(self.index.best_work("Dune 49"), 11)
+
+    def test_best_author_via_alias(self):
+        self.assertEqual(self.index.best_author("Clive Staples Lewis"), 3)
+
+
+class AutocompleteTest(TestCase):
+    def test_prefix_suggestions(self):
+        author = Author.objects.create(full_name="Charles Dickens")
+        Author.objects.create(full_name="Emily Dickinson")
+        Author.objects.create(full_name="Jane Austen")
+        for title in ("The Pickwick Papers", "Bleak House", "Pictures from Italy"):
+            Work.objects.create(title=title, author=author)
+
+        # leading articles are ignored on both sides, as in sort_title
+        self.assertEqual([w.title for w in autocomplete.suggest("work", "The Pic")],
+                         ["The Pickwick Papers", "Pictures from Italy"])
+        self.assertEqual([a.full_name for a in autocomplete.suggest("author", "dick")],
+                         ["Charles Dickens", "Emily Dickinson"])
+        self.assertEqual(autocomplete.suggest("author", "  "), [])
+
+    def test_volume_form_renders_only_selected_relations(self):
+        author = Author.objects.create(full_name="Charles Dickens")
+        chosen = Work.objects.create(title="Bleak House", author=author)
+        Work.objects.create(title="Hard Times", author=author)
+
+        html = VolumeForm(initial={"works": [chosen.pk]}).as_p()
+        self.assertIn("Bleak House", html)
+        self.assertNotIn("Hard Times", html)
+        self.assertIn(reverse("autocomplete", args=["work"]), html)
+
+    def test_endpoint(self):
+        author = Author.objects.create(full_name="Charles Dickens")
+        work = Work.objects.create(title="Bleak House", author=author)
+        url = reverse("autocomplete", args=["work"])
+
+        self.assertEqual(self.client.get(url, {"q": "ble"}).status_code, 302)
+        self.client.force_login(get_user_model().objects.create_user("reader", password="x"))
+        response = self.client.get(url, {"q": "ble"})
+        self.assertContains(response, f'data-autocomplete-value="{work.pk}"')
+        self.assertEqual(self.client.get(reverse("autocomplete", args=["nope"])).status_code, 404)
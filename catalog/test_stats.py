@@ -0,0 +1,101 @@
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+
+from catalog.models import Author, BookSet, StatsSection, Volume, Work
+from catalog.services import spotlight, stats
+
+
+class LibraryStatsSnapshotTest(TestCase):
+    def test_snapshot_is_maintained_by_signals_and_read_in_one_query(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            author = Author.objects.create(full_name="Ursula K. Le Guin")
+            work = Work.objects.create(title="The Dispossessed", author=author)
+        stats.rebuild()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            volume = Volume.objects.create(title="The Dispossessed", price=12)
+            volume.works.add(work)
+
+        with self.assertNumQueries(1):
+            snapshot = stats.get_library_stats()
+        self.assertEqual(snapshot["total_volumes"], 1)
+        self.assertEqual(snapshot["total_volume_cost"], 12)
+        self.assertEqual(snapshot["volumes_by_author"][0]["full_name"],
+                         "Ursula K. Le Guin")
+        self.assertEqual(snapshot["volumes_by_author"][0]["count"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            volume.delete()
+        snapshot = stats.get_library_stats()
+        self.assertEqual(snapshot["total_volumes"], 0)
+        self.assertEqual(snapshot["volumes_by_author"][0]["count"], 0)
+        # the per-author patching agrees with a full recompute
+        self.assertEqual(snapshot["volumes_by_author"],
+                         stats.rebuild()["authors"]["volumes_by_author"])
+
+    def test_edits_apply_deltas_instead_of_recomputing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            author = Author.objects.create(full_name="Octavia E. Butler")
+            cheap = Volume.objects.create(title="Kindred", price=10)
+            dear = Volume.objects.create(title="Dawn", price=30)
+            BookSet.objects.create(title="Xenogenesis")
+        stats.rebuild()
+        authors_version = StatsSection.objects.get(name="authors").version
+
+        no_recompute = {name: lambda: self.fail("section was recomputed")
+                        for name in stats.SECTIONS}
+        with patch.dict(stats.SECTIONS, no_recompute), \
+                self.captureOnCommitCallbacks(execute=True):
+            Volume.objects.create(title="Imago", price=20)
+            cheap.price = 15
+            cheap.save()
+            dear.title = "Dawn (Xenogenesis 1)"
+            dear.save()
+            author.save()
+        self.assertEqual(StatsSection.objects.get(name="authors").version,
+                         authors_version)
+
+        maintained = stats.get_library_stats()
+        self.assertEqual(maintained["max_cost_volumes"][0]["title"], "Dawn (Xenogenesis 1)")
+        self.assertEqual(maintained["set_count"], 1)
+        stats.rebuild()
+        recomputed = stats.get_library_stats()
+        self.assertAlmostEqual(maintained.pop("avg_volume_cost"),
+                               recomputed.pop("avg_volume_cost"))
+        self.assertEqual(maintained, recomputed)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            dear.delete()  # the most expensive volume: recomputed after commit
+        snapshot = stats.get_library_stats()
+        self.assertEqual(snapshot["total_volume_cost"], 35)
+        self.assertEqual(snapshot["max_cost_volumes"][0]["title"], "Imago")
+
+
+class DashboardSpotlightTest(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        caches["shared"].clear()
+
+    def test_only_volumes_with_cover_and_description_are_picked(self):
+        Volume.objects.create(title="No Cover", description="Blurb")
+        Volume.objects.create(title="No Blurb", cover_url="https://example.com/a.jpg")
+        with self.captureOnCommitCallbacks(execute=True):
+            shown = Volume.objects.create(title="Shown", description="Blurb",
+                                          cover_url="https://example.com/b.jpg")
+        self.assertEqual(spotlight.candidate_ids(), [shown.pk])
+        with self.assertNumQueries(1):
+            self.assertEqual(spotlight.pick(), shown)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            shown.delete()
+        self.assertIsNone(spotlight.pick())
+
+    def test_dashboard_counts_come_from_the_snapshot(self):
+        Volume.objects.create(title="Counted")
+        stats.rebuild()
+        response = self.client.get(reverse("dashboard"))
+        self.assertEqual(response.context["counts"]["volume_count"], 1)
+        self.assertIsNone(response.context["rand_vol"])
@@ -0,0 +1,79 @@
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+
+from catalog.models import Author, BookSet, Bookshelf, Collection, Volume, Work
+from catalog.services import cards
+from catalog.views import CatalogAllView
+
+
+class VolumeCardCacheTest(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.author = Author.objects.create(full_name="Anne Brontë")
+        work = Work.objects.create(title="Agnes Grey", author=self.author)
+        Volume.objects.create(title="Agnes Grey").works.add(work)
+
+    def test_hits_cost_no_queries_and_edits_change_the_key(self):
+        volumes = list(Volume.objects.all())
+        [(_, html)] = cards.render_cards(volumes, "partials/volume_card.html")
+        self.assertIn("Anne Brontë", html)
+
+        with self.assertNumQueries(0):
+            cards.render_cards(volumes, "partials/volume_card.html")
+
+        self.author.full_name = "Acton Bell"
+        self.author.save()
+        [(_, html)] = cards.render_cards(list(Volume.objects.all()),
+                                         "partials/volume_card.html")
+        self.assertIn("Acton Bell", html)
+
+
+class CatalogAllViewTest(TestCase):
+    def test_works_and_sets_are_merged_and_paged_in_sql(self):
+        author = Author.objects.create(full_name="Leo Tolstoy")
+        for title in ("War and Peace", "Anna Karenina", "The Cossacks"):
+            Work.objects.create(title=title, author=author)
+        BookSet.objects.create(title="Collected Tales")
+        BookSet.objects.create(title="Boxed Novels")
+
+        response = self.client.get(reverse("catalog_all"))
+        self.assertEqual([item.title for item in response.context["items"]],
+                         ["Anna Karenina", "Boxed Novels", "Collected Tales",
+                          "The Cossacks", "War and Peace"])
+
+        with patch.object(CatalogAllView, "paginate_by", 2):
+            response = self.client.get(reverse("catalog_all") + "?page=2")
+        self.assertEqual([item.title for item in response.context["items"]],
+                         ["Collected Tales", "The Cossacks"])
+
+
+class ShelfAndCollectionPagingTest(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+
+    def test_bookshelf_pages_in_sql_with_volume_sorts(self):
+        shelf = Bookshelf.objects.create(name="Russian")
+        for year, title in ((1869, "War and Peace"), (1878, "Anna Karenina"),
+                            (1863, "The Cossacks")):
+            Volume.objects.create(title=title, publication_year=year).bookshelves.add(shelf)
+
+        url = reverse("bookshelf_detail", args=[shelf.slug])
+        with patch("catalog.views.BookshelfDetailView.paginate_by", 2):
+            response = self.client.get(url + "?sort=pub_year&dir=desc&page=2")
+        self.assertEqual([v.title for v in response.context["page_obj"]], ["The Cossacks"])
+        self.assertEqual(response.context["sort"], "pub_year")
+
+    def test_collection_pages_its_works(self):
+        author = Author.objects.create(full_name="Leo Tolstoy")
+        collection = Collection.objects.create(name="Novels")
+        for title in ("War and Peace", "Anna Karenina", "Resurrection"):
+            Work.objects.create(title=title, author=author).collections.add(collection)
+
+        url = reverse("collection_detail", args=[collection.slug])
+        with patch("catalog.views.CollectionDetailView.paginate_by", 2):
+            response = self.client.get(url + "?sort=title")
+        self.assertEqual([w.title for w in response.context["page_obj"]],
+                         ["Anna Karenina", "Resurrection"])
@@ -55,6 +55,7 @@ urlpatterns = [
 
     path('catalog/', views.CatalogAllView.as_view(), name='catalog_all'),
     path('isbn_lookup/', views.isbn_lookup_view, name='isbn_lookup'),
+    path('isbn_import/', views.isbn_import_view, name='isbn_import'),
     path('volume_create/', views.volume_create_view, name='volume_create'),
 
     path('bookshelf_create/', views.BookshelfCreateView.as_view(),
@@ -90,6 +91,13 @@ path('collection_create/', views.CollectionCreateView.as_view(),
     path('dev_note_update/<int:pk>/', views.DevNoteUpdateView.as_view(),name='dev_note_update'),
     path("volumes/<int:pk>/images/", VolumeImageManageView.as_view(),
          name="volume_images_manage"),
+    path("volumes/<int:pk>/images/presign/", views.volume_image_presign,
+         name="volume_image_presign"),
+    path("volumes/<int:pk>/images/confirm/", views.volume_image_confirm,
+         name="volume_image_confirm"),
+    path("autocomplete/<str:kind>/", views.autocomplete_view, name="autocomplete"),
+    path("img/<str:model>/<int:pk>/<str:version>/w<int:width>.<str:fmt>",
+         views.image_variant_view, name="image_variant"),
 ]
 
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,9 +1,12 @@
 # catalog/utils/cleanup.py
+import logging
 import os
 from pathlib import Path
 from django.conf import settings
 from catalog.models import BookImage
 
+logger = logging.getLogger(__name__)
+
 
 def find_orphan_images():
     """Return a list of Paths for image files not linked to any BookImage."""
@@ -36,4 +39,4 @@ def delete_orphan_images(orphaned_files):
         try:
             os.remove(f)
         except Exception as e:
-            print(f"Error deleting {f}: {e}")
+            logger.warning("Error deleting %s: %s", f, e)
@@ -34,6 +34,23 @@ def isbn13_to_isbn10(isbn13: str) -> str:
     return core + check
 
 
+def is_valid_isbn10(isbn10: str) -> bool:
+    s = isbn10.replace("-", "").replace(" ", "").upper()
+    if len(s) != 10 or not s[:9].isdigit() or not (s[9].isdigit() or s[9] == "X"):
+        return False
+    total = sum((10 - i) * int(ch) for i, ch in enumerate(s[:9]))
+    total += 10 if s[9] == "X" else int(s[9])
+    return total % 11 == 0
+
+
+def is_valid_isbn13(isbn13: str) -> bool:
+    s = isbn13.replace("-", "").replace(" ", "")
+    if len(s) != 13 or not s.isdigit():
+        return False
+    total = sum((1 if i % 2 == 0 else 3) * int(ch) for i, ch in enumerate(s))
+    return total % 10 == 0
+
+
 if __name__ == '__main__':
     print(isbn10_to_isbn13('0395257301')) # should be 9780395257302
     print(isbn13_to_isbn10('9780395257302')) # should be 0395257301
\ No newline at end of file
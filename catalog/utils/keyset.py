@@ -0,0 +1,172 @@
+"""
+Keyset ("seek") pagination.
+
+Instead of OFFSET n, each page asks for rows strictly after (or before) the
+sort-key tuple of the last (first) row already shown, so page 500 costs the
+same as page 1 and rows don't shift when the catalog changes underneath.
+The key must end in a unique column (id). NULLs always sort last, in both
+directions, so the comparison below is well defined on every backend.
+
+Cursors are opaque url-safe strings: base64 JSON of the key values plus a
+tag (the sort name/direction) so a cursor from another sort is ignored.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import datetime
+import decimal
+import json
+from dataclasses import dataclass, field
+
+from django.db.models import F, Q
+
+NEXT, PREV = "next", "prev"
+
+
+# ---- Cursors --------------------------------------------------
+
+def _json_default(value):
+    # full precision; DjangoJSONEncoder would round datetimes to milliseconds
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def encode_cursor(tag: str, values) -> str:
+    raw = json.dumps({"t": tag, "v": list(values)}, default=_json_default,
+                     separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, tag: str, length: int):
+    """Key values from ``cursor``, or None if it's malformed or for another sort."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, binascii.Error):
+        return None
+    if (not isinstance(payload, dict) or payload.get("t") != tag
+            or not isinstance(payload.get("v"), list)
+            or len(payload["v"]) != length):
+        return None
+    return payload["v"]
+
+
+# ---- Query building ---------------------------------------------
+
+def _is_nullable(model, path: str) -> bool:
+    """True if any hop of ``a__b__c`` (FK or final column) can be NULL."""
+    for name in path.split("__"):
+        f = model._meta.get_field(name)
+        if f.null:
+            return True
+        if f.is_relation:
+            model = f.related_model
+    return False
+
+
+def order_by(fields, descending: bool, reverse: bool = False):
+    """ORDER BY for the key; ``reverse`` flips it (for walking backwards)."""
+    desc = descending != reverse
+    # nulls stay last in the forward direction, so first when reversed
+    # (Django wants True or None here, not False)
+    nulls = {"nulls_first": True} if reverse else {"nulls_last": True}
+    return [F(f).desc(**nulls) if desc else F(f).asc(**nulls) for f in fields]
+
+
+def _equal(path, value):
+    return Q(**{f"{path}__isnull": True}) if value is None else Q(**{path: value})
+
+
+def seek_filter(model, fields, values, descending: bool, direction: str = NEXT):
+    """
+    Rows strictly after (NEXT) or before (PREV) ``values`` in the key order:
+    OR over i of (k1 = v1 AND ... AND k(i-1) = v(i-1) AND ki beyond vi).
+    """
+    after = direction == NEXT
+    condition = None
+    for i, (path, value) in enumerate(zip(fields, values)):
+        nullable = _is_nullable(model, path)
+        op = "lt" if descending == after else "gt"
+
+        if after:
+            if value is None:
+                continue  # nothing sorts after NULL in this column
+            step = Q(**{f"{path}__{op}": value})
+            if nullable:
+                step |= Q(**{f"{path}__isnull": True})
+        else:
+            if value is None:
+                step = Q(**{f"{path}__isnull": False})  # every value precedes NULL
+            else:
+                step = Q(**{f"{path}__{op}": value})
+
+        prefix = Q()
+        for p, v in zip(fields[:i], values[:i]):
+            prefix &= _equal(p, v)
+        clause = prefix & step
+        condition = clause if condition is None else condition | clause
+
+    return condition if condition is not None else Q(pk__in=[])
+
+
+# ---- Paging -------------------------------------------------------
+
+@dataclass
+class KeysetPage:
+    object_list: list
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    has_next: bool = False
+    has_previous: bool = False
+    # set by paginate(); the per-row key values, aligned with object_list
+    keys: list = field(default_factory=list, repr=False)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def paginate(queryset, fields, *, descending=False, page_size=30, cursor=None,
+             direction=NEXT, tag="") -> KeysetPage:
+    """
+    One page of ``queryset`` ordered by ``fields`` (ending in a unique field),
+    starting after/before the row encoded in ``cursor``.
+    """
+    aliases = [f"_keyset_{i}" for i in range(len(fields))]
+    qs = queryset.annotate(**{a: F(f) for a, f in zip(aliases, fields)})
+
+    values = decode_cursor(cursor, tag, len(fields))
+    if values is None:
+        direction = NEXT
+    else:
+        qs = qs.filter(seek_filter(queryset.model, fields, values, descending,
+                                   direction))
+
+    backwards = direction == PREV
+    rows = list(qs.order_by(*order_by(fields, descending, reverse=backwards))
+                [:page_size + 1])
+    more = len(rows) > page_size
+    rows = rows[:page_size]
+    if backwards:
+        rows.reverse()
+
+    keys = [[getattr(r, a) for a in aliases] for r in rows]
+    page = KeysetPage(object_list=rows, keys=keys)
+    if backwards:
+        page.has_previous, page.has_next = more, True
+    else:
+        page.has_next, page.has_previous = more, values is not None
+    if rows:
+        if page.has_next:
+            page.next_cursor = encode_cursor(tag, keys[-1])
+        if page.has_previous:
+            page.prev_cursor = encode_cursor(tag, keys[0])
+    return page
@@ -0,0 +1,63 @@
+"""
+Markdown rendering shared by the *_html properties and the render_markdown
+filter.
+
+markdownx's markdownify() builds a new Markdown instance (and re-registers
+every extension) on each call. Here each thread keeps one instance per
+extension set and reset()s it between documents.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from functools import lru_cache
+
+import markdown
+from markdownx.settings import (MARKDOWNX_MARKDOWN_EXTENSION_CONFIGS,
+                                MARKDOWNX_MARKDOWN_EXTENSIONS)
+
+RENDER_VERSION = 1  # bump to make every stored rendering stale
+
+_local = threading.local()
+
+
+def _config(extensions=None):
+    if extensions is None:
+        return tuple(MARKDOWNX_MARKDOWN_EXTENSIONS), MARKDOWNX_MARKDOWN_EXTENSION_CONFIGS
+    return tuple(extensions), {}
+
+
+def _instance(extensions=None) -> markdown.Markdown:
+    names, configs = _config(extensions)
+    instances = getattr(_local, "instances", None)
+    if instances is None:
+        instances = _local.instances = {}
+    md = instances.get(names)
+    if md is None:
+        md = instances[names] = markdown.Markdown(
+            extensions=list(names), extension_configs=configs)
+    return md
+
+
+def render(text, extensions=None) -> str:
+    """Markdown -> HTML, same output as markdownx's markdownify() by default."""
+    if not text:
+        return ""
+    md = _instance(extensions)
+    try:
+        return md.convert(text)
+    finally:
+        md.reset()
+
+
+@lru_cache(maxsize=512)
+def render_cached(text, extensions=None) -> str:
+    """render() memoized per process; for template filters on unsaved text."""
+    return render(text, extensions)
+
+
+def source_hash(text) -> str:
+    """Fingerprint of the source and the renderer config that produced it."""
+    names, _ = _config()
+    raw = f"{RENDER_VERSION}|{','.join(names)}|{text or ''}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
@@ -0,0 +1,111 @@
+"""
+Slug allocation shared by every catalog model.
+
+The scheme is unchanged (base, base-1, base-2, ...), but a free slug is
+found with one prefix scan (slug = base OR slug LIKE 'base-%') instead of
+one exists() query per collision. For models whose slug column is unique,
+save_with_slug() retries with a fresh slug when a concurrent save claimed
+the same one between our scan and our INSERT.
+"""
+from __future__ import annotations
+
+import re
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+MAX_ATTEMPTS = 5
+
+
+def _field(model, field_name):
+    return model._meta.get_field(field_name)
+
+
+def make_base(model, source, field_name="slug") -> str:
+    """slugify(source), truncated so a "-NNNN" suffix still fits the column."""
+    max_length = _field(model, field_name).max_length or 50
+    base = slugify(source or "")[:max(1, max_length - 5)].strip("-")
+    return base or model._meta.model_name
+
+
+def _taken(model, bases, field_name, exclude_pk=None) -> set[str]:
+    q = Q()
+    for base in bases:
+        q |= Q(**{field_name: base}) | Q(**{f"{field_name}__startswith": f"{base}-"})
+    qs = model._default_manager.filter(q)
+    if exclude_pk is not None:
+        qs = qs.exclude(pk=exclude_pk)
+    return set(qs.values_list(field_name, flat=True))
+
+
+def _first_free(base, taken, max_length) -> str:
+    if base not in taken:
+        return base
+    # only numeric suffixes matter; "poems-and-songs" is not a collision
+    pattern = re.compile(rf"^{re.escape(base)}-(\d+)$")
+    used = {int(m.group(1)) for s in taken if s and (m := pattern.match(s))}
+    counter = 1
+    while counter in used:
+        counter += 1
+    suffix = f"-{counter}"
+    return base[:max_length - len(suffix)] + suffix
+
+
+def allocate_slug(model, source, *, field_name="slug", instance=None) -> str:
+    """A slug for ``source`` that no other ``model`` row uses (one query)."""
+    base = make_base(model, source, field_name)
+    pk = instance.pk if instance is not None else None
+    taken = _taken(model, [base], field_name, exclude_pk=pk)
+    return _first_free(base, taken, _field(model, field_name).max_length or 50)
+
+
+def assign_slugs(objs, source, *, field_name="slug", chunk=100) -> None:
+    """
+    Fill in the slug of every object in ``objs`` that lacks one, ahead of a
+    bulk_create. ``source`` is an attribute name or a callable(obj). Costs
+    one query per ``chunk`` distinct bases; slugs are unique among ``objs``
+    too.
+    """
+    objs = [o for o in objs if not getattr(o, field_name)]
+    if not objs:
+        return
+    model = type(objs[0])
+    get = source if callable(source) else (lambda o: getattr(o, source))
+    max_length = _field(model, field_name).max_length or 50
+
+    bases = {id(o): make_base(model, get(o), field_name) for o in objs}
+    distinct = sorted(set(bases.values()))
+    taken = set()
+    for start in range(0, len(distinct), chunk):
+        taken |= _taken(model, distinct[start:start + chunk], field_name)
+
+    for o in objs:
+        slug = _first_free(bases[id(o)], taken, max_length)
+        taken.add(slug)
+        setattr(o, field_name, slug)
+
+
+def save_with_slug(instance, source, save, *args, field_name="slug", **kwargs):
+    """
+    Call ``save(*args, **kwargs)`` (the model's super().save), allocating a
+    slug first if the instance has none. If the INSERT/UPDATE fails because
+    another writer took that slug meanwhile, allocate again and retry.
+    """
+    if getattr(instance, field_name):
+        return save(*args, **kwargs)
+
+    model = type(instance)
+    for attempt in range(MAX_ATTEMPTS):
+        slug = allocate_slug(model, source, field_name=field_name, instance=instance)
+        setattr(instance, field_name, slug)
+        try:
+            with transaction.atomic():
+                return save(*args, **kwargs)
+        except IntegrityError:
+            setattr(instance, field_name, "")
+            lost_race = (model._default_manager.filter(**{field_name: slug})
+                         .exclude(pk=instance.pk).exists())
+            # some other constraint failed, or we keep losing: give up
+            if not lost_race or attempt == MAX_ATTEMPTS - 1:
+                raise
@@ -11,5 +11,8 @@ from .collections import *
 from .search import *
 from .pricing import *
 from .view_images import *
+from .view_image_variants import *
+from .media import *
+from .view_autocomplete import *
 from .view_bookset_images import *
 from .dev_notes import *
\ No newline at end of file
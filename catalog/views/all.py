@@ -1,30 +1,73 @@
-from django.db.models import Prefetch
+from django.db.models import CharField, Prefetch, Value
+from django.db.models.functions import Coalesce
 
 from .base import CatalogBaseView
 from catalog.models import Volume, Work, BookSet
-from catalog.utils.normalization import normalize_sort_title
+from catalog.services import bookset_summary
 
 
 # class CatalogAllView(CatalogBaseView):
 #     view_type = "all"
 
-from itertools import chain
-
 class CatalogAllView(CatalogBaseView):
+    """
+    Works and book sets in one title-ordered list. The database merges and
+    pages the two tables (a UNION of (kind, id, sort key) rows); only the
+    rows on the current page are then loaded, with their volumes (works)
+    or stored preview volumes (sets).
+    """
     template_name = "catalog/work_list.html"
     view_type = "all"
 
+    @staticmethod
+    def _entries(model, kind):
+        return (
+            model.objects
+            .annotate(kind_key=Value(kind, output_field=CharField()),
+                      sort_key=Coalesce("sort_title", "title"))
+            .values_list("kind_key", "id", "sort_key")
+            .order_by()
+        )
+
     def get_queryset(self):
-        volumes_qs = Volume.objects.only("id", "title", "cover_url", "slug")
+        return (
+            self._entries(Work, "Work")
+            .union(self._entries(BookSet, "BookSet"), all=True)
+            .order_by("sort_key", "kind_key", "id")
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, rows, is_paginated = super().paginate_queryset(queryset, page_size)
+        page.object_list = self.load_rows(list(rows))
+        return paginator, page, page.object_list, is_paginated
+
+    @staticmethod
+    def load_rows(rows):
+        """(kind, id, sort_key) rows -> Work / BookSet objects, same order."""
+        volumes_qs = (
+            Volume.objects
+            .select_related("cover_image")
+            .only("id", "slug", "title", "sort_title", "cover_url", "cover_image_id",
+                  "primary_work_id", "cover_image__id", "cover_image__original",
+                  "cover_image__image_display", "cover_image__image_thumb")
+            .order_by("sort_title")
+        )
+        ids = {"Work": [], "BookSet": []}
+        for kind, pk, _ in rows:
+            ids[kind].append(pk)
 
         works = (
-            Work.objects
+            Work.objects.filter(pk__in=ids["Work"])
             .select_related("author")
+            .defer("rendered_markdown")
             .prefetch_related(Prefetch("volumes", queryset=volumes_qs))
         )
-        booksets = (
-            BookSet.objects
-            .prefetch_related(Prefetch("volumes", queryset=volumes_qs))
+        booksets = list(
+            BookSet.objects.filter(pk__in=ids["BookSet"])
+            .select_related("representative_author")
+            .defer("rendered_markdown")
         )
-
-        return sorted(chain(works, booksets), key=lambda obj: normalize_sort_title(obj.title))
+        bookset_summary.attach_previews(booksets)
+        # an empty pk__in list short-circuits without a query
+        loaded = {(o.kind, o.pk): o for o in (*works, *booksets)}
+        return [loaded[(kind, pk)] for kind, pk, _ in rows if (kind, pk) in loaded]
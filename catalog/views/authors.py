@@ -1,4 +1,5 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.paginator import Paginator
 from django.db.models import Prefetch
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import redirect, get_object_or_404
@@ -9,7 +10,7 @@ from django.views.generic import DetailView, CreateView, UpdateView
 from django.views.generic import ListView
 
 from catalog.forms import AuthorCreateForm
-from catalog.models import Author, Work, Volume
+from catalog.models import Author, AuthorVolume
 
 
 class AuthorCreateView(LoginRequiredMixin, CreateView):
@@ -124,47 +125,34 @@ class AuthorUpdateView(LoginRequiredMixin, UpdateView):
 #         return context
 
 class AuthorListView(ListView):
+    """
+    Reads each author's volumes from the AuthorVolume index: one query for
+    the page of authors and one for all of their volumes, already
+    deduplicated and in title order.
+    """
     model = Author
     context_object_name = "authors"
     template_name = "catalog/author_list.html"
     paginate_by = 20
 
     def get_queryset(self):
-        volumes_qs = (
-            Volume.objects
-            .select_related("cover_image")  # avoid N+1 if template calls vol.cover_src
-            .order_by("sort_title")
+        links = (
+            AuthorVolume.objects
+            .select_related("volume__cover_image")  # vol.cover_src
+            .defer("volume__rendered_markdown")
+            .order_by("sort_title", "volume_id")
         )
-
-        works_qs = (
-            Work.objects
-            .prefetch_related(Prefetch("volumes", queryset=volumes_qs))
-            .order_by("sort_title")
-        )
-
         return (
             Author.objects
-            .prefetch_related(Prefetch("works", queryset=works_qs))
+            .prefetch_related(Prefetch("volume_links", queryset=links))
             .order_by("sort_name")
         )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-
-        # If you're already ordering by sort_name in the queryset,
-        # you don't need to sort again here.
         authors = list(context["authors"])
-
         for author in authors:
-            seen = set()
-            unique_vols = []
-            for work in author.works.all():        # prefetched
-                for vol in work.volumes.all():     # prefetched
-                    if vol.pk not in seen:
-                        seen.add(vol.pk)
-                        unique_vols.append(vol)
-            author.unique_volumes = unique_vols
-
+            author.unique_volumes = [link.volume for link in author.volume_links.all()]
         context["authors_display"] = authors
         return context
 
@@ -172,6 +160,10 @@ class AuthorDetailView(DetailView):
     model = Author
     context_object_name = 'author'
     template_name = "catalog/author_detail.html"
+    volumes_per_page = 50
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("cover_volume__cover_image")
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -181,13 +173,18 @@ class AuthorDetailView(DetailView):
         context["works"] = author.works.all().order_by("first_published")  #
         # adjust field
 
-        # Add volumes linked to any of the author's works
-        context["volumes"] = (
-            Volume.objects
-            .filter(works__author=author)
-            .distinct()
-            .order_by("sort_title")  # adjust if you sort differently
+        # the author's volumes, a page at a time off authorvolume_sort_idx
+        links = (
+            AuthorVolume.objects
+            .filter(author=author)
+            .select_related("volume")
+            .only("volume__title", "volume__edition", "volume__slug")
+            .order_by("sort_title", "volume_id")
         )
+        page = Paginator(links, self.volumes_per_page).get_page(
+            self.request.GET.get("volumes_page"))
+        context["volumes_page"] = page
+        context["volumes"] = [link.volume for link in page]
         return context
 
 
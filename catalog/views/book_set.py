@@ -1,6 +1,7 @@
 from django.shortcuts import get_object_or_404, redirect
 from django.views.generic import DetailView
 
+from catalog.services import bookset_summary
 from catalog.utils.normalization import normalize_sort_title
 from catalog.views import CatalogBaseView
 
@@ -31,8 +32,7 @@ from catalog.views import CatalogBaseView
 #
 #         return qs
 
-from django.db.models import Prefetch
-from catalog.models import BookSet, Volume, Work  # adjust import path if needed
+from catalog.models import BookSet
 
 # class BookSetListView(CatalogBaseView):
 #     model = BookSet
@@ -58,81 +58,29 @@ from catalog.models import BookSet, Volume, Work  # adjust import path if needed
 #         )
 
 
-from django.db.models import Prefetch
-
 class BookSetListView(CatalogBaseView):
+    """
+    Author, volume count and preview volumes are stored on each set
+    (catalog/services/bookset_summary.py): one query for the page of sets,
+    one for all of their preview volumes.
+    """
     model = BookSet
     template_name = "catalog/bookset_list.html"
 
-
     def get_queryset(self):
-        # If you need author via volume.works.author, keep this (lean).
-        works_qs = (
-            Work.objects
-            .select_related("author")
-            .only("id", "author_id", "title", "sort_title")
-            .order_by("sort_title")
-        )
-
-        # volumes_qs = (
-        #     Volume.objects
-        #     .select_related("cover_image")  # <-- critical: kills VolumeImage N+1
-        #     .only(
-        #         "id", "slug", "title", "sort_title",
-        #         "cover_url", "cover_image_id",
-        #         "cover_image__image_display",
-        #         # include image_thumb if you might use it later
-        #         "cover_image__image_thumb",
-        #     )
-        #     .order_by("sort_title")
-        #     .prefetch_related(Prefetch("works", queryset=works_qs))  # only if item.author needs it
-        # )
-        #
-        # return (
-        #     BookSet.objects
-        #     .prefetch_related(Prefetch("volumes", queryset=volumes_qs))
-        #     .order_by("title")
-        # )
-        # volumes_qs = (
-        #     Volume.objects
-        #     .select_related("cover_image", "primary_work__author")
-        #     .prefetch_related("works__author")
-        #     .only(
-        #         "id", "slug", "title", "sort_title",
-        #         "cover_url", "cover_image_id",
-        #         "cover_image__image_display",
-        #         "primary_work_id", "primary_work__author_id",
-        #     )
-        #     .order_by("sort_title")
-        # )
-        volumes_qs = (
-            Volume.objects
-            .select_related("cover_image", "primary_work__author")
-            .prefetch_related("works__author")
-            .order_by("sort_title")
-        )
-
         return (
             BookSet.objects
-            .prefetch_related(Prefetch("volumes", queryset=volumes_qs))
+            .select_related("representative_author")
+            .defer("rendered_markdown")
             .order_by("title")
         )
 
-
-
-# class BookSetListView(CatalogBaseView):
-#     model = BookSet
-#     template_name = "catalog/work_list.html"
-#     view_type = "booksets"
-#
-#     def get_queryset(self):
-#         volumes_qs = Volume.objects.only("id", "title", "cover_url", "slug")
-#         return (
-#             BookSet.objects
-#             .prefetch_related(Prefetch("volumes", queryset=volumes_qs))
-#             .order_by("title")
-#         )
-
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, object_list, is_paginated = super().paginate_queryset(
+            queryset, page_size)
+        page.object_list = list(object_list)
+        bookset_summary.attach_previews(page.object_list)
+        return paginator, page, page.object_list, is_paginated
 
 
 class BookSetDetailView(DetailView):
@@ -1,10 +1,10 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404, redirect
 from django.views.generic import ListView, DetailView, CreateView, UpdateView
 from django.views.generic.list import MultipleObjectMixin
 
-from catalog.models import Bookshelf, Volume, Work
+from catalog.models import Bookshelf
+from catalog.views.mixins import VolumeSortMixin
 
 
 class BookshelfCreateView(LoginRequiredMixin, CreateView):
@@ -46,31 +46,23 @@ class BookshelfListView(ListView):
 #     context_object_name = 'collection'
 #     template_name = "catalog/bookshelf_detail.html"
 
-class BookshelfDetailView(DetailView, MultipleObjectMixin):
+class BookshelfDetailView(VolumeSortMixin, DetailView, MultipleObjectMixin):
+    """
+    The shelf's volumes are sorted and paged in SQL (?page, ?sort, ?dir);
+    only the visible page is loaded, and the card cache fetches works and
+    authors for the cards it has to render.
+    """
     model = Bookshelf
     context_object_name = "bookshelf"
     template_name = "catalog/bookshelf_detail.html"
     paginate_by = 36
 
-
-
-    def get_queryset(self):
-        volumes_qs = (
-            Volume.objects
+    def get_context_data(self, **kwargs):
+        volumes = self.order_by_sort(
+            self.object.volumes
             .select_related("cover_image", "primary_work__author")
-            .prefetch_related("works__author")
-            .order_by("sort_title")
+            .defer("rendered_markdown")
         )
-
-        return (
-            Bookshelf.objects
-            .prefetch_related(Prefetch("volumes", queryset=volumes_qs))
-        )
-
-    def get_context_data(self, **kwargs):
-        bookshelf = self.get_object()
-        # This will use the prefetched queryset from get_queryset()
-        volumes = bookshelf.volumes.all()
         return super().get_context_data(object_list=volumes, **kwargs)
 
 def bookshelf_redirect_by_id(request, pk):
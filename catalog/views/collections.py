@@ -1,8 +1,9 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Prefetch
 from django.views.generic import ListView, DetailView, CreateView, UpdateView
+from django.views.generic.list import MultipleObjectMixin
 
-from catalog.models import Collection, Volume, Work
+from catalog.models import Collection
+from catalog.views.mixins import WorkSortMixin
 
 
 class CollectionCreateView(LoginRequiredMixin, CreateView):
@@ -31,25 +32,18 @@ class CollectionListView(ListView):
         ).order_by("name")
 
 
-class CollectionDetailView(DetailView):
+class CollectionDetailView(WorkSortMixin, DetailView, MultipleObjectMixin):
+    """Works sorted and paged in SQL (?page, ?sort, ?dir), like a bookshelf."""
     model = Collection
     context_object_name = "collection"
     template_name = "catalog/collection_detail.html"
+    paginate_by = 50
 
-    def get_queryset(self):
-        volumes_qs = (
-            Volume.objects
-            .select_related("cover_image", "book_set", "primary_work")
-            .order_by("sort_title")
-        )
-
-        works_qs = (
-            Work.objects
+    def get_context_data(self, **kwargs):
+        works = self.order_by_sort(
+            self.object.works
             .select_related("author")
-            .prefetch_related(Prefetch("volumes", queryset=volumes_qs))
-            .order_by("sort_title")
-        )
-
-        return Collection.objects.prefetch_related(
-            Prefetch("works", queryset=works_qs)
+            .only("id", "slug", "title", "sort_title", "first_published",
+                  "author__id", "author__full_name", "author__sort_name")
         )
+        return super().get_context_data(object_list=works, **kwargs)
@@ -1,11 +1,19 @@
-from pprint import pprint
+import logging
+import uuid
 
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import render
+from django.shortcuts import redirect, render
+from django.urls import reverse
 
-from catalog.forms import ISBNSearchForm, VolumeForm
+from catalog.forms import ISBNImportForm, ISBNSearchForm, VolumeForm
+from catalog.services import bulk_import
 from catalog.services.book_lookup import perform_isbn_lookup
 from catalog.utils.date_parser import parse_published_date
+from jobs.models import Job
+from jobs.queue import enqueue
+
+logger = logging.getLogger(__name__)
 
 
 @login_required(login_url="account_login")
@@ -24,8 +32,9 @@ def isbn_lookup_view(request):
         except LookupError:
             result = None
         if result:
-            pprint(result)
-            print(result['result']['cover_url'])
+            logger.debug("ISBN lookup %s -> %r (cover %s)", isbn,
+                         result["result"].get("title"),
+                         result["result"].get("cover_url"))
 
             publication_date = parse_published_date(
                 result["result"].get("published_date"))
@@ -51,3 +60,58 @@ def isbn_lookup_view(request):
         return render(request, "partials/lookup_result.html", context)
 
     return render(request, "catalog/isbn_search.html", context)
+
+
+@login_required(login_url="account_login")
+def isbn_import_view(request):
+    """
+    Upload/paste a batch of ISBNs; see catalog.services.bulk_import. Up to
+    ISBN_IMPORT_INLINE_ROWS are imported in the request; larger uploads are
+    queued and the page waits for the report (?report=<key>).
+    """
+    form = ISBNImportForm(request.POST or None, request.FILES or None)
+    rows = None
+    report = request.GET.get("report", "")
+    job = None
+
+    if request.method == "POST" and form.is_valid():
+        text = form.cleaned_data["text"]
+        max_rows = settings.ISBN_IMPORT_MAX_ROWS
+        count = len(bulk_import.parse_isbns(text))
+        if count > max_rows:
+            form.add_error(None, f"At most {max_rows} ISBNs per upload; "
+                                 f"use `manage.py import_isbns` for larger "
+                                 f"batches.")
+        elif count > settings.ISBN_IMPORT_INLINE_ROWS:
+            report = uuid.uuid4().hex
+            bookshelf = form.cleaned_data["bookshelf"]
+            enqueue("catalog.import_isbns", {
+                "text": text,
+                "report_key": report,
+                "dry_run": form.cleaned_data["dry_run"],
+                "bookshelf_id": bookshelf.pk if bookshelf else None,
+            })
+            return redirect(f"{reverse('isbn_import')}?report={report}")
+        else:
+            rows = bulk_import.import_isbns(
+                text,
+                workers=settings.ISBN_IMPORT_WORKERS,
+                rate=settings.ISBN_IMPORT_RATE,
+                dry_run=form.cleaned_data["dry_run"],
+                bookshelf=form.cleaned_data["bookshelf"],
+            )
+    elif report:
+        rows = bulk_import.load_report(report)
+        if rows is None:
+            job = (Job.objects.filter(name="catalog.import_isbns",
+                                      kwargs__report_key=report)
+                   .only("status", "last_error").first())
+
+    context = {
+        "form": form,
+        "rows": rows,
+        "counts": sorted(bulk_import.summarize(rows).items()) if rows is not None else None,
+        "report": report,
+        "job": job,
+    }
+    return render(request, "catalog/isbn_import.html", context)
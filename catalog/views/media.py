@@ -0,0 +1,152 @@
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+# Uploads and derivatives are stored under a random 12-hex-digit token
+# (catalog/services/images.py, catalog/utils/images/images.py) and never
+# rewritten in place: a URL carrying one can be cached forever.
+IMMUTABLE_NAME = re.compile(r"(^|/)[0-9a-f]{12}[_-][^/]*$")
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class _FileRange:
+    """
+    One byte range of an open file. read() stops at its end; fileno() lets
+    the server's wsgi.file_wrapper (gunicorn) sendfile() it straight from
+    the current offset, bounded by Content-Length.
+    """
+    def __init__(self, fh, start, length):
+        fh.seek(start)
+        self._fh = fh
+        self._left = length
+
+    def read(self, size=-1):
+        if self._left <= 0:
+            return b""
+        size = self._left if size is None or size < 0 else min(size, self._left)
+        data = self._fh.read(size)
+        self._left -= len(data)
+        return data
+
+    def fileno(self):
+        return self._fh.fileno()
+
+    def close(self):
+        self._fh.close()
+
+
+def _byte_range(header, size):
+    """(start, end) inclusive for a single "bytes=" range; None to send it all."""
+    match = RANGE.match(header.replace(" ", ""))
+    if not match:
+        return None  # several ranges, or not bytes: a 200 is a valid answer
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        return None
+    if start > end or start >= size:
+        raise ValueError("unsatisfiable range")
+    return start, end
+
+
+def _range_applies(request, etag, mtime):
+    if_range = request.headers.get("If-Range")
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == int(mtime)
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Serve a file under MEDIA_ROOT with validators and, where the name is
+    content-addressed, an immutable Cache-Control. With MEDIA_ACCEL the
+    bytes are left to the front proxy (X-Accel-Redirect for nginx,
+    X-Sendfile for Apache/lighttpd); otherwise the file is streamed with
+    FileResponse, which gunicorn sends with sendfile(), honouring a single
+    Range request.
+    """
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, path)
+        st = os.stat(fullpath)
+    except (SuspiciousFileOperation, OSError, ValueError):
+        raise Http404
+    if not stat.S_ISREG(st.st_mode):
+        raise Http404
+
+    etag = f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+    mtime = st.st_mtime
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=int(mtime))
+    if not_modified is None:
+        content_type, encoding = mimetypes.guess_type(fullpath)
+        content_type = content_type or "application/octet-stream"
+        response = _send(request, fullpath, path, st.st_size, content_type,
+                         etag, mtime)
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+    else:
+        response = not_modified  # 304, or 412 for a failed If-Match
+
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = http_date(mtime)
+    if IMMUTABLE_NAME.search(path):
+        patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE,
+                            immutable=True)
+    else:
+        patch_cache_control(response, public=True,
+                            max_age=getattr(settings, "MEDIA_MAX_AGE", 60 * 60))
+    return response
+
+
+def _send(request, fullpath, path, size, content_type, etag, mtime):
+    accel = getattr(settings, "MEDIA_ACCEL", "")
+    if accel == "nginx":
+        # nginx: location <MEDIA_ACCEL_PREFIX> { internal; alias <MEDIA_ROOT>/; }
+        response = HttpResponse(content_type=content_type)
+        response.headers["X-Accel-Redirect"] = (
+            getattr(settings, "MEDIA_ACCEL_PREFIX", "/protected-media/") + quote(path))
+        return response
+    if accel == "sendfile":
+        response = HttpResponse(content_type=content_type)
+        response.headers["X-Sendfile"] = fullpath
+        return response
+
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if range_header and _range_applies(request, etag, mtime):
+        try:
+            byte_range = _byte_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response.headers["Content-Range"] = f"bytes */{size}"
+            return response
+
+    fh = open(fullpath, "rb")
+    if byte_range is None:
+        response = FileResponse(fh, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = FileResponse(_FileRange(fh, start, end - start + 1),
+                                content_type=content_type, status=206)
+        response.headers["Content-Length"] = end - start + 1
+        response.headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response.headers["Accept-Ranges"] = "bytes"
+    return response
@@ -0,0 +1,73 @@
+from catalog.utils import keyset
+
+
+class SortMixin:
+    """
+    ?sort=<key>&dir=asc|desc for list pages. ``SORTS`` maps each key to
+    the fields of the ordering key, ending in a unique one ("id") so every
+    row has a fixed place; order_by_sort() applies it NULLs last.
+    """
+    SORTS = {}
+    SORT_LABELS = [
+        ("date_added", "Date added"),
+        ("title", "Title"),
+        ("author", "Author"),
+        ("pub_year", "Publication year"),
+        ("publisher", "Publisher"),
+        ("acq_date", "Acquisition date"),
+        ("status", "Status"),
+        ("value", "Estimated value"),
+        ("isbn", "ISBN"),
+    ]
+    DEFAULT_SORT = "title"
+    DEFAULT_DIR = "asc"
+
+    def get_sort(self):
+        """(sort, direction), validated; also kept on self.sort / self.direction."""
+        sort = self.request.GET.get("sort", self.DEFAULT_SORT)
+        direction = self.request.GET.get("dir", self.DEFAULT_DIR)
+        if sort not in self.SORTS:
+            sort = self.DEFAULT_SORT
+        if direction not in ("asc", "desc"):
+            direction = self.DEFAULT_DIR
+        self.sort, self.direction = sort, direction
+        return sort, direction
+
+    def get_sort_fields(self):
+        return self.SORTS[self.sort]
+
+    def order_by_sort(self, queryset):
+        sort, direction = self.get_sort()
+        return queryset.order_by(*keyset.order_by(self.SORTS[sort], direction == "desc"))
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["sort"] = getattr(self, "sort", self.DEFAULT_SORT)
+        context["dir"] = getattr(self, "direction", self.DEFAULT_DIR)
+        context["sort_choices"] = [(key, label) for key, label in self.SORT_LABELS
+                                   if key in self.SORTS]
+        return context
+
+
+class VolumeSortMixin(SortMixin):
+    SORTS = {
+        "title": ["sort_title", "title", "id"],
+        "author": ["primary_work__author__sort_name", "sort_title", "id"],
+        "date_added": ["date_added", "id"],
+        "pub_year": ["publication_year", "sort_title", "id"],
+        "publisher": ["publisher", "sort_title", "id"],
+        "acq_date": ["acquisition_date", "sort_title", "id"],
+        "status": ["status", "sort_title", "id"],
+        "value": ["estimated_value", "sort_title", "id"],
+        "isbn": ["isbn13", "sort_title", "id"],
+    }
+
+
+class WorkSortMixin(SortMixin):
+    # the VolumeSortMixin keys that mean something for a work
+    SORTS = {
+        "title": ["sort_title", "id"],
+        "author": ["author__sort_name", "sort_title", "id"],
+        "pub_year": ["first_published", "sort_title", "id"],
+    }
+
@@ -67,22 +67,23 @@
 #         })
 #         return context
 
-from django.db.models import Q, Count, Prefetch
-from django.db.models.fields.related import ForeignKey
+from django.db.models import Count, Prefetch
 from django.views.generic import TemplateView
 
 from catalog.models import Author, Work, Volume, BookSet
+from catalog.services import search_index
 
 
 class SearchResultsView(TemplateView):
     template_name = "catalog/search_results.html"
+    results_per_type = 100
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         q = self.request.GET.get("q", "").strip()
         context["query"] = q
 
-        if not q:
+        if not search_index.tokenize_query(q):
             context.update({
                 "authors": [],
                 "works": [],
@@ -91,72 +92,39 @@ class SearchResultsView(TemplateView):
             })
             return context
 
+        # One indexed lookup per entity type, then a pk__in fetch for the
+        # hits (already ranked, so no ORDER BY / DISTINCT needed here).
+        def hits(entity_type):
+            return search_index.search(q, entity_type,
+                                       limit=self.results_per_type)
+
         # --- AUTHORS ---
-        authors = (
-            Author.objects.filter(
-                Q(full_name__icontains=q) |
-                Q(bio__icontains=q)  # keep if you have this field
-            )
-            .order_by("sort_name")
-        )
+        authors = search_index.hydrate(Author.objects.all(), hits("author"))
 
         # --- WORKS ---
         # Avoid per-row work.volumes.exists/count by annotating once.
-        works = (
-            Work.objects.filter(
-                Q(title__icontains=q) |
-                Q(author__full_name__icontains=q) |
-                Q(notes__icontains=q) |
-                Q(genre__name__icontains=q) |
-                Q(work_type__icontains=q)
-            )
+        works = search_index.hydrate(
+            Work.objects
             .select_related("author")
-            .annotate(volume_count=Count("volumes", distinct=True))
-            .distinct()
-            .order_by("sort_title")
+            .annotate(num_volumes=Count("volumes", distinct=True)),
+            hits("work"),
         )
 
         # --- BOOKSETS ---
-        # Avoid per-row bs.volumes.count by annotating once.
-        booksets = (
-            BookSet.objects.filter(
-                Q(title__icontains=q)
-                | Q(illustrator__icontains=q)  # keep if this exists
-                | Q(volumes__title__icontains=q)
-                | Q(volumes__works__title__icontains=q)
-                | Q(volumes__works__author__full_name__icontains=q)
-            )
-            .annotate(volume_count=Count("volumes", distinct=True))
-            .distinct()
-            .order_by("sort_title")  # or "title" if you don’t have sort_title
-        )
+        # volume_count is a stored field on BookSet, so no annotation needed.
+        booksets = search_index.hydrate(BookSet.objects.all(), hits("bookset"))
 
         # --- VOLUMES ---
         # Prefetch works with author in one go; template should NOT call .first().
         works_qs = Work.objects.select_related("author").order_by("sort_title")
 
-        volumes = (
-            Volume.objects.filter(
-                Q(title__icontains=q) |
-                Q(works__title__icontains=q) |
-                Q(works__author__full_name__icontains=q) |
-                Q(works__genre__name__icontains=q)
-            )
-            .select_related("book_set")
-            .prefetch_related(Prefetch("works", queryset=works_qs))
-            .distinct()
-            .order_by("sort_title")
+        volumes = search_index.hydrate(
+            Volume.objects
+            .select_related("book_set", "cover_image")
+            .prefetch_related(Prefetch("works", queryset=works_qs)),
+            hits("volume"),
         )
 
-        # If Volume.publisher is a ForeignKey, select_related it to prevent N+1.
-        try:
-            publisher_field = Volume._meta.get_field("publisher")
-            if isinstance(publisher_field, ForeignKey):
-                volumes = volumes.select_related("publisher")
-        except Exception:
-            # If the field doesn't exist or isn't relational, do nothing.
-            pass
-
         context.update({
             "authors": authors,
             "works": works,
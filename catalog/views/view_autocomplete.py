@@ -0,0 +1,17 @@
+from django.contrib.auth.decorators import login_required
+from django.http import Http404
+from django.shortcuts import render
+from django.views.decorators.http import require_GET
+
+from catalog.services import autocomplete
+
+
+@login_required
+@require_GET
+def autocomplete_view(request, kind):
+    """Suggestion list for an autocomplete widget (catalog/widgets.py)."""
+    if kind not in autocomplete.SOURCES:
+        raise Http404
+    q = request.GET.get("q", "")
+    return render(request, "partials/autocomplete_results.html",
+                  {"results": autocomplete.suggest(kind, q), "q": q.strip()})
@@ -0,0 +1,48 @@
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_GET
+
+from catalog.services import image_variants
+from catalog.utils.images.images import VARIANT_FORMATS, WEBP_QUALITY
+
+
+def _cacheable(response, etag):
+    response["ETag"] = etag
+    # URLs embed the original's fingerprint, so a given URL never changes
+    patch_cache_control(response, public=True, max_age=60 * 60 * 24 * 365,
+                        immutable=True)
+    return response
+
+
+@require_GET
+def image_variant_view(request, model, pk, version, width, fmt):
+    """Serve (rendering on first request) one derivative of an image's original."""
+    if (model not in image_variants.MODELS or fmt not in VARIANT_FORMATS
+            or width not in image_variants.allowed_widths()):
+        raise Http404
+    try:
+        quality = int(request.GET.get("q", WEBP_QUALITY))
+    except ValueError:
+        raise Http404
+    if quality not in image_variants.allowed_qualities():
+        raise Http404
+
+    key = image_variants.variant_key(model, pk, version, width, fmt, quality)
+    etag = f'"{key}"'
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        return _cacheable(HttpResponseNotModified(), etag)
+
+    path = image_variants.cached_variant(key, fmt)
+    if path is None:
+        image = get_object_or_404(
+            image_variants.MODELS[model].objects.only("id", "original"), pk=pk)
+        if (not image.original
+                or image_variants.source_version(image.original.name) != version):
+            raise Http404
+        path = image_variants.create_variant(image, key, width, fmt, quality)
+
+    response = FileResponse(open(path, "rb"),
+                            content_type=VARIANT_FORMATS[fmt][1])
+    return _cacheable(response, etag)
@@ -1,10 +1,15 @@
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.signing import BadSignature
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views import View
+from django.views.decorators.http import require_POST
 from django.views.generic import FormView
 from catalog.models import Volume, VolumeImage
 from catalog.forms_images import VolumeImageUploadForm, \
     VolumeImageMultiUploadForm, VolumeImageFormSet, CoverChoiceForm
+from catalog.services import direct_uploads
 from catalog.services.images import ingest_volume_images
 
 
@@ -50,6 +55,7 @@ class VolumeImageManageView(LoginRequiredMixin, View):
             "volume": self.volume,
             "upload_form": upload_form,
             "formset": formset,
+            "direct_upload": direct_uploads.enabled(),
         })
 
     def post(self, request, *args, **kwargs):
@@ -72,6 +78,7 @@ class VolumeImageManageView(LoginRequiredMixin, View):
                 "volume": self.volume,
                 "upload_form": upload_form,
                 "formset": formset,
+                "direct_upload": direct_uploads.enabled(),
             })
 
         # Default: action == "save" (or missing)
@@ -110,4 +117,33 @@ class VolumeImageManageView(LoginRequiredMixin, View):
             "volume": self.volume,
             "upload_form": upload_form,
             "formset": formset,
-        })
\ No newline at end of file
+            "direct_upload": direct_uploads.enabled(),
+        })
+
+
+@login_required
+@require_POST
+def volume_image_presign(request, pk):
+    """Presigned POST for one browser -> bucket upload (see direct_uploads)."""
+    if not direct_uploads.enabled():
+        raise Http404
+    volume = get_object_or_404(Volume.objects.only("id"), pk=pk)
+    try:
+        upload = direct_uploads.presign(volume, request.POST.get("content_type", ""))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    return JsonResponse(upload)
+
+
+@login_required
+@require_POST
+def volume_image_confirm(request, pk):
+    """Attach the objects the browser uploaded as the volume's images."""
+    if not direct_uploads.enabled():
+        raise Http404
+    volume = get_object_or_404(Volume, pk=pk)
+    try:
+        created = direct_uploads.confirm(volume, request.POST.getlist("token"))
+    except (BadSignature, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    return JsonResponse({"created": [img.pk for img in created]})
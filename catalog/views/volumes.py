@@ -7,11 +7,10 @@ from django.urls import reverse
 from django.views.generic import ListView, DetailView, UpdateView
 
 from catalog.forms import VolumeForm
-from catalog.services.covers_google import cache_google_cover_for_volume
+from catalog.tasks import cache_google_cover
+from catalog.utils import keyset
 from catalog.utils.normalization import normalize_sort_title
-
-from django.db.models import Prefetch, F
-from django.db import connection
+from catalog.views.mixins import VolumeSortMixin
 
 from catalog.models import (Volume, Work, VolumeImage,
                             VolumeBibliographyReference)
@@ -29,35 +28,27 @@ from catalog.models import (Volume, Work, VolumeImage,
 #         )
 
 
-class VolumeListView(ListView):
+class VolumeListView(VolumeSortMixin, ListView):
+    """
+    Keyset-paginated: ?after=<cursor> / ?before=<cursor> seek from the last /
+    first row shown instead of OFFSET, so deep pages cost the same as the
+    first and don't skip or repeat rows while books are being added.
+    ?scroll (formerly ?show_all) loads further chunks over HTMX as the
+    bottom of the list comes into view.
+    """
     model = Volume
     template_name = "catalog/volume_list.html"
     context_object_name = "volumes"
-    paginate_by = 36
 
-    def get_show_all(self):
-        return "show_all" in self.request.GET
+    def get_scroll(self):
+        return "scroll" in self.request.GET or "show_all" in self.request.GET
 
-    def get_paginate_by(self, queryset):
+    def get_view_mode(self):
         view = self.request.GET.get("view", "grid")
-        if self.get_show_all():
-            return None
-        return 42 if view == "list" else 33
-
-    SORTS = {
-        "title": ["sort_title", "title", "id"],
-        "author": ["primary_work__author__sort_name", "sort_title", "id"],  # <-- added
-        "date_added": ["date_added", "id"],
-        "pub_year": ["publication_year", "sort_title", "id"],
-        "publisher": ["publisher", "sort_title", "id"],
-        "acq_date": ["acquisition_date", "sort_title", "id"],
-        "status": ["status", "sort_title", "id"],
-        "value": ["estimated_value", "sort_title", "id"],
-        "isbn": ["isbn13", "sort_title", "id"],
-    }
-
-    DEFAULT_SORT = "title"
-    DEFAULT_DIR = "asc"
+        return view if view in ("grid", "list") else "grid"
+
+    def get_page_size(self):
+        return 42 if self.get_view_mode() == "list" else 33
 
     def get_queryset(self):
         qs = (
@@ -68,69 +59,42 @@ class VolumeListView(ListView):
                 "cover_image",
                 "primary_work__author",  # needed for author sort + display
             )
-            .prefetch_related("works", "works__author")
+            .defer("rendered_markdown")  # detail-page HTML; not shown here
         )
-
-        sort = self.request.GET.get("sort", self.DEFAULT_SORT)
-        direction = self.request.GET.get("dir", self.DEFAULT_DIR)
-
-        if sort not in self.SORTS:
-            sort = self.DEFAULT_SORT
-        if direction not in ("asc", "desc"):
-            direction = self.DEFAULT_DIR
-
-        self.sort = sort
-        self.direction = direction
-
-        fields = self.SORTS[sort]
-
-        nulls_last_fields = {
-            "pub_year",
-            "acq_date",
-            "value",
-            "isbn",
-            "publisher",
-            "author",   # <-- optional: puts missing primary_work/author at the end
-        }
-        use_nulls_last = sort in nulls_last_fields
-
-        supports_nulls_ordering = getattr(
-            connection.features, "supports_nulls_ordering", False
+        self.get_sort()
+        # ordering (NULLs last, either direction) is applied by keyset.paginate
+        return qs
+
+    def paginate(self, queryset):
+        get = self.request.GET
+        backwards = bool(get.get("before"))
+        page = keyset.paginate(
+            queryset,
+            self.get_sort_fields(),
+            descending=self.direction == "desc",
+            page_size=self.get_page_size(),
+            cursor=get.get("before") if backwards else get.get("after"),
+            direction=keyset.PREV if backwards else keyset.NEXT,
+            tag=f"{self.sort}:{self.direction}",
         )
+        # works/authors are prefetched by the card cache, for misses only
+        return page
 
-        order_by = []
-        for field in fields:
-            expr = F(field)
-            if use_nulls_last and supports_nulls_ordering:
-                expr = (
-                    expr.asc(nulls_last=True)
-                    if direction == "asc"
-                    else expr.desc(nulls_last=True)
-                )
-            else:
-                expr = expr.asc() if direction == "asc" else expr.desc()
-            order_by.append(expr)
-
-        return qs.order_by(*order_by)
+    def get_template_names(self):
+        if self.request.headers.get("HX-Request") and "after" in self.request.GET:
+            return ["partials/volume_list_chunk.html"]
+        return super().get_template_names()
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        ctx["sort"] = getattr(self, "sort", self.DEFAULT_SORT)
-        ctx["dir"] = getattr(self, "direction", self.DEFAULT_DIR)
-        ctx["show_all"] = self.get_show_all()
-
-        view = self.request.GET.get("view", "grid")
-        if view not in ("grid", "list"):
-            view = "grid"
-        ctx["view"] = view
-
+        page = self.paginate(self.object_list)
+        ctx["page"] = page
+        ctx["volumes"] = page.object_list
+        ctx["scroll"] = self.get_scroll()
+        ctx["view"] = self.get_view_mode()
         return ctx
 
 
-
-
-
-
 class VolumeDetailView(DetailView):
     model = Volume
     context_object_name = "volume"
@@ -148,7 +112,8 @@ class VolumeDetailView(DetailView):
             VolumeImage.objects
             .only(
                 "id", "volume_id", "kind", "caption", "sort_order",
-                "image_thumb", "image_display", "image_detail", "created_at")
+                "original", "image_thumb", "image_display", "image_detail",
+                "created_at")
             .order_by("sort_order", "created_at")
         )
 
@@ -196,7 +161,6 @@ class VolumeDetailView(DetailView):
         context["ordered_images"] = imgs
         context[
             "cover_slide_index"] = 0 if cover_id else 0  # cover will be 0 when present
-        print(context["ordered_images"])
         return context
 
 
@@ -218,7 +182,9 @@ def volume_create_view(request):
     form = VolumeForm(request.POST or None)
     if form.is_valid():
         volume = form.save()
-        cache_google_cover_for_volume(volume)
+        if volume.cover_url:
+            cache_google_cover.enqueue({"volume_id": volume.pk},
+                                       dedupe_key=f"cover:{volume.pk}")
         response = HttpResponse()
         response["HX-Redirect"] = reverse("volume_detail", args=[volume.pk])
         return response
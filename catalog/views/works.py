@@ -131,6 +131,7 @@ class WorkListView(CatalogBaseView):
                 "id", "slug", "title", "sort_title",
                 "cover_url", "cover_image_id",
                 "cover_image__id",                # safe
+                "cover_image__original",          # cover_src builds the variant URL from it
                 "cover_image__image_display",     # so .url doesn't trigger extra work
                 "cover_image__image_thumb",       # if you ever switch to thumb here
             )
@@ -140,6 +141,7 @@ class WorkListView(CatalogBaseView):
         return (
             Work.objects
             .select_related("author")
+            .defer("rendered_markdown")
             .prefetch_related(Prefetch("volumes", queryset=volumes_qs))
             .order_by("sort_title")
         )
@@ -0,0 +1,58 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from django.utils.html import format_html
+
+
+class AutocompleteMixin:
+    """
+    A select that holds only the selected options, under a search box that
+    fetches suggestions from the autocomplete view as you type (HTMX).
+    Picking one adds it to the select (static/js/base.js), so the form posts
+    exactly what a full select would, without shipping every row of the
+    related table as an <option>. ``kind`` names a source in
+    catalog/services/autocomplete.py.
+    """
+    def __init__(self, kind, attrs=None):
+        super().__init__(attrs)
+        self.kind = kind
+
+    def optgroups(self, name, value, attrs=None):
+        choices = self.choices
+        queryset = getattr(choices, "queryset", None)
+        if queryset is None:
+            return super().optgroups(name, value, attrs)
+
+        keys = [v for v in value if v]
+        field = choices.field
+        try:
+            selected = list(queryset.filter(
+                **{f"{field.to_field_name or 'pk'}__in": keys})) if keys else []
+        except (ValueError, ValidationError):
+            selected = []  # bound to junk input; the field reports the error
+        self.choices = [choices.choice(obj) for obj in selected]
+        if field.empty_label is not None and not self.allow_multiple_selected:
+            self.choices.insert(0, ("", field.empty_label))
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = choices
+
+    def render(self, name, value, attrs=None, renderer=None):
+        select = super().render(name, value, attrs, renderer)
+        return format_html(
+            '<div class="autocomplete" data-autocomplete>'
+            '<input type="search" name="q" class="form-control form-control-sm mb-1" '
+            'placeholder="Type to search…" autocomplete="off" '
+            'hx-get="{}" hx-trigger="input changed delay:250ms, search" '
+            'hx-target="next .autocomplete-results" hx-sync="this:replace">'
+            '<div class="autocomplete-results list-group mb-1"></div>{}</div>',
+            reverse("autocomplete", args=[self.kind]), select)
+
+
+class AutocompleteSelect(AutocompleteMixin, forms.Select):
+    pass
+
+
+class AutocompleteSelectMultiple(AutocompleteMixin, forms.SelectMultiple):
+    pass
@@ -1,3 +1,4 @@
+import logging
 import os
 from pathlib import Path
 
@@ -9,9 +10,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 env = Env()
 env.read_env()
 
-print("CWD:", os.getcwd())
-print("DEBUG raw:", os.environ.get("DEBUG"))
-print("DEBUG environs:", env.bool("DEBUG", default=None))
+logger = logging.getLogger(__name__)
 
 
 # Quick-start development settings - unsuitable for production
@@ -38,6 +37,7 @@ DJANGO_PRODUCTION = env.bool("DJANGO_PRODUCTION", default=False)
 DEBUG = env.bool("DEBUG", default=not DJANGO_PRODUCTION)
 if DJANGO_PRODUCTION:
     DEBUG = False
+logger.debug("DEBUG=%s (raw env %r, cwd %s)", DEBUG, os.environ.get("DEBUG"), os.getcwd())
 
 
 # https://docs.djangoproject.com/en/dev/ref/settings/#allowed-hosts
@@ -75,6 +75,7 @@ INSTALLED_APPS = [
     "pages",
     "reading",
     "utils",
+    "jobs",
     "catalog.apps.CatalogConfig",
 ]
 
@@ -85,6 +86,7 @@ MIDDLEWARE = [
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # WhiteNoise
+    "catalog.middleware.RequestMetricsMiddleware",  # after static files
     # "debug_toolbar.middleware.DebugToolbarMiddleware",  # Django Debug Toolbar
     "django.middleware.csrf.CsrfViewMiddleware",
     "django_htmx.middleware.HtmxMiddleware",
@@ -144,6 +146,126 @@ DATABASES = {
 }
 
 
+# https://docs.djangoproject.com/en/dev/topics/cache/
+# "google_books" is a persistent on-disk cache for ISBN lookups so re-scans
+# and restarts don't hit the API again (see GoogleBooksProvider).
+# "shared" holds state every process must agree on (the matcher index
+# generation, the spotlight ids): "default" is per-process LocMem, so a
+# write seen by one gunicorn worker would be invisible to the others. The
+# on-disk default covers all processes on one machine; across machines,
+# point it at a network cache instead.
+if DJANGO_PRODUCTION:
+    GOOGLE_BOOKS_CACHE_DIR = env.str("GOOGLE_BOOKS_CACHE_DIR",
+                                     default="/data/cache/google_books")
+    SHARED_CACHE_DIR = env.str("SHARED_CACHE_DIR", default="/data/cache/shared")
+else:
+    GOOGLE_BOOKS_CACHE_DIR = env.str("GOOGLE_BOOKS_CACHE_DIR",
+                                     default=str(BASE_DIR / ".cache" / "google_books"))
+    SHARED_CACHE_DIR = env.str("SHARED_CACHE_DIR",
+                               default=str(BASE_DIR / ".cache" / "shared"))
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "google_books": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": GOOGLE_BOOKS_CACHE_DIR,
+        "TIMEOUT": None,  # per-entry TTLs are set by the provider
+        "OPTIONS": {"MAX_ENTRIES": 100_000},
+    },
+    "shared": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": SHARED_CACHE_DIR,
+        "TIMEOUT": None,  # a lapsed generation counter could repeat a value
+    },
+}
+
+# Seconds to keep Google Books hits / "no results" answers
+GOOGLE_BOOKS_CACHE_TTL = env.int("GOOGLE_BOOKS_CACHE_TTL", default=60 * 60 * 24 * 30)
+GOOGLE_BOOKS_NEGATIVE_CACHE_TTL = env.int("GOOGLE_BOOKS_NEGATIVE_CACHE_TTL",
+                                          default=60 * 60 * 24)
+
+# Bulk ISBN import (catalog/services/bulk_import.py). The upload view
+# imports up to ISBN_IMPORT_INLINE_ROWS in the request (at ISBN_IMPORT_RATE
+# lookups a second, well inside gunicorn's 30s timeout) and queues larger
+# uploads for the job worker, up to ISBN_IMPORT_MAX_ROWS; use
+# `manage.py import_isbns` for more.
+ISBN_IMPORT_WORKERS = env.int("ISBN_IMPORT_WORKERS", default=4)
+ISBN_IMPORT_RATE = env.float("ISBN_IMPORT_RATE", default=5.0)
+ISBN_IMPORT_INLINE_ROWS = env.int("ISBN_IMPORT_INLINE_ROWS", default=50)
+ISBN_IMPORT_MAX_ROWS = env.int("ISBN_IMPORT_MAX_ROWS", default=300)
+
+# Image derivatives (catalog/utils/images/images.py). Workers: 0 = auto
+# (min(4, cpus)), -1 = encode inline without a process pool.
+IMAGE_PROCESS_WORKERS = env.int("IMAGE_PROCESS_WORKERS", default=0)
+IMAGE_WEBP_METHOD = env.int("IMAGE_WEBP_METHOD", default=4)
+# Store only uploaded originals and render sizes on demand through
+# catalog.services.image_variants (cached under IMAGE_VARIANT_CACHE_DIR,
+# LRU-pruned past IMAGE_VARIANT_CACHE_MAX_BYTES). When False, derivatives
+# are made at upload time -- by the job worker if IMAGE_DERIVATIVES_ASYNC.
+IMAGE_LAZY_DERIVATIVES = env.bool("IMAGE_LAZY_DERIVATIVES", default=True)
+IMAGE_DERIVATIVES_ASYNC = env.bool("IMAGE_DERIVATIVES_ASYNC", default=False)
+IMAGE_VARIANT_CACHE_DIR = env.str("IMAGE_VARIANT_CACHE_DIR", default="")  # "" = MEDIA_ROOT/derived
+IMAGE_VARIANT_CACHE_MAX_BYTES = env.int("IMAGE_VARIANT_CACHE_MAX_BYTES",
+                                        default=2 * 1024 ** 3)
+
+# Rendered volume cards (catalog/services/cards.py), keyed on each
+# volume's card_version so edits never need a cache delete. Capped below
+# the signed-URL lifetime when media is on S3 with querystring auth.
+CARD_CACHE_ALIAS = env.str("CARD_CACHE_ALIAS", default="default")
+CARD_CACHE_TIMEOUT = env.int("CARD_CACHE_TIMEOUT", default=60 * 60 * 24 * 7)
+
+# Dashboard "Book Roulette" (catalog/services/spotlight.py): a new random
+# volume on every visit, or one per day when True.
+SPOTLIGHT_DAILY = env.bool("SPOTLIGHT_DAILY", default=False)
+
+# Background jobs (jobs/queue.py), run by `manage.py run_worker`. With
+# JOBS_EAGER they run inline when enqueued, for setups without a worker.
+JOBS_EAGER = env.bool("JOBS_EAGER", default=False)
+JOBS_POLL_INTERVAL = env.float("JOBS_POLL_INTERVAL", default=1.0)
+JOBS_BACKOFF_BASE = env.int("JOBS_BACKOFF_BASE", default=30)
+JOBS_BACKOFF_MAX = env.int("JOBS_BACKOFF_MAX", default=60 * 60)
+JOBS_STALE_AFTER = env.int("JOBS_STALE_AFTER", default=60 * 60)
+JOBS_KEEP_DAYS = env.int("JOBS_KEEP_DAYS", default=7)
+
+# Per-request SQL/latency metrics (catalog/middleware.py): Server-Timing
+# header, one "catalog.metrics" log line per sampled request, and a warning
+# whenever a view runs more queries than its budget (by URL name).
+REQUEST_METRICS_ENABLED = env.bool("REQUEST_METRICS_ENABLED", default=True)
+REQUEST_METRICS_SERVER_TIMING = env.bool("REQUEST_METRICS_SERVER_TIMING", default=True)
+REQUEST_METRICS_SAMPLE_RATE = env.float("REQUEST_METRICS_SAMPLE_RATE",
+                                        default=1.0 if DEBUG else 0.1)
+REQUEST_METRICS_DEFAULT_BUDGET = env.int("REQUEST_METRICS_DEFAULT_BUDGET", default=50)
+REQUEST_METRICS_BUDGETS = {
+    "volume_list": 10,
+    "volume_detail": 15,
+    "work_list": 10,
+    "author_list": 10,
+    "bookset_list": 10,
+    "image_variant": 2,
+}
+
+LOG_LEVEL = env.str("LOG_LEVEL", default="DEBUG" if DEBUG else "INFO")
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "plain": {"format": "%(asctime)s %(levelname)s %(name)s: %(message)s"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "plain"},
+    },
+    "root": {"handlers": ["console"], "level": "WARNING"},
+    "loggers": {
+        "catalog": {"handlers": ["console"], "level": LOG_LEVEL, "propagate": False},
+        "catalog.metrics": {"handlers": ["console"], "level": "INFO", "propagate": False},
+        "jobs": {"handlers": ["console"], "level": LOG_LEVEL, "propagate": False},
+        "django_project": {"handlers": ["console"], "level": LOG_LEVEL, "propagate": False},
+    },
+}
+
+
 # For Docker/PostgreSQL usage uncomment this and comment the DATABASES config above
 # DATABASES = {
 #     "default": {
@@ -216,7 +338,38 @@ else:
     MEDIA_URL = "/media/"
     MEDIA_ROOT = BASE_DIR / "media"
 
-print(f"DP: {DJANGO_PRODUCTION}")
+# Media storage: "filesystem" (MEDIA_ROOT) or "s3", any S3-compatible
+# bucket through django-storages -- locally the MinIO service in
+# docker-compose.yml, with MEDIA_S3_ENDPOINT_URL=http://localhost:9000 and
+# MEDIA_S3_BUCKET=ex-libris-media. With DIRECT_UPLOADS the image manager
+# has browsers POST files straight to the bucket (presigned; the bucket's
+# CORS must allow this site) instead of through gunicorn.
+MEDIA_STORAGE = env.str("MEDIA_STORAGE", default="filesystem")
+MEDIA_S3_BUCKET = env.str("MEDIA_S3_BUCKET", default="")
+MEDIA_S3_ENDPOINT_URL = env.str("MEDIA_S3_ENDPOINT_URL", default="") or None
+MEDIA_S3_REGION = env.str("MEDIA_S3_REGION", default="us-east-1")
+MEDIA_S3_ACCESS_KEY_ID = env.str("MEDIA_S3_ACCESS_KEY_ID", default="")
+MEDIA_S3_SECRET_ACCESS_KEY = env.str("MEDIA_S3_SECRET_ACCESS_KEY", default="")
+MEDIA_S3_CUSTOM_DOMAIN = env.str("MEDIA_S3_CUSTOM_DOMAIN", default="") or None
+# False for a public-read bucket: plain URLs instead of signed GETs, which
+# expire MEDIA_S3_QUERYSTRING_EXPIRE seconds after the page is rendered
+MEDIA_S3_QUERYSTRING_AUTH = env.bool("MEDIA_S3_QUERYSTRING_AUTH", default=True)
+MEDIA_S3_QUERYSTRING_EXPIRE = env.int("MEDIA_S3_QUERYSTRING_EXPIRE", default=60 * 60)
+DIRECT_UPLOADS = env.bool("DIRECT_UPLOADS", default=True)
+DIRECT_UPLOAD_MAX_BYTES = env.int("DIRECT_UPLOAD_MAX_BYTES", default=25 * 1024 * 1024)
+DIRECT_UPLOAD_EXPIRES = env.int("DIRECT_UPLOAD_EXPIRES", default=10 * 60)
+
+# MEDIA_URL is served by catalog.views.serve_media (ETag, Range, immutable
+# caching of content-addressed names). MEDIA_ACCEL hands the bytes to a
+# front proxy: "nginx" (X-Accel-Redirect to MEDIA_ACCEL_PREFIX, an internal
+# location aliased to MEDIA_ROOT) or "sendfile" (X-Sendfile); "" streams
+# them from Django/gunicorn. MEDIA_MAX_AGE applies to other media files.
+MEDIA_SERVE = env.bool("MEDIA_SERVE", default=MEDIA_STORAGE == "filesystem")
+MEDIA_ACCEL = env.str("MEDIA_ACCEL", default="")
+MEDIA_ACCEL_PREFIX = env.str("MEDIA_ACCEL_PREFIX", default="/protected-media/")
+MEDIA_MAX_AGE = env.int("MEDIA_MAX_AGE", default=60 * 60)
+
+logger.debug("DJANGO_PRODUCTION=%s", DJANGO_PRODUCTION)
 
 # https://whitenoise.readthedocs.io/en/latest/django.html
 # STATICFILES_STORAGE = {
@@ -245,6 +398,28 @@ STORAGES = {
     },
 }
 
+if MEDIA_STORAGE == "s3":
+    STORAGES["default"] = {
+        "BACKEND": "storages.backends.s3.S3Storage",
+        "OPTIONS": {
+            "bucket_name": MEDIA_S3_BUCKET,
+            "endpoint_url": MEDIA_S3_ENDPOINT_URL,
+            "region_name": MEDIA_S3_REGION,
+            "access_key": MEDIA_S3_ACCESS_KEY_ID,
+            "secret_key": MEDIA_S3_SECRET_ACCESS_KEY,
+            "custom_domain": MEDIA_S3_CUSTOM_DOMAIN,
+            "querystring_auth": MEDIA_S3_QUERYSTRING_AUTH,
+            "querystring_expire": MEDIA_S3_QUERYSTRING_EXPIRE,
+            "file_overwrite": False,
+            "addressing_style": "path" if MEDIA_S3_ENDPOINT_URL else None,
+            "signature_version": "s3v4",
+        },
+    }
+    if MEDIA_S3_QUERYSTRING_AUTH:
+        # cached cards embed signed cover URLs: drop a card while the URLs
+        # in it still have at least half their lifetime left
+        CARD_CACHE_TIMEOUT = min(CARD_CACHE_TIMEOUT, MEDIA_S3_QUERYSTRING_EXPIRE // 2)
+
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 # Default primary key field type
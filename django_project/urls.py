@@ -1,8 +1,11 @@
+import re
+
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include, re_path
 
+from catalog.views import serve_media
+
 urlpatterns = [
     # re_path(r'^admin/shell/', include('django_admin_shell.urls')),
     path("admin/", admin.site.urls),
@@ -21,4 +24,8 @@ if settings.DEBUG:
                       path("__debug__/", include(debug_toolbar.urls)),
                   ] + urlpatterns
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+if settings.MEDIA_SERVE and not settings.MEDIA_URL.startswith(("http:", "https:", "//")):
+    urlpatterns += [
+        re_path(rf"^{re.escape(settings.MEDIA_URL.lstrip('/'))}(?P<path>.+)$",
+                serve_media, name="media"),
+    ]
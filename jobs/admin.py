@@ -0,0 +1,30 @@
+from django.contrib import admin, messages
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'priority', 'attempts', 'run_at', 'finished_at']
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'dedupe_key']
+    ordering = ('-created_at',)
+    readonly_fields = ['attempts', 'last_error', 'locked_by', 'locked_at',
+                       'created_at', 'finished_at']
+    actions = ['retry_now']
+
+    @admin.action(description="Retry selected jobs now")
+    def retry_now(self, request, queryset):
+        retried = 0
+        for job in queryset.exclude(status=Job.Status.RUNNING):
+            try:
+                with transaction.atomic():
+                    Job.objects.filter(pk=job.pk).update(
+                        status=Job.Status.QUEUED, run_at=timezone.now(),
+                        attempts=0, finished_at=None)
+                retried += 1
+            except IntegrityError:
+                pass  # the same dedupe key is already queued
+        self.message_user(request, f"Queued {retried} job(s) again.", messages.SUCCESS)
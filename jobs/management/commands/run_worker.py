@@ -0,0 +1,29 @@
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = ("Run queued background jobs (jobs/queue.py): cover downloads, "
+            "image derivatives, file cleanup and periodic tasks. Stops after "
+            "the current job on SIGINT/SIGTERM.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--burst", action="store_true",
+                            help="Exit once no job is due instead of waiting for more.")
+        parser.add_argument("--max-jobs", type=int, default=None)
+        parser.add_argument("--poll", type=float,
+                            default=getattr(settings, "JOBS_POLL_INTERVAL", 1.0),
+                            help="Seconds to wait between polls of an empty queue.")
+        parser.add_argument("--name", default=None, help="Worker name (default host:pid).")
+
+    def handle(self, *args, **opts):
+        worker = Worker(name=opts["name"], poll=opts["poll"])
+        signal.signal(signal.SIGINT, worker.stop)
+        signal.signal(signal.SIGTERM, worker.stop)
+        self.stdout.write(f"Worker {worker.name} started.")
+        ran = worker.run(burst=opts["burst"], max_jobs=opts["max_jobs"])
+        self.stdout.write(self.style.SUCCESS(f"Done. Ran {ran} jobs."))
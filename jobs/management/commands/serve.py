@@ -0,0 +1,59 @@
+import signal
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = ("Run gunicorn and the job worker (run_worker) side by side, as the "
+            "container's main process. SIGINT/SIGTERM are passed on to both; "
+            "the worker is restarted if it dies, and the command exits if "
+            "gunicorn does.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bind", default=":8000")
+        parser.add_argument("--workers", type=int, default=2,
+                            help="gunicorn worker processes.")
+        parser.add_argument("--restart-delay", type=float, default=5.0,
+                            help="Seconds to wait before restarting a dead worker.")
+
+    def handle(self, *args, **opts):
+        self.stopping = False
+        self.web = subprocess.Popen([
+            "gunicorn", "--bind", opts["bind"], "--workers", str(opts["workers"]),
+            "django_project.wsgi",
+        ])
+        self.worker = self._start_worker()
+        signal.signal(signal.SIGINT, self._forward)
+        signal.signal(signal.SIGTERM, self._forward)
+
+        restart_at = None
+        while not self.stopping:
+            if self.web.poll() is not None:
+                self._forward()
+                self.worker.wait()
+                raise CommandError(f"gunicorn exited with status {self.web.returncode}.")
+            if restart_at is None and self.worker.poll() is not None:
+                self.stderr.write(f"Worker exited with status {self.worker.returncode}; "
+                                  f"restarting in {opts['restart_delay']:g}s.")
+                restart_at = time.monotonic() + opts["restart_delay"]
+            if restart_at is not None and time.monotonic() >= restart_at:
+                self.worker, restart_at = self._start_worker(), None
+            time.sleep(0.5)
+
+        self.web.wait()
+        self.worker.wait()
+
+    def _start_worker(self):
+        return subprocess.Popen(
+            [sys.executable, str(settings.BASE_DIR / "manage.py"), "run_worker"])
+
+    def _forward(self, *args):
+        # both children treat SIGTERM as "finish what you're doing, then exit"
+        self.stopping = True
+        for proc in (self.web, self.worker):
+            if proc.poll() is None:
+                proc.send_signal(signal.SIGTERM)
@@ -0,0 +1,52 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    One queued call of a registered task (jobs/queue.py), run by
+    `manage.py run_worker`. Finished rows are kept for a while so failures
+    can be inspected and retried from the admin.
+    """
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    name = models.CharField(max_length=200)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices,
+                              default=Status.QUEUED)
+    priority = models.SmallIntegerField(default=0)  # higher runs first
+    # at most one queued job per key; enqueueing again is a no-op
+    dedupe_key = models.CharField(max_length=200, blank=True, null=True)
+    run_at = models.DateTimeField(default=timezone.now)
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    last_error = models.TextField(blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            # the worker's claim query
+            models.Index(fields=["status", "run_at", "priority"], name="job_claim_idx"),
+            models.Index(fields=["name", "status"], name="job_name_status_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dedupe_key"],
+                condition=Q(status="queued"),
+                name="job_dedupe_queued",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
@@ -0,0 +1,236 @@
+# jobs/queue.py
+"""
+A small background job queue kept in the database: the jobs table is the
+queue, `manage.py run_worker` is the consumer, no broker needed.
+
+    from jobs.queue import task
+
+    @task("catalog.cache_google_cover", priority=10)
+    def cache_google_cover(volume_id):
+        ...
+
+    cache_google_cover.enqueue({"volume_id": 12}, dedupe_key="cover:12")
+    enqueue("catalog.cache_google_cover", {"volume_id": 12})  # by name
+
+Enqueueing is an INSERT in the caller's transaction: a job enqueued inside
+atomic() becomes visible to the worker when the data it needs commits, and
+disappears if that transaction rolls back. kwargs must be JSON-serializable.
+
+The worker runs due jobs highest priority first. A job that raises is
+retried with exponential backoff until max_attempts, then marked failed; a
+job whose worker died is requeued after JOBS_STALE_AFTER. Tasks must
+therefore be safe to run twice. Tasks registered with ``every=`` are
+re-enqueued that long after each run. With JOBS_EAGER (tests, a dev box
+without a worker) enqueue() calls the task at once instead.
+
+Settings:
+    JOBS_EAGER           run tasks inline in enqueue() (default False)
+    JOBS_BACKOFF_BASE    seconds before the first retry, doubled per attempt (default 30)
+    JOBS_BACKOFF_MAX     longest retry delay in seconds (default 3600)
+    JOBS_STALE_AFTER     seconds before a running job counts as lost (default 3600)
+    JOBS_KEEP_DAYS       how long finished jobs are kept (default 7)
+"""
+from __future__ import annotations
+
+import logging
+import random
+import traceback
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+CLAIM_BATCH = 10
+
+_registry: dict[str, Task] = {}
+
+
+class UnknownTask(Exception):
+    pass
+
+
+@dataclass
+class Task:
+    name: str
+    func: Callable
+    priority: int = 0
+    max_attempts: int = 5
+    every: timedelta | None = None
+
+    def enqueue(self, kwargs=None, **options):
+        return enqueue(self.name, kwargs, **options)
+
+
+def task(name, *, priority=0, max_attempts=5, every=None):
+    """Register the decorated function as ``name``; adds ``func.enqueue()``."""
+    def register(func):
+        registered = _registry[name] = Task(name, func, priority, max_attempts, every)
+        func.enqueue = registered.enqueue
+        return func
+    return register
+
+
+def get_task(name) -> Task:
+    try:
+        return _registry[name]
+    except KeyError:
+        raise UnknownTask(f"No task registered as {name!r}") from None
+
+
+def periodic_tasks() -> list[Task]:
+    return [t for t in _registry.values() if t.every]
+
+
+# ---- enqueueing ----------------------------------------------
+
+def enqueue(name, kwargs=None, *, priority=None, dedupe_key=None,
+            delay=None) -> Job | None:
+    """
+    Queue a run of task ``name``. With a ``dedupe_key`` that already has a
+    queued job, that job is returned and nothing is added. Returns None in
+    eager mode, where the task has already run.
+    """
+    registered = get_task(name)
+    kwargs = kwargs or {}
+    if getattr(settings, "JOBS_EAGER", False):
+        registered.func(**kwargs)
+        return None
+    return _insert(registered, kwargs, priority=priority, dedupe_key=dedupe_key,
+                   delay=delay)
+
+
+def _insert(registered, kwargs, *, priority=None, dedupe_key=None, delay=None):
+    job = Job(
+        name=registered.name,
+        kwargs=kwargs,
+        priority=registered.priority if priority is None else priority,
+        max_attempts=registered.max_attempts,
+        dedupe_key=dedupe_key or None,
+        run_at=timezone.now() + (delay or timedelta()),
+    )
+    if not job.dedupe_key:
+        job.save()
+        return job
+
+    existing = _queued(job.dedupe_key)
+    if existing is not None:
+        return existing
+    try:
+        with transaction.atomic():
+            job.save()
+        return job
+    except IntegrityError:
+        # a concurrent enqueue with the same key got there first
+        return _queued(job.dedupe_key)
+
+
+def _queued(dedupe_key) -> Job | None:
+    return Job.objects.filter(dedupe_key=dedupe_key, status=Job.Status.QUEUED).first()
+
+
+def arm(registered, delay=None) -> Job:
+    """Make sure periodic ``registered`` has exactly one queued run."""
+    return _insert(registered, {}, dedupe_key=f"periodic:{registered.name}",
+                   delay=registered.every if delay is None else delay)
+
+
+# ---- running -------------------------------------------------
+
+def claim(worker_name) -> Job | None:
+    """Mark the most urgent due job as running by ``worker_name`` and return it."""
+    now = timezone.now()
+    due = list(
+        Job.objects.filter(status=Job.Status.QUEUED, run_at__lte=now)
+        .order_by("-priority", "run_at", "id")
+        .values_list("pk", flat=True)[:CLAIM_BATCH]
+    )
+    for pk in due:
+        # of two workers racing for this row, only one UPDATE matches
+        claimed = Job.objects.filter(pk=pk, status=Job.Status.QUEUED).update(
+            status=Job.Status.RUNNING, locked_by=worker_name, locked_at=now,
+            attempts=F("attempts") + 1)
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def run(job) -> bool:
+    """Run a claimed job and record the outcome. True if it succeeded."""
+    registered = None
+    try:
+        registered = get_task(job.name)
+        registered.func(**job.kwargs)
+    except Exception as exc:
+        logger.warning("Job %s failed (attempt %d/%d): %s",
+                       job, job.attempts, job.max_attempts, exc)
+        final = isinstance(exc, UnknownTask)
+        _retry_or_fail(job, traceback.format_exc(), final=final)
+        if registered and registered.every and job.status == Job.Status.FAILED:
+            arm(registered)
+        return False
+
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.Status.DONE, finished_at=timezone.now(), last_error="")
+    if registered.every:
+        arm(registered)
+    return True
+
+
+def backoff(attempts) -> timedelta:
+    base = getattr(settings, "JOBS_BACKOFF_BASE", 30)
+    cap = getattr(settings, "JOBS_BACKOFF_MAX", 3600)
+    seconds = min(cap, base * 2 ** max(0, attempts - 1))
+    # jitter, so jobs that failed together don't all retry together
+    return timedelta(seconds=seconds * random.uniform(0.8, 1.2))
+
+
+def _retry_or_fail(job, error, *, final=False) -> None:
+    now = timezone.now()
+    job.last_error = error[-10_000:]
+    job.locked_by = ""
+    if not final and job.attempts < job.max_attempts:
+        job.status = Job.Status.QUEUED
+        job.run_at = now + backoff(job.attempts)
+    else:
+        job.status = Job.Status.FAILED
+        job.finished_at = now
+    try:
+        with transaction.atomic():
+            job.save(update_fields=["status", "run_at", "last_error", "locked_by",
+                                    "finished_at"])
+    except IntegrityError:
+        # a newer job with the same dedupe key is already queued: it will
+        # do this work, so this one stops here
+        job.status = Job.Status.FAILED
+        job.finished_at = now
+        job.last_error += "\nSuperseded by a newer queued job with the same key."
+        job.save(update_fields=["status", "last_error", "finished_at"])
+
+
+def requeue_stale() -> int:
+    """Retry (or fail) running jobs whose worker stopped reporting back."""
+    stale_after = getattr(settings, "JOBS_STALE_AFTER", 3600)
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    stale = list(Job.objects.filter(status=Job.Status.RUNNING, locked_at__lt=cutoff))
+    for job in stale:
+        _retry_or_fail(job, f"Lost: still running after {stale_after}s "
+                            f"on worker {job.locked_by or '?'}.")
+    return len(stale)
+
+
+def prune(days=None) -> int:
+    """Delete finished jobs older than ``days`` (JOBS_KEEP_DAYS)."""
+    days = getattr(settings, "JOBS_KEEP_DAYS", 7) if days is None else days
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = Job.objects.filter(
+        status__in=[Job.Status.DONE, Job.Status.FAILED], finished_at__lt=cutoff,
+    ).delete()
+    return deleted
@@ -0,0 +1,9 @@
+# jobs/tasks.py
+from datetime import timedelta
+
+from .queue import prune, task
+
+
+@task("jobs.prune", every=timedelta(days=1))
+def prune_jobs():
+    prune()
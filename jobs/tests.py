@@ -0,0 +1,110 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from . import queue
+from .queue import arm, claim, enqueue, get_task, requeue_stale, run, task
+from .worker import Worker
+
+calls = []
+
+
+@task("tests.record")
+def record(value):
+    calls.append(value)
+
+
+@task("tests.flaky", max_attempts=2)
+def flaky():
+    raise ConnectionError("try again")
+
+
+@task("tests.tick", every=timedelta(minutes=5))
+def tick():
+    calls.append("tick")
+
+
+class JobQueueTest(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_dedupe_key_keeps_one_queued_job(self):
+        first = enqueue("tests.record", {"value": 1}, dedupe_key="k")
+        second = enqueue("tests.record", {"value": 2}, dedupe_key="k")
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(Job.objects.count(), 1)
+
+        self.assertEqual(Worker().run(burst=True), 1)
+        self.assertEqual(calls, [1])
+        # once it has run, the key is free again
+        self.assertNotEqual(enqueue("tests.record", {"value": 3}, dedupe_key="k").pk,
+                            first.pk)
+
+    def test_priority_then_age(self):
+        enqueue("tests.record", {"value": "low"})
+        enqueue("tests.record", {"value": "high"}, priority=5)
+        enqueue("tests.record", {"value": "later"}, priority=9,
+                delay=timedelta(hours=1))
+        Worker().run(burst=True)
+        self.assertEqual(calls, ["high", "low"])
+
+    def test_failures_back_off_then_fail(self):
+        job = enqueue("tests.flaky")
+        self.assertFalse(run(claim("w")))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.Status.QUEUED, 1))
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn("ConnectionError", job.last_error)
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        run(claim("w"))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.Status.FAILED, 2))
+
+    def test_lost_jobs_are_requeued(self):
+        job = enqueue("tests.record", {"value": 1})
+        claim("w")
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(days=1))
+        self.assertEqual(requeue_stale(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+
+    def test_periodic_task_rearms_after_running(self):
+        arm(get_task("tests.tick"), delay=timedelta())
+        arm(get_task("tests.tick"), delay=timedelta())
+        self.assertTrue(run(claim("w")))
+        self.assertEqual(calls, ["tick"])
+        queued = Job.objects.get(name="tests.tick", status=Job.Status.QUEUED)
+        self.assertGreater(queued.run_at, timezone.now() + timedelta(minutes=4))
+
+    @override_settings(JOBS_EAGER=True)
+    def test_eager_mode_runs_inline(self):
+        self.assertIsNone(record.enqueue({"value": 7}))
+        self.assertEqual(calls, [7])
+        self.assertFalse(Job.objects.exists())
+
+    def test_worker_survives_database_errors(self):
+        enqueue("tests.record", {"value": 1})
+        real_claim = queue.claim
+        outcomes = iter([OperationalError("server closed the connection"),
+                         OperationalError("server closed the connection")])
+
+        def claim_after_errors(name):
+            if error := next(outcomes, None):
+                raise error
+            return real_claim(name)
+
+        with patch.object(queue, "claim", claim_after_errors), \
+                self.assertLogs("jobs.worker", "ERROR") as logs:
+            self.assertEqual(Worker(poll=0.001).run(max_jobs=1), 1)
+        self.assertEqual(calls, [1])
+        self.assertEqual(len(logs.records), 2)
+
+        with patch.object(queue, "claim", side_effect=OperationalError), \
+                self.assertRaises(OperationalError):
+            Worker().run(burst=True)
@@ -0,0 +1,96 @@
+# jobs/worker.py
+"""The loop behind `manage.py run_worker` (see jobs/queue.py)."""
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import timedelta
+
+from django.db import close_old_connections
+
+from . import queue
+
+logger = logging.getLogger(__name__)
+
+SWEEP_INTERVAL = 60  # seconds between checks for lost jobs
+ERROR_BACKOFF_MAX = 60  # longest pause after repeated loop errors
+
+
+class Worker:
+    def __init__(self, name=None, poll=1.0):
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll = poll
+        self._stop = threading.Event()
+
+    def stop(self, *args):
+        """Finish the current job, then exit (also usable as a signal handler)."""
+        self._stop.set()
+
+    def run(self, burst=False, max_jobs=None) -> int:
+        """
+        Run jobs until stopped; with ``burst``, until nothing is due, and
+        errors outside a task are raised instead of retried. Returns the
+        number of jobs run.
+        """
+        if not burst:
+            # periodic tasks not queued yet run once now, then on schedule
+            for registered in queue.periodic_tasks():
+                queue.arm(registered, delay=timedelta())
+
+        ran, errors = 0, 0
+        self._last_sweep = 0.0
+        while not self._stop.is_set():
+            # A lost database connection (or any other error outside the
+            # task itself) must not kill the worker: log it, drop the
+            # connection and try again after a growing pause.
+            try:
+                job = self._next_job()
+            except Exception:
+                if burst:
+                    raise
+                errors += 1
+                self._pause_after_error(errors)
+                continue
+            errors = 0
+
+            if job is None:
+                if burst:
+                    break
+                close_old_connections()
+                self._stop.wait(self.poll)
+                continue
+
+            started = time.perf_counter()
+            try:
+                ok = queue.run(job)
+            except Exception:
+                # the outcome could not be recorded; the job stays claimed
+                # until requeue_stale() hands it out again
+                if burst:
+                    raise
+                self._pause_after_error(1)
+                continue
+            logger.info("%s %s in %.0fms", "Ran" if ok else "Failed", job,
+                        (time.perf_counter() - started) * 1000)
+            ran += 1
+            if max_jobs and ran >= max_jobs:
+                break
+            close_old_connections()
+        return ran
+
+    def _next_job(self):
+        if time.monotonic() - self._last_sweep > SWEEP_INTERVAL:
+            if lost := queue.requeue_stale():
+                logger.warning("Requeued %d lost job(s)", lost)
+            self._last_sweep = time.monotonic()
+        return queue.claim(self.name)
+
+    def _pause_after_error(self, errors):
+        delay = min(ERROR_BACKOFF_MAX, self.poll * 2 ** errors)
+        logger.exception("Worker %s hit an error; retrying in %.1fs",
+                         self.name, delay)
+        close_old_connections()
+        self._stop.wait(delay)
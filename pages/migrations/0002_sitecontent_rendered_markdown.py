@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sitecontent',
+            name='rendered_markdown',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -1,11 +1,11 @@
 # pages/models.py
-from django.db import models
 from django.core.exceptions import ValidationError
 from markdownx.models import MarkdownxField
-from markdownx.utils import markdownify
 
+from catalog.models import RenderedMarkdownModel
 
-class SiteContent(models.Model):
+
+class SiteContent(RenderedMarkdownModel):
     home_content = MarkdownxField("Home Page Content", blank=True)
     about_content = MarkdownxField("About Page Content", blank=True)
 
@@ -22,11 +22,13 @@ class SiteContent(models.Model):
     def __str__(self):
         return "Site Content"
 
+    markdown_fields = ("home_content", "about_content")
+
     @property
     def home_html(self):
-        return markdownify(self.home_content)
+        return self.markdown_html("home_content")
 
     @property
     def about_html(self):
-        return markdownify(self.about_content)
+        return self.markdown_html("about_content")
 
@@ -16,7 +16,6 @@
 
 from django.views.generic import TemplateView
 from .models import SiteContent
-import random
 
 class SiteContentMixin:
     """Provides the single SiteContent instance to templates."""
@@ -26,33 +25,26 @@ class SiteContentMixin:
         return context
 
 
-from django.views.generic import TemplateView
-from catalog.models import Volume, Work, Author, BookSet, VolumeImage
+from catalog.services import spotlight, stats
 
 
 class DashboardView(TemplateView):
+    """
+    The random volume comes from catalog.services.spotlight and the totals
+    from the stats snapshot, so the page never counts or scans a table.
+    """
     template_name = "pages/dashboard.html"
 
     def get_context_data(self, **kwargs):
-        all_volumes = Volume.objects.all()
-        num_volumes = all_volumes.count()
-        vol_idx = random.randint(0, num_volumes - 1)
-        rand_vol = all_volumes[vol_idx]
-        cover = rand_vol.cover_src
-        blurb = rand_vol.description
-        rand_title = rand_vol.title
+        rand_vol = spotlight.pick()
 
         context = super(DashboardView, self).get_context_data(**kwargs)
-        context["volumes"] = all_volumes
-        context["works"] = Work.objects.all()
-        context["authors"] = Author.objects.all()
-        context["sets"] = BookSet.objects.all()
-        context["cover"] = cover
-        context["blurb"] = blurb
-        context["title"] = rand_title
+        context["counts"] = stats.get_counts()
         context["rand_vol"] = rand_vol
-
-
+        if rand_vol is not None:
+            context["cover"] = rand_vol.cover_src
+            context["blurb"] = rand_vol.description
+            context["title"] = rand_vol.title
         return context
 
 class HomePageView(SiteContentMixin, TemplateView):
@@ -0,0 +1,14 @@
+from django import forms
+
+from catalog.widgets import AutocompleteSelect
+from reading.models import ReadingPathItem
+
+
+class ReadingPathItemForm(forms.ModelForm):
+    class Meta:
+        model = ReadingPathItem
+        fields = ["work", "source_volume", "locator", "position", "notes", "status"]
+        widgets = {
+            "work": AutocompleteSelect("work"),
+            "source_volume": AutocompleteSelect("volume"),
+        }
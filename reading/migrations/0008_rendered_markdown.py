@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-18 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading', '0007_alter_readingpathitem_work'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='readingpath',
+            name='rendered_markdown',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='readingpathitem',
+            name='rendered_markdown',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -2,9 +2,8 @@ from django.contrib.auth.models import User
 from django.db import models
 from django.db.models import UniqueConstraint
 from django.contrib.auth import get_user_model # type: ignore
-from catalog.models import Volume, Work
+from catalog.models import RenderedMarkdownModel, Volume, Work
 from markdownx.models import MarkdownxField
-from markdownx.utils import markdownify
 from django.conf import settings
 from django.urls import reverse
 
@@ -88,7 +87,7 @@ user = get_user_model()
 #     def __str__(self):
 #         return f"{self.reading_path.name} - {self.volume.title}"
 
-class ReadingPath(models.Model):
+class ReadingPath(RenderedMarkdownModel):
     name = models.CharField(max_length=200)
     description = MarkdownxField(blank=True, default="")
     overview_notes = MarkdownxField(blank=True, default="")  # rename from global_notes
@@ -100,6 +99,16 @@ class ReadingPath(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    markdown_fields = ("description", "overview_notes")
+
+    @property
+    def description_html(self):
+        return self.markdown_html("description")
+
+    @property
+    def overview_notes_html(self):
+        return self.markdown_html("overview_notes")
+
     def get_absolute_url(self):
         return reverse("reading_path_detail", kwargs={"pk": self.pk})
 
@@ -107,7 +116,7 @@ class ReadingPath(models.Model):
         return self.name
 
 
-class ReadingPathItem(models.Model):
+class ReadingPathItem(RenderedMarkdownModel):
     class Status(models.TextChoices):
         PLANNED = "PLANNED", "Planned"
         READING = "READING", "Reading"
@@ -151,9 +160,11 @@ class ReadingPathItem(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    markdown_fields = ("notes",)
+
     @property
     def notes_html(self):
-        return markdownify(self.notes)
+        return self.markdown_html("notes")
 
     class Meta:
         ordering = ("position", "created_at")
@@ -3,6 +3,7 @@ from django.shortcuts import render, get_object_or_404
 from django.views.generic import DetailView, ListView, CreateView, UpdateView, \
     DeleteView
 
+from reading.forms import ReadingPathItemForm
 from reading.models import ReadingPath, ReadingPathItem
 
 
@@ -47,7 +48,7 @@ class ReadingPathItemCreateView(LoginRequiredMixin, CreateView):
     model = ReadingPathItem
     context_object_name = "item"
     template_name = "reading/reading_path_item_create_update.html"
-    fields = ["work", "source_volume", "locator", "position", "notes", "status"]
+    form_class = ReadingPathItemForm
 
     def dispatch(self, request, *args, **kwargs):
         self.reading_path = get_object_or_404(
@@ -79,7 +80,7 @@ class ReadingPathItemUpdateView(UpdateView):
     model = ReadingPathItem
     context_object_name = 'item'
     template_name = "reading/reading_path_item_create_update.html"
-    fields = ["work", "source_volume", "locator", "position", "notes", "status"]
+    form_class = ReadingPathItemForm
 
     def get_queryset(self):
         # security: only allow editing items on the current user's lists
@@ -0,0 +1,28 @@
+// Autocomplete widgets (catalog/widgets.py): picking a suggestion selects
+// it in the widget's select, which is what the form posts.
+document.addEventListener("click", (event) => {
+    const pick = event.target.closest("[data-autocomplete-value]");
+    if (!pick) return;
+    const box = pick.closest("[data-autocomplete]");
+    const select = box.querySelector("select");
+    const value = pick.dataset.autocompleteValue;
+
+    let option = Array.from(select.options).find((o) => o.value === value);
+    if (!option) {
+        option = new Option(pick.textContent.trim(), value);
+        select.add(option);
+    }
+    if (!select.multiple) select.value = value;
+    option.selected = true;
+    select.dispatchEvent(new Event("change", {bubbles: true}));
+
+    box.querySelector(".autocomplete-results").innerHTML = "";
+    box.querySelector("input[type=search]").value = "";
+});
+
+// Enter in an autocomplete search box must not submit the surrounding form
+document.addEventListener("keydown", (event) => {
+    if (event.key === "Enter" && event.target.matches("[data-autocomplete] input[type=search]")) {
+        event.preventDefault();
+    }
+});
@@ -0,0 +1,14 @@
+from django import template
+
+from catalog.services import cards
+
+register = template.Library()
+
+
+@register.simple_tag
+def volume_cards(volumes, template_name="partials/volume_card.html"):
+    """
+    {% volume_cards volumes "partials/volume_card.html" as cards %}
+    {% for volume, card in cards %}...{{ card }}...{% endfor %}
+    """
+    return cards.render_cards(volumes, template_name)
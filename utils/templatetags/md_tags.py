@@ -1,13 +1,13 @@
-import markdown
-
 from django import template
 from django.template.defaultfilters import stringfilter
 from django.utils.safestring import mark_safe
 
+from catalog.utils.markdown_render import render_cached
+
 register = template.Library()
 
 @register.filter
 @stringfilter
 def render_markdown(value):
-    md = markdown.Markdown(extensions=["fenced_code"])
-    return mark_safe(md.convert(value))
\ No newline at end of file
+    # one Markdown instance per thread, and repeat values are memoized
+    return mark_safe(render_cached(value, ("fenced_code",)))